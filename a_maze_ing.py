@@ -3,35 +3,130 @@ import os
 import sys
 import signal
 import random
-from typing import Any
+import argparse
+from typing import Any, Dict, Optional
 
+from mazegen.checkpoint import Checkpoint, Checkpointer, read_checkpoint
+from mazegen.profiling import PhaseProfiler, phase
+from mazegen.progress import (Cancelled, CancelToken, ProgressReporter,
+                              progress_bar)
 from mazegen.utils import parse_config
 from mazegen.generator import MazeGenerator
+from mazegen.ondisk import mapped_buffer
 from mazegen.solver import solve
 from display.graphical import MazeVisualizer
+from display.terminal import TerminalVisualizer
+
+
+# Token of the generation / solve in progress (None outside of them)
+_job: Optional[CancelToken] = None
 
 
 def handle_sigint(sig: int, frame: Any) -> None:
-    """Handle CTRL+C to exit gracefully."""
+    """
+    Handle CTRL+C: a running generation or solve is cancelled and
+    stops at its next progress check; otherwise exit right away.
+    """
+    if _job is not None and not _job.cancelled:
+        print("\n\033[93m[!] Interrupted by user. Stopping...\033[0m")
+        _job.cancel()
+        return
     print("\n\033[93m[!] Interrupted by user. Exiting...\033[0m")
     os._exit(0)
 
 
+def parse_args() -> argparse.Namespace:
+    """Command line: the config file plus optional profiling flags."""
+    parser = argparse.ArgumentParser(
+        prog="a_maze_ing.py", description="A-Maze-ing generator")
+    parser.add_argument("config_file", help="path to the config file")
+    parser.add_argument(
+        "--profile", nargs="?", const="table", choices=["table", "json"],
+        help="print per-phase time / peak memory (default: table)")
+    parser.add_argument(
+        "--cprofile", metavar="FILE",
+        help="dump cProfile stats to FILE (read with pstats/snakeviz)")
+    parser.add_argument(
+        "--no-progress", action="store_true",
+        help="hide the progress bar (only shown on a terminal)")
+    parser.add_argument(
+        "--terminal", action="store_true",
+        help="play in the terminal instead of the X11 window")
+    parser.add_argument(
+        "--checkpoint", type=float, default=60.0, metavar="SECONDS",
+        help="save the generation / solve state every SECONDS "
+             "(default: 60, 0 disables)")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="go on from the checkpoint of an interrupted run")
+    parser.add_argument(
+        "--storage", metavar="DIR",
+        help="keep the grid in memory-mapped files in DIR "
+             "(mazes larger than RAM)")
+    return parser.parse_args()
+
+
 def main() -> None:
     """Main entry point for the A-Maze-ing generator."""
     # Register signal for clean exit
     signal.signal(signal.SIGINT, handle_sigint)
 
     # 1. Validate Arguments (Requirement IV.2)
-    if len(sys.argv) != 2:
-        print("\033[91mUsage: python3 a_maze_ing.py <config_file>\033[0m")
-        sys.exit(1)
+    args = parse_args()
+    if args.cprofile:
+        import cProfile
+
+        prof = cProfile.Profile()
+        prof.enable()
+        try:
+            run(args.config_file, args.profile, not args.no_progress,
+                args.terminal, args.resume, args.checkpoint, args.storage)
+        finally:
+            prof.disable()
+            prof.dump_stats(args.cprofile)
+    else:
+        run(args.config_file, args.profile, not args.no_progress,
+            args.terminal, args.resume, args.checkpoint, args.storage)
 
-    config_file = sys.argv[1]
+
+def run(
+    config_file: str,
+    profile: Optional[str] = None,
+    bar: bool = True,
+    terminal: bool = False,
+    resume: bool = False,
+    checkpoint_every: float = 60.0,
+    storage: Optional[str] = None,
+) -> None:
+    """
+    Generates, solves and saves the maze, then opens the window.
+
+    Args:
+        config_file: Path to the configuration file.
+        profile: 'table' or 'json' to print the phase report before
+                 the window opens, None to disable profiling.
+        bar: Draw a progress bar (when stderr is a terminal).
+        terminal: Use the ANSI terminal renderer instead of MLX.
+        resume: Go on from '<OUTPUT_FILE>.ckpt' if it exists.
+        checkpoint_every: Seconds between two checkpoints (0: none).
+        storage: Directory for file-backed grid / DFS stack / BFS
+                 moves, None to keep them in RAM.
+    """
+    global _job
+    profiler: Optional[PhaseProfiler] = None
+    if profile:
+        profiler = PhaseProfiler()
+    # Always checked for CTRL+C; the bar itself is optional
+    token = CancelToken()
+    progress = ProgressReporter(
+        progress_bar() if bar and sys.stderr.isatty()
+        else (lambda *report: None),
+        cancel=token)
 
     # 2. Parse Configuration (Requirement IV.3)
     try:
-        config = parse_config(config_file)
+        with phase(profiler, "parse_config"):
+            config = parse_config(config_file)
     except Exception as e:
         print(f"\033[91m[ERROR] Invalid configuration: {e}\033[0m")
         sys.exit(1)
@@ -47,6 +142,28 @@ def main() -> None:
     if "seed" in config_params:
         del config_params["seed"]
 
+    output_file = config_params.get("output_file", "output_maze.txt")
+    ckpt_path = output_file + ".ckpt"
+    restored: Optional[Checkpoint] = None
+    if resume:
+        try:
+            restored = read_checkpoint(ckpt_path)
+        except FileNotFoundError:
+            print(f"\033[93m[WARNING] No checkpoint at {ckpt_path}, "
+                  "starting from scratch.\033[0m")
+        except ValueError as e:
+            print(f"\033[91m[ERROR] Cannot resume: {e}\033[0m")
+            sys.exit(1)
+    if restored is not None:
+        if "seed" in config and str(config["seed"]) != str(restored.seed):
+            print(f"\033[91m[ERROR] {ckpt_path} was made with seed "
+                  f"{restored.seed}, not {config['seed']}.\033[0m")
+            sys.exit(1)
+        seed_val = restored.seed
+    checkpointer = None
+    if checkpoint_every > 0:
+        checkpointer = Checkpointer(ckpt_path, checkpoint_every)
+
     # 4. Initialize and Generate Maze (Requirement IV.4)
     try:
         """
@@ -60,9 +177,23 @@ def main() -> None:
             entry=config_params["entry"],
             exit=config_params["exit"],
             perfect=config_params["perfect"],
-            output_file=config_params.get("output_file", "output_maze.txt"),
+            output_file=output_file,
             seed=seed_val,
+            rng_mode=config_params.get("rng", "mt"),
+            braid_loops=config_params.get("braid_loops"),
+            dead_end_ratio=config_params.get("dead_end_ratio"),
+            mold_scale=config_params.get("mold_scale", 1),
+            profiler=profiler,
+            progress=progress,
+            checkpoint=checkpointer,
+            storage=storage,
         )
+        if restored is not None:
+            if not restored.matches(maze):
+                raise ValueError(
+                    f"{ckpt_path} does not match this configuration")
+            maze.restore(restored.generator)
+            print(f"\033[94mResuming from {ckpt_path}...\033[0m")
 
         # Check if '42' pattern fits (Requirement IV.4 Special Case)
         if maze.width < 7 or maze.height < 5:
@@ -70,20 +201,55 @@ def main() -> None:
                 "\033[93m[WARNING] "
                 "Maze size too small for '42' pattern.\033[0m")
 
-        maze.generate()
+        _job = token
+        with phase(profiler, "generate"):
+            if restored is None or restored.solve is None:
+                maze.generate()
+            else:
+                # Checkpointed while solving: the walls are final
+                visited, backtracks, depth = restored.generator.counters
+                maze.stats = {"cells_visited": visited,
+                              "backtracks": backtracks,
+                              "max_stack_depth": depth}
+
+        # 5. Solve and Save Output File (Requirement IV.5)
+        solve_stats: Dict[str, int] = {}
+        with phase(profiler, "solve"):
+            scratch = None
+            if storage is not None:
+                scratch = mapped_buffer(
+                    maze.width * maze.height, directory=storage)
+            solution = solve(
+                maze.grid, maze.entry, maze.exit, solve_stats, progress,
+                checkpointer, restored.solve if restored else None,
+                scratch)
+    except Cancelled:
+        if os.path.exists(ckpt_path):
+            print("\033[93m[!] Cancelled. Continue later with "
+                  "--resume.\033[0m")
+        else:
+            print("\033[93m[!] Cancelled, nothing was written.\033[0m")
+        sys.exit(0)
     except Exception as e:
         print(f"\033[91m[ERROR] Generation failed: {e}\033[0m")
         sys.exit(1)
+    finally:
+        _job = None
 
-    # 5. Solve and Save Output File (Requirement IV.5)
-    solution = solve(maze.grid, maze.entry, maze.exit)
     if not solution:
         print(
             "\033[91m[ERROR] "
             "No valid path found. Check boundary walls.\033[0m")
 
     # Save using the hex format specified in IV.5
-    maze.save_to_file(solution)
+    with phase(profiler, "save_to_file"):
+        maze.save_to_file(
+            solution, packed=config.get("solution_format") == "packed")
+    # The job is complete: its checkpoint is of no use any more
+    if checkpointer is not None:
+        checkpointer.discard()
+    elif restored is not None:
+        os.remove(ckpt_path)
 
     # 6. Terminal Summary
     print("\033[92m--- MAZE GENERATED SUCCESSFULLY ---\033[0m")
@@ -94,9 +260,34 @@ def main() -> None:
 
     # 7. Launch Interactive Visualizer (Chapter V)
     # Pass the full maze object to handle interactive regeneration
-    print("\033[94mLaunching Graphical Interface...\033[0m")
-    visualizer = MazeVisualizer(maze, solution)
-    visualizer.run()
+    prefetch = config_params.get("prefetch", 0)
+    visualizer: Any = None
+    with phase(profiler, "gui_startup"):
+        if not terminal:
+            print("\033[94mLaunching Graphical Interface...\033[0m")
+            try:
+                visualizer = MazeVisualizer(
+                    maze, solution, prefetch=prefetch)
+            except OSError as e:
+                # No X11 / MiniLibX on this host (e.g. over SSH)
+                print(f"\033[93m[WARNING] Graphical interface "
+                      f"unavailable ({e}).\033[0m")
+        if visualizer is None and not (
+                sys.stdin.isatty() and sys.stdout.isatty()):
+            print("\033[93m[WARNING] Not a terminal: no interface "
+                  "started (the maze is saved).\033[0m")
+        elif visualizer is None:
+            print("\033[94mLaunching terminal interface...\033[0m")
+            visualizer = TerminalVisualizer(
+                maze, solution, prefetch=prefetch)
+
+    if profiler is not None:
+        profiler.count(maze.stats)
+        profiler.count(solve_stats)
+        print(profiler.to_json() if profile == "json"
+              else profiler.table())
+    if visualizer is not None:
+        visualizer.run()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import os
+from typing import Iterator, List, Optional, Tuple
+
+from mazegen.generator import MazeGenerator
+from mazegen.snapshot import MazeSnapshot
+from mazegen.solver import iter_solve
+
+
+class MazeAnimation:
+    """
+    Drives MazeGenerator.iter_generate() and then iter_solve() a few
+    steps per frame. Only the render thread calls advance(), the menu
+    thread just flips the paused / cancelled flags.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        entry: Tuple[int, int],
+        exit: Tuple[int, int],
+        perfect: bool,
+        seed: int,
+        steps_per_frame: int = 20,
+        rng_mode: str = "mt",
+        braid_loops: Optional[int] = None,
+        dead_end_ratio: Optional[float] = None,
+        mold_scale: int = 1,
+    ) -> None:
+        self.maze = MazeGenerator(
+            width=width,
+            height=height,
+            seed=seed,
+            entry=entry,
+            exit=exit,
+            output_file=os.devnull,
+            perfect=perfect,
+            rng_mode=rng_mode,
+            braid_loops=braid_loops,
+            dead_end_ratio=dead_end_ratio,
+            mold_scale=mold_scale,
+        )
+        self.steps_per_frame = max(1, steps_per_frame)
+        self.phase = "generate"
+        self.paused = False
+        self.cancelled = False
+        self.solution = ""
+        self._gen: Iterator = self.maze.iter_generate()
+        self._search: Optional[Iterator] = None
+
+    @property
+    def done(self) -> bool:
+        return self.phase == "done"
+
+    def advance(
+        self,
+    ) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """
+        Runs up to steps_per_frame steps.
+
+        Returns:
+            (cells whose walls changed, cells reached by the search)
+        """
+        touched: List[Tuple[int, int]] = []
+        searched: List[Tuple[int, int]] = []
+        if self.paused or self.cancelled or self.done:
+            return touched, searched
+
+        for _ in range(self.steps_per_frame):
+            if self.phase == "generate":
+                step = next(self._gen, None)
+                if step is None:
+                    self.phase = "solve"
+                    self._search = iter_solve(
+                        self.maze.grid, self.maze.entry, self.maze.exit)
+                    continue
+                _, r, c, nr, nc = step
+                touched.append((r, c))
+                touched.append((nr, nc))
+            elif self._search is not None:
+                try:
+                    _, r, c = next(self._search)
+                    searched.append((r, c))
+                except StopIteration as end:
+                    self.solution = end.value or ""
+                    self.phase = "done"
+                    break
+        return touched, searched
+
+    def snapshot(self) -> MazeSnapshot:
+        """The finished maze, once done is True."""
+        return MazeSnapshot.from_generator(self.maze, self.solution)
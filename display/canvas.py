@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+from array import array
+from typing import Union
+
+Buffer = Union[bytearray, memoryview]
+
+
+class Canvas:
+    """
+    Off-screen image with the same memory layout as an MLX image
+    (4 bytes per pixel, B-G-R-A order, 'line' bytes per row).
+    Lets the renderers draw without a window or an X11 display.
+    Like MlxDoubleBuffer it exposes a bytes view (addr / line) and a
+    32-bit view (pixels / stride) for whole-pixel stores.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.line: int = width * 4
+        self.stride: int = width
+        self.addr: Buffer = bytearray(self.line * height)
+        self.pixels: memoryview = memoryview(self.addr).cast("I")
+
+    def put_pixel(self, x: int, y: int, color: int) -> None:
+        """Safe pixel drawing."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y * self.stride + x] = color | 0xFF000000
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
+        """Fill a rectangle (clipped to the canvas) with one color."""
+        fill_rect(self.pixels, self.stride, self.width, self.height,
+                  x, y, w, h, color)
+
+    def save_ppm(self, path: str) -> None:
+        """Write the canvas as a binary PPM (P6) image."""
+        rgb = bytearray(self.width * self.height * 3)
+        for y in range(self.height):
+            row = self.addr[y * self.line:y * self.line + self.width * 4]
+            out = y * self.width * 3
+            # BGRA -> RGB using extended slices (no per-pixel loop)
+            rgb[out:out + self.width * 3:3] = row[2::4]
+            rgb[out + 1:out + self.width * 3:3] = row[1::4]
+            rgb[out + 2:out + self.width * 3:3] = row[0::4]
+        with open(path, "wb") as f:
+            f.write(f"P6\n{self.width} {self.height}\n255\n".encode())
+            f.write(rgb)
+
+
+def fill_rect(
+    pixels: memoryview, stride: int, width: int, height: int,
+    x: int, y: int, w: int, h: int, color: int
+) -> None:
+    """
+    Fill a clipped rectangle in any 32-bit pixel view (MLX image or
+    Canvas). One row is built once and copied with slice assignment.
+    """
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, width), min(y + h, height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    row = array("I", [color | 0xFF000000]) * (x1 - x0)
+    for yy in range(y0, y1):
+        pos = yy * stride + x0
+        pixels[pos:pos + len(row)] = row
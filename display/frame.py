@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import time
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+
+class FrameScheduler:
+    """
+    Paces the MLX loop hook to a target FPS and skips frames when
+    nothing changed. Also keeps a rolling log of frame timings.
+
+    Usage inside the loop hook:
+        if not sched.wait():
+            return 0
+        sched.begin()
+        ... draw ...; sched.mark("tiles")
+        sched.end()
+    """
+
+    def __init__(self, target_fps: float = 60.0, log_size: int = 600) -> None:
+        """
+        Args:
+            target_fps: Upper bound of frames drawn per second.
+            log_size:   Number of frames kept in the rolling log.
+        """
+        self.period: float = 1.0 / max(target_fps, 1.0)
+        self.dirty: bool = True
+        self._next_tick: float = 0.0
+        self._start: float = 0.0
+        self._last_mark: float = 0.0
+        self._phases: Dict[str, float] = {}
+        # Rolling log: (start timestamp, total seconds, phase seconds)
+        self.log: Deque[Tuple[float, float, Dict[str, float]]] = deque(
+            maxlen=log_size)
+
+    def invalidate(self) -> None:
+        """Request a redraw (key event, menu action, new maze...)."""
+        self.dirty = True
+
+    def wait(self) -> bool:
+        """
+        Sleeps until the next frame slot.
+
+        Returns:
+            bool: True if a frame must be drawn now.
+        """
+        now = time.perf_counter()
+        if now < self._next_tick:
+            time.sleep(self._next_tick - now)
+            now = self._next_tick
+        self._next_tick = now + self.period
+        if not self.dirty:
+            return False
+        # Cleared before drawing: changes made meanwhile trigger a new frame
+        self.dirty = False
+        return True
+
+    def begin(self) -> None:
+        """Starts timing a frame."""
+        self._start = self._last_mark = time.perf_counter()
+        self._phases = {}
+
+    def mark(self, phase: str) -> None:
+        """Closes the current phase (time since the previous mark)."""
+        now = time.perf_counter()
+        self._phases[phase] = self._phases.get(phase, 0.0) + (
+            now - self._last_mark)
+        self._last_mark = now
+
+    def end(self) -> None:
+        """Finishes the frame and appends it to the rolling log."""
+        total = time.perf_counter() - self._start
+        self.log.append((self._start, total, self._phases))
+
+    def fps(self) -> float:
+        """Frames drawn during the last second."""
+        if not self.log:
+            return 0.0
+        horizon = time.perf_counter() - 1.0
+        return float(sum(1 for start, _, _ in self.log if start >= horizon))
+
+    def overlay_lines(self) -> List[str]:
+        """Text shown by the on-screen overlay (last frame)."""
+        if not self.log:
+            return []
+        _, total, phases = self.log[-1]
+        lines = [f"FPS   {self.fps():5.1f}", f"frame {total * 1000:6.2f} ms"]
+        for name, secs in phases.items():
+            lines.append(f"{name:<5} {secs * 1000:6.2f} ms")
+        return lines
+
+    def dump(self, path: str) -> None:
+        """Writes the rolling log as CSV (one row per frame, in ms)."""
+        names: List[str] = []
+        for _, _, phases in self.log:
+            for name in phases:
+                if name not in names:
+                    names.append(name)
+        with open(path, "w") as f:
+            f.write(",".join(["start_s", "total_ms"] + names) + "\n")
+            for start, total, phases in self.log:
+                cols = [f"{start:.6f}", f"{total * 1000:.3f}"]
+                cols += [f"{phases.get(n, 0.0) * 1000:.3f}" for n in names]
+                f.write(",".join(cols) + "\n")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+import argparse
+import os
+from typing import (Any, Dict, Iterable, List, Optional, Sequence, Tuple,
+                    Union)
+
+from mlx_source import Mlx
+from mazegen.generator import MazeGenerator
+from mazegen.mask import STENCIL_42, MoldMask, auto_scale, mold_mask
+from mazegen.utils import load_maze_file, parse_config
+from .canvas import Canvas
+from .lod import LOD_THRESHOLD, WallPyramid, make_palette
+
+
+class MazeGallery:
+    """
+    Tiles thumbnails of many mazes (saved files or seeds) into one image.
+    Every thumbnail costs O(its pixels): small mazes are drawn wall by
+    wall, big ones through a WallPyramid.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[Union[str, int]],
+        config: Optional[Dict[str, Any]] = None,
+        thumb: int = 160,
+        columns: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            sources: Maze file paths and/or integer seeds.
+            config:  Parsed config used to generate the seeds.
+            thumb:   Thumbnail side in pixels.
+            columns: Thumbnails per row (default: square-ish layout).
+        """
+        self.sources = list(sources)
+        self.config = config or {}
+        self.thumb = thumb
+        self.gap = 8
+        self.columns = columns or max(1, int(len(self.sources) ** 0.5 + 0.5))
+        self.rows = max(1, -(-len(self.sources) // self.columns))
+
+        self.bg_color = 0x000000
+        self.wall_color = 0xFFFFFF
+        self.pattern_color = 0x333333
+        self.frame_color = 0x202020
+
+        self.width = self.columns * (thumb + self.gap) + self.gap
+        self.height = self.rows * (thumb + self.gap) + self.gap
+        self.canvas = Canvas(self.width, self.height)
+        self.labels: List[Tuple[int, int, str]] = []
+
+    def _load(
+        self, source: Union[str, int]
+    ) -> Tuple[List[List[int]], Iterable[Tuple[int, int]], str]:
+        """Returns (grid, mold_positions, label) for one source."""
+        if isinstance(source, int):
+            maze = MazeGenerator(
+                width=self.config["width"],
+                height=self.config["height"],
+                entry=self.config["entry"],
+                exit=self.config["exit"],
+                perfect=self.config.get("perfect", True),
+                output_file=os.devnull,
+                # Same string seed as SEED=<n> in a config file
+                seed=str(source),
+                rng_mode=self.config.get("rng", "mt"),
+                braid_loops=self.config.get("braid_loops"),
+                dead_end_ratio=self.config.get("dead_end_ratio"),
+                mold_scale=self.config.get("mold_scale", 1),
+            )
+            maze.generate()
+            return maze.grid, maze.mold_positions, f"seed {source}"
+        data = load_maze_file(source)
+        return (data["grid"], self._file_mold(data["grid"]),
+                os.path.basename(source))
+
+    @staticmethod
+    def _file_mold(grid: List[List[int]]) -> MoldMask:
+        """
+        The '42' of a saved maze. The file does not record MOLD_SCALE,
+        so the auto scale is tried first, then 1; a mask is kept only
+        if all its cells are closed in the grid.
+        """
+        rows, cols = len(grid), len(grid[0])
+        for scale in sorted({auto_scale(STENCIL_42, cols, rows), 1},
+                            reverse=True):
+            mask = mold_mask(STENCIL_42, cols, rows, scale)
+            if all(grid[r][c] == 15 for r, c in mask):
+                return mask
+        return mold_mask(None, cols, rows)
+
+    def _draw_walls(
+        self, grid: List[List[int]], mold: Iterable[Tuple[int, int]],
+        x0: int, y0: int, cell: int
+    ) -> None:
+        """Full-detail thumbnail: one rectangle per wall."""
+        c = self.canvas
+        for r, row in enumerate(grid):
+            for col, val in enumerate(row):
+                x, y = x0 + col * cell, y0 + r * cell
+                if val & 1:  # North
+                    c.fill_rect(x, y, cell, 1, self.wall_color)
+                if val & 2:  # East
+                    c.fill_rect(x + cell - 1, y, 1, cell, self.wall_color)
+                if val & 4:  # South
+                    c.fill_rect(x, y + cell - 1, cell, 1, self.wall_color)
+                if val & 8:  # West
+                    c.fill_rect(x, y, 1, cell, self.wall_color)
+        for r, col in mold:
+            c.fill_rect(x0 + col * cell, y0 + r * cell, cell, cell,
+                        self.pattern_color)
+
+    def render(self) -> Canvas:
+        """Draws every thumbnail into the off-screen canvas."""
+        palette = make_palette(
+            self.bg_color, self.wall_color, self.pattern_color)
+        self.canvas.fill_rect(
+            0, 0, self.width, self.height, self.frame_color)
+        self.labels = []
+        for i, source in enumerate(self.sources):
+            grid, mold, label = self._load(source)
+            rows, cols = len(grid), len(grid[0])
+            tx = self.gap + (i % self.columns) * (self.thumb + self.gap)
+            ty = self.gap + (i // self.columns) * (self.thumb + self.gap)
+            self.canvas.fill_rect(
+                tx, ty, self.thumb, self.thumb, self.bg_color)
+
+            cell = self.thumb // max(rows, cols)
+            if cell >= LOD_THRESHOLD:
+                self._draw_walls(grid, mold, tx, ty, cell)
+            else:
+                # Keep the aspect ratio inside the square thumbnail
+                scale = self.thumb / max(rows, cols)
+                out_w = max(1, int(cols * scale))
+                out_h = max(1, int(rows * scale))
+                WallPyramid(grid, mold).render(
+                    self.canvas.addr, self.canvas.line,
+                    tx, ty, out_w, out_h, palette)
+            self.labels.append((tx + 2, ty + self.thumb - 4, label))
+        return self.canvas
+
+    def show(self) -> None:
+        """Opens an MLX window displaying the rendered gallery."""
+        self.render()
+        m = Mlx()
+        ptr = m.mlx_init()
+        win = m.mlx_new_window(ptr, self.width, self.height, "Maze Gallery")
+        img = m.mlx_new_image(ptr, self.width, self.height)
+        addr, _, line, _ = m.mlx_get_data_addr(img)
+        src = self.canvas
+        for y in range(self.height):
+            addr[y * line:y * line + src.line] = \
+                src.addr[y * src.line:(y + 1) * src.line]
+
+        def redraw(param: Any) -> None:
+            m.mlx_put_image_to_window(ptr, win, img, 0, 0)
+            for x, y, text in self.labels:
+                m.mlx_string_put(ptr, win, x, y, 0x00FF00, text)
+
+        def keys(key: int, param: Any) -> None:
+            if key == 65307 or key == 53:  # ESC
+                m.mlx_loop_exit(ptr)
+
+        m.mlx_expose_hook(win, redraw, None)
+        m.mlx_key_hook(win, keys, None)
+        m.mlx_hook(win, 17, 0, lambda p: m.mlx_loop_exit(ptr), None)
+        redraw(None)
+        m.mlx_loop(ptr)
+
+
+def _parse_seeds(text: str) -> List[int]:
+    """'1,5,10-12' -> [1, 5, 10, 11, 12]"""
+    seeds: List[int] = []
+    for part in text.split(","):
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            seeds.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            seeds.append(int(part))
+    return seeds
+
+
+def main() -> None:
+    """Command line entry: python3 -m display.gallery ..."""
+    parser = argparse.ArgumentParser(description="Maze thumbnail gallery")
+    parser.add_argument("files", nargs="*", help="saved maze files")
+    parser.add_argument("--seeds", default="", help="e.g. 1-16 or 4,8,15")
+    parser.add_argument("--config", default="config.txt",
+                        help="config used to generate the seeds")
+    parser.add_argument("--thumb", type=int, default=160)
+    parser.add_argument("--columns", type=int, default=None)
+    parser.add_argument("--out", default=None,
+                        help="write a PPM image instead of opening a window")
+    args = parser.parse_args()
+
+    sources: List[Union[str, int]] = list(args.files)
+    seeds = _parse_seeds(args.seeds)
+    sources.extend(seeds)
+    if not sources:
+        parser.error("give at least one maze file or --seeds")
+    config = parse_config(args.config) if seeds else None
+
+    gallery = MazeGallery(sources, config, args.thumb, args.columns)
+    if args.out:
+        gallery.render().save_ppm(args.out)
+        print(f"Gallery written to {args.out}")
+    else:
+        gallery.show()
+
+
+if __name__ == "__main__":
+    main()
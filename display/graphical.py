@@ -2,21 +2,56 @@
 import os
 import random
 import threading
-from typing import Any
+from typing import Any, List, Optional, Set, Tuple
 from mlx_source import Mlx
-from mazegen.solver import solve
+from mazegen.editable import EditableMaze
+from mazegen.flags import MOLD, CellFlags
+from mazegen.snapshot import MazeSnapshot
+from .animate import MazeAnimation
+from .canvas import Canvas, fill_rect
+from .frame import FrameScheduler
+from .lod import LOD_THRESHOLD, WallPyramid, make_palette
+from .regen import RegenWorker
 
 
 class MazeVisualizer:
     """
     Interactive Graphical Visualizer for 42 Maze.
     Uses a separate thread for the terminal menu to prevent freezing.
+    With offscreen=True no window is opened and draw_frame() renders
+    into self.canvas (benchmarks, image export).
     """
 
-    def __init__(self, maze_obj: Any, solution: str) -> None:
+    def __init__(
+        self,
+        maze_obj: Any,
+        solution: str,
+        max_window: Tuple[int, int] = (1600, 1000),
+        fps: float = 60.0,
+        show_stats: bool = False,
+        prefetch: int = 0,
+        anim_speed: Optional[int] = None,
+        offscreen: bool = False,
+    ) -> None:
         self.maze_obj = maze_obj
         self.path = solution
 
+        # -- Regeneration runs in a worker; prefetch = mazes built ahead
+        # (its thread is started once the window is up, see below)
+        self.worker = RegenWorker(maze_obj, prefetch)
+
+        # -- Step-wise animation (menu 7), advanced by the render thread
+        self.anim: Optional[MazeAnimation] = None
+        self.anim_speed = anim_speed or max(
+            10, maze_obj.width * maze_obj.height // 100)
+        self._anim_prev: Optional[Tuple[Any, str]] = None
+        self._anim_full = False
+
+        # -- Frame pacing: redraw at most 'fps' times/s, only when dirty
+        self.scheduler = FrameScheduler(fps)
+        self.show_stats = show_stats
+        self.frame_log = "frame_times.csv"
+
         # -- State Variables
         self.pattern_color = 0x333333
         self.show_path = True
@@ -24,69 +59,151 @@ class MazeVisualizer:
         self.player_color = 0xFF00FF  # Lilac/Fuchsia
         self.exit_color = 0xFF0000  # Red
         self.path_color = 0x00FF00  # Green (Más visible)
+        self.search_color = 0x0066FF  # Blue (BFS animation)
         self.won = False
         self.running = True
 
+        # -- Live wall edits (keys I/J/K/L, mouse click), see edit_wall
+        self.editor: Optional[EditableMaze] = None
+
         # -- Player Position (row, col)
         self.player_pos = list(self.maze_obj.entry)
 
         # -- Display Settings
-        self.tile = 25
-        self.win_w = self.maze_obj.width * self.tile
-        self.win_h = self.maze_obj.height * self.tile
+        # Shrink tiles so the window fits; below LOD_THRESHOLD pixels
+        # per cell switch to the level-of-detail pyramid renderer.
+        fit = min(max_window[0] / self.maze_obj.width,
+                  max_window[1] / self.maze_obj.height)
+        self.lod = fit < LOD_THRESHOLD
+        self.tile = max(1, min(25, int(fit)))
+        self.scale = fit if self.lod else float(self.tile)
+        self.win_w = max(1, int(self.maze_obj.width * self.scale))
+        self.win_h = max(1, int(self.maze_obj.height * self.scale))
+
+        # -- LOD caches (rebuilt only when the maze, path or colors change)
+        self._pyramid: Optional[WallPyramid] = None
+        self._pyramid_grid: Any = None
+        self._palette: List[bytes] = []
+        self._palette_key: Tuple[int, int] = (-1, -1)
+        self._lod_path: Set[Tuple[int, int]] = set()
+        self._lod_path_src: Any = None
 
-        # -- MLX Initialization
-        self.m = Mlx()
-        self.ptr = self.m.mlx_init()
-        self.win = self.m.mlx_new_window(
-            self.ptr, self.win_w, self.win_h, "A-Maze-ing 42"
-        )
-        self.img = self.m.mlx_new_image(self.ptr, self.win_w, self.win_h)
+        # -- Per-cell flags (mold / path / entry / exit), see refresh_flags
+        self.flags = CellFlags(
+            maze_obj.width, maze_obj.height, maze_obj.mold_positions,
+            maze_obj.entry, maze_obj.exit, solution)
+        self._flags_maze: Any = maze_obj
+        self._flags_path = solution
 
-        res = self.m.mlx_get_data_addr(self.img)
-        self.addr, self.line = res[0], res[2]
+        # -- MLX Initialization (skipped off-screen: draw into a Canvas)
+        self.canvas: Optional[Canvas] = None
+        self.m: Any = None
+        self.ptr: Any = None
+        self.win: Any = None
+        self.fb: Any = None
+        if offscreen:
+            self.canvas = Canvas(self.win_w, self.win_h)
+        else:
+            self.m = Mlx()
+            self.ptr = self.m.mlx_init()
+            self.win = self.m.mlx_new_window(
+                self.ptr, self.win_w, self.win_h, "A-Maze-ing 42"
+            )
+            # Front/back images: we always draw into the back one
+            self.fb = self.m.mlx_new_double_buffer(
+                self.ptr, self.win_w, self.win_h)
+            # Only now that the window exists (and never off-screen):
+            # a failed MLX setup leaves no thread behind
+            self.worker.start()
+        self.bind_back_buffer()
+
+    def bind_back_buffer(self) -> None:
+        """Points the drawing views at the current back image."""
+        if self.canvas is not None:
+            self.img = None
+            self.addr, self.line = self.canvas.addr, self.canvas.line
+            self.px, self.stride = self.canvas.pixels, self.canvas.stride
+            return
+        self.img = self.fb.back_img
+        self.addr, self.line = self.fb.data, self.fb.line
+        self.px, self.stride = self.fb.pixels, self.fb.stride
 
     def put_pixel(self, x: int, y: int, color: int) -> None:
-        """Safe pixel drawing."""
+        """Safe pixel drawing (one 32-bit store)."""
         if 0 <= x < self.win_w and 0 <= y < self.win_h:
-            pos = (y * self.line) + (x * 4)
-            self.addr[pos] = color & 0xFF
-            self.addr[pos + 1] = (color >> 8) & 0xFF
-            self.addr[pos + 2] = (color >> 16) & 0xFF
-            self.addr[pos + 3] = 255
+            self.px[y * self.stride + x] = color | 0xFF000000
+
+    def fill_rect(self, x: int, y: int, w: int, h: int, color: int) -> None:
+        """Clipped rectangle, one slice copy per row."""
+        fill_rect(self.px, self.stride, self.win_w, self.win_h,
+                  x, y, w, h, color)
 
     def draw_tile(self, tx: int, ty: int, val: int) -> None:
         """Draw walls based on hex bits. tx=col, ty=row"""
         x0, y0 = tx * self.tile, ty * self.tile
-        is_42 = (ty, tx) in self.maze_obj.mold_positions
+        is_42 = self.flags.data[ty * self.flags.width + tx] & MOLD
         bg = self.pattern_color if is_42 else 0x000000
+        t = self.tile
 
-        for i in range(self.tile):
-            for j in range(self.tile):
-                self.put_pixel(x0 + i, y0 + j, bg)
+        self.fill_rect(x0, y0, t, t, bg)
 
         if is_42:
             return
 
         w = 2
         if val & 1:  # North
-            for i in range(self.tile):
-                for j in range(w):
-                    self.put_pixel(x0 + i, y0 + j, self.wall_color)
+            self.fill_rect(x0, y0, t, w, self.wall_color)
         if val & 2:  # East
-            for i in range(w):
-                for j in range(self.tile):
-                    self.put_pixel(
-                        x0 + self.tile - 1 - i, y0 + j, self.wall_color)
+            self.fill_rect(x0 + t - w, y0, w, t, self.wall_color)
         if val & 4:  # South
-            for i in range(self.tile):
-                for j in range(w):
-                    self.put_pixel(
-                        x0 + i, y0 + self.tile - 1 - j, self.wall_color)
+            self.fill_rect(x0, y0 + t - w, t, w, self.wall_color)
         if val & 8:  # West
-            for i in range(w):
-                for j in range(self.tile):
-                    self.put_pixel(x0 + i, y0 + j, self.wall_color)
+            self.fill_rect(x0, y0, w, t, self.wall_color)
+
+    def cell_to_pixel(self, r: int, c: int) -> Tuple[int, int]:
+        """Top-left pixel (x, y) of a cell at the current scale."""
+        return int(c * self.scale), int(r * self.scale)
+
+    def fill_cell(self, r: int, c: int, margin: int, color: int) -> None:
+        """Square centered in a cell; at least 2px in LOD mode."""
+        x0, y0 = self.cell_to_pixel(r, c)
+        size = max(2, self.tile - margin * 2)
+        self.fill_rect(x0 + margin, y0 + margin, size, size, color)
+
+    def render_lod(self) -> None:
+        """Zoomed-out render: cost bounded by pixels, not by cells."""
+        grid = self.maze_obj.grid
+        if self._pyramid is None or self._pyramid_grid is not grid:
+            self._pyramid = WallPyramid(grid, self.maze_obj.mold_positions)
+            self._pyramid_grid = grid
+        key = (self.wall_color, self.pattern_color)
+        if key != self._palette_key:
+            self._palette = make_palette(0x000000, *key)
+            self._palette_key = key
+        self._pyramid.render(
+            self.addr, self.line, 0, 0, self.win_w, self.win_h, self._palette)
+
+        if self.show_path and self.path and not self.won:
+            # Path pixels are deduplicated once per path
+            if self._lod_path_src is not self.flags.path:
+                self._lod_path = {self.cell_to_pixel(r, c)
+                                  for r, c in self.flags.path}
+                self._lod_path_src = self.flags.path
+            for x, y in self._lod_path:
+                self.put_pixel(x, y, self.path_color)
+
+    def refresh_flags(self) -> None:
+        """Rebuilds the flag layer only if the maze or the path changed."""
+        maze = self.maze_obj
+        if self._flags_maze is not maze:
+            self.flags = CellFlags(
+                maze.width, maze.height, maze.mold_positions,
+                maze.entry, maze.exit, self.path)
+            self._flags_maze = maze
+            self._flags_path = self.path
+        elif self._flags_path is not self.path:
+            self.flags.set_path(self.path)
+            self._flags_path = self.path
 
     def terminal_menu(self) -> None:
         """Menu loop running in a separate thread."""
@@ -96,19 +213,21 @@ class MazeVisualizer:
             print("2. Show/Hide path")
             print("3. Rotate maze colors")
             print("4. Quit")
-            choice = input("Choice? (1-4): ")
+            print("5. Show/Hide FPS overlay")
+            print("6. Dump frame-time log")
+            print("7. Animate a new maze")
+            print("8. Pause/Resume animation")
+            print("9. Cancel animation")
+            choice = input("Choice? (1-9): ")
 
+            anim = self.anim
             if choice == "1":
-                self.maze_obj.seed = random.randint(0, 9999)
-                random.seed(self.maze_obj.seed)
-                self.maze_obj.setup_matrices()
-                self.maze_obj.generate()
-                self.path = solve(
-                    self.maze_obj.grid, self.maze_obj.entry, self.maze_obj.exit
-                )
-                self.player_pos = list(self.maze_obj.entry)
-                self.won = False
-                print(f"New Maze Seed: {self.maze_obj.seed}")
+                if anim is not None:
+                    anim.cancelled = True
+                # Built in the background, swapped in by render()
+                self.worker.request()
+                if self.worker.busy:
+                    print("Generating a new maze...")
             elif choice == "2":
                 self.show_path = not self.show_path
             elif choice == "3":
@@ -118,12 +237,69 @@ class MazeVisualizer:
             elif choice == "4":
                 self.running = False
                 os._exit(0)
+            elif choice == "5":
+                self.show_stats = not self.show_stats
+            elif choice == "6":
+                self.scheduler.dump(self.frame_log)
+                print(f"Frame times written to {self.frame_log}")
+            elif choice == "7":
+                if anim is not None:
+                    anim.cancelled = True
+                m = self.maze_obj
+                # Picked up and stepped by the render thread
+                self.anim = MazeAnimation(
+                    m.width, m.height, m.entry, m.exit, m.perfect,
+                    random.randint(0, 9999), self.anim_speed,
+                    rng_mode=m.rng_mode, braid_loops=m.braid_loops,
+                    dead_end_ratio=m.dead_end_ratio,
+                    mold_scale=m.mold_scale)
+            elif choice == "8" and anim is not None:
+                anim.paused = not anim.paused
+                print("Animation paused" if anim.paused else "Resumed")
+            elif choice == "9" and anim is not None:
+                anim.cancelled = True
+            self.scheduler.invalidate()
+
+    def edit_wall(self, r: int, c: int, side: str) -> None:
+        """
+        Toggles one wall. The first edit swaps the maze for an
+        EditableMaze copy, which then repairs the path incrementally.
+        """
+        if self.anim is not None:
+            return
+        if not (0 <= r < self.maze_obj.height
+                and 0 <= c < self.maze_obj.width):
+            return
+        if self.editor is None or self.editor is not self.maze_obj:
+            self.editor = EditableMaze(self.maze_obj)
+            self.maze_obj = self.editor
+        self.editor.toggle_wall(r, c, side)
+        self.path = self.editor.solution
+        # Walls changed in place: the LOD pyramid must be rebuilt
+        self._pyramid = None
+        self.scheduler.invalidate()
+
+    def on_click(self, button: int, x: int, y: int, param: Any) -> int:
+        """Left click: toggles the wall of the cell nearest the pointer."""
+        if button == 1:
+            fx, fy = x / self.scale, y / self.scale
+            r, c = int(fy), int(fx)
+            fx, fy = fx - c, fy - r
+            edges = {"N": fy, "S": 1 - fy, "W": fx, "E": 1 - fx}
+            self.edit_wall(r, c, min(edges, key=lambda k: edges[k]))
+        return 0
 
     def handle_keys(self, key: int, param: Any) -> int:
         """Movement logic. keycodes for Linux (X11)."""
         if key == 65307 or key == 53:  # ESC
             self.running = False
             os._exit(0)
+        if key == 102:  # F: toggle the FPS / frame-time overlay
+            self.show_stats = not self.show_stats
+        # I / J / K / L: toggle the N / W / S / E wall of the player cell
+        side = {105: "N", 106: "W", 107: "S", 108: "E"}.get(key)
+        if side is not None:
+            self.edit_wall(self.player_pos[0], self.player_pos[1], side)
         if not self.won:
             r, c = self.player_pos
             val = self.maze_obj.grid[r][c]
@@ -139,62 +315,143 @@ class MazeVisualizer:
             if tuple(self.player_pos) == self.maze_obj.exit:
                 print("\n🎉 YOU WON!")
                 self.won = True
+        self.scheduler.invalidate()
         return 0
 
-    def render(self, *args: Any) -> int:
-        """Main rendering loop."""
-        try:
-            # Clear / Background
-            for y in range(self.maze_obj.height):
-                for x in range(self.maze_obj.width):
-                    self.draw_tile(x, y, self.maze_obj.grid[y][x])
-
-            # Draw Solution Path
-            if self.show_path and self.path and not self.won:
-                r, c = self.maze_obj.entry
-                margin = self.tile // 2 - 2
-                for move in self.path:
-                    if move == "N":
-                        r -= 1
-                    elif move == "S":
-                        r += 1
-                    elif move == "E":
-                        c += 1
-                    elif move == "W":
-                        c -= 1
-
-                    # Draw path dot
-                    for i in range(5):
-                        for j in range(5):
-                            self.put_pixel(
-                                c * self.tile + margin + i,
-                                r * self.tile + margin + j,
-                                self.path_color,
-                            )
-
-            # Draw Exit (Red Square)
+    def draw_frame(self) -> None:
+        """Draws the maze, path, exit and player into the image buffer."""
+        sched = self.scheduler
+        self.refresh_flags()
+        if self.lod:
+            self.render_lod()
+            sched.mark("tiles")
             ex_r, ex_c = self.maze_obj.exit
-            margin_exit = self.tile // 4
-            for i in range(self.tile - margin_exit * 2):
-                for j in range(self.tile - margin_exit * 2):
-                    self.put_pixel(
-                        ex_c * self.tile + margin_exit + i,
-                        ex_r * self.tile + margin_exit + j,
-                        self.exit_color,
-                    )
-
-            # Draw Player (Lilac Square)
+            self.fill_cell(ex_r, ex_c, 0, self.exit_color)
             pr, pc = self.player_pos
-            margin_p = self.tile // 4
-            for i in range(self.tile - margin_p * 2):
-                for j in range(self.tile - margin_p * 2):
-                    self.put_pixel(
-                        pc * self.tile + margin_p + i,
-                        pr * self.tile + margin_p + j,
-                        self.player_color,
-                    )
+            self.fill_cell(pr, pc, 0, self.player_color)
+            sched.mark("items")
+            return
+
+        # Clear / Background
+        for y in range(self.maze_obj.height):
+            for x in range(self.maze_obj.width):
+                self.draw_tile(x, y, self.maze_obj.grid[y][x])
+        sched.mark("tiles")
+
+        # Draw Solution Path
+        if self.show_path and self.path and not self.won:
+            dot = min(5, max(1, self.tile - 2))
+            margin = (self.tile - dot) // 2
+            for r, c in self.flags.path:
+                # Draw path dot
+                self.fill_rect(c * self.tile + margin,
+                               r * self.tile + margin,
+                               dot, dot, self.path_color)
+        sched.mark("path")
+
+        # Draw Exit (Red Square)
+        ex_r, ex_c = self.maze_obj.exit
+        margin_exit = self.tile // 4
+        size = self.tile - margin_exit * 2
+        self.fill_rect(ex_c * self.tile + margin_exit,
+                       ex_r * self.tile + margin_exit,
+                       size, size, self.exit_color)
+
+        # Draw Player (Lilac Square)
+        pr, pc = self.player_pos
+        margin_p = self.tile // 4
+        size = self.tile - margin_p * 2
+        self.fill_rect(pc * self.tile + margin_p,
+                       pr * self.tile + margin_p,
+                       size, size, self.player_color)
+        sched.mark("items")
+
+    def swap_maze(self, snap: MazeSnapshot) -> None:
+        """Switches to a finished maze (render thread, between frames)."""
+        self.maze_obj = snap
+        self.path = snap.solution
+        self.player_pos = list(snap.entry)
+        self.won = False
+        self.scheduler.invalidate()
+        print(f"New Maze Seed: {snap.seed}")
 
-            self.m.mlx_put_image_to_window(self.ptr, self.win, self.img, 0, 0)
+    def update_animation(self) -> None:
+        """Render thread: start, finish or cancel the running animation."""
+        anim = self.anim
+        if anim is None:
+            return
+        if anim.cancelled:
+            self.anim = None
+            if self._anim_prev is not None:
+                self.maze_obj, self.path = self._anim_prev
+                self._anim_prev = None
+            self.player_pos = list(self.maze_obj.entry)
+            self.won = False
+            self.scheduler.invalidate()
+            print("Animation cancelled")
+        elif self.maze_obj is not anim.maze:
+            # First frame: show the closed grid with a full redraw
+            self._anim_prev = (self.maze_obj, self.path)
+            self.maze_obj, self.path = anim.maze, ""
+            self.player_pos = list(anim.maze.entry)
+            self.won = False
+            self._anim_full = True
+            self.scheduler.invalidate()
+        elif anim.done:
+            self.anim = None
+            self._anim_prev = None
+            self.swap_maze(anim.snapshot())
+        elif not anim.paused:
+            # Keep frames coming while steps remain
+            self.scheduler.invalidate()
+
+    def draw_animation_step(self, anim: MazeAnimation) -> None:
+        """Advances the animation and redraws only the touched cells."""
+        sched = self.scheduler
+        touched, searched = anim.advance()
+        self.refresh_flags()
+        sched.mark("step")
+        if self.lod:
+            # The walls changed in place: fix the pyramid blocks above
+            # them (render_lod only rebuilds it for a new grid)
+            if touched and self._pyramid is not None:
+                self._pyramid.update(self.maze_obj.grid, touched)
+            self.render_lod()
+        else:
+            grid = self.maze_obj.grid
+            for r, c in set(touched):
+                self.draw_tile(c, r, grid[r][c])
+            dot = max(1, self.tile // 3)
+            for r, c in searched:
+                self.fill_rect(c * self.tile + dot, r * self.tile + dot,
+                               dot, dot, self.search_color)
+        sched.mark("tiles")
+
+    def render(self, *args: Any) -> int:
+        """
+        Loop hook: paced by the FrameScheduler, draws only when
+        something changed since the last frame.
+        """
+        self.update_animation()
+        snap = self.worker.poll()
+        if snap is not None:
+            self.swap_maze(snap)
+        sched = self.scheduler
+        if not sched.wait():
+            return 0
+        try:
+            sched.begin()
+            anim = self.anim
+            if anim is not None and not self._anim_full:
+                self.draw_animation_step(anim)
+            else:
+                self._anim_full = False
+                self.draw_frame()
+
+            # Swap: the finished frame goes to the window in one piece
+            self.fb.present(self.win)
+            self.bind_back_buffer()
+            sched.mark("blit")
 
             if self.won:
                 self.m.mlx_string_put(
@@ -206,15 +463,31 @@ class MazeVisualizer:
                     "YOU WON!",
                 )
 
+            if self.show_stats:
+                # Stats of the previous frame (this one is still open)
+                for i, text in enumerate(sched.overlay_lines()):
+                    self.m.mlx_string_put(
+                        self.ptr, self.win, 8, 16 + i * 14, 0xFFFF00, text)
+                sched.mark("hud")
+            sched.end()
+
         except Exception as e:
             print(f"Render Error: {e}")
             os._exit(0)
         return 0
 
+    def on_expose(self, param: Any) -> int:
+        """Window uncovered or remapped: the image must be pushed again."""
+        self._anim_full = True
+        self.scheduler.invalidate()
+        return 0
+
     def run(self) -> None:
         menu_thread = threading.Thread(target=self.terminal_menu, daemon=True)
         menu_thread.start()
         self.m.mlx_key_hook(self.win, self.handle_keys, None)
+        self.m.mlx_mouse_hook(self.win, self.on_click, None)
+        self.m.mlx_expose_hook(self.win, self.on_expose, None)
         self.m.mlx_hook(self.win, 17, 0, lambda p: os._exit(0), None)
         self.m.mlx_loop_hook(self.ptr, self.render, None)
         self.m.mlx_loop(self.ptr)
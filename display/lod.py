@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+from array import array
+from typing import Iterable, List, Sequence, Set, Tuple, Union
+
+from mazegen.mask import MoldMask
+from .canvas import Buffer
+
+# Below this many pixels per cell the walls are no longer readable,
+# so renderers switch from draw_tile() to the aggregated pyramid.
+LOD_THRESHOLD = 4
+
+# Number of walls (set bits) for every 4-bit cell value
+_POPCOUNT = [bin(i).count("1") for i in range(16)]
+
+# Densities are quantized to 16 levels: code = wall_q * 16 + mold_q
+_LEVELS = 16
+
+
+def _mix(a: int, b: int, t: float) -> int:
+    """Linear blend of two 0xRRGGBB colors."""
+    out = 0
+    for shift in (0, 8, 16):
+        ca, cb = (a >> shift) & 0xFF, (b >> shift) & 0xFF
+        out |= int(ca + (cb - ca) * t) << shift
+    return out
+
+
+def make_palette(bg: int, wall: int, pattern: int) -> List[bytes]:
+    """
+    Builds the 256 BGRA pixels indexed by a pyramid code.
+
+    Args:
+        bg:      Floor color (no walls).
+        wall:    Wall color (cell fully walled).
+        pattern: '42' mold color.
+    Returns:
+        list: One 4-byte pixel per code.
+    """
+    palette = []
+    for code in range(_LEVELS * _LEVELS):
+        wall_q, mold_q = divmod(code, _LEVELS)
+        color = _mix(bg, wall, wall_q / (_LEVELS - 1))
+        color = _mix(color, pattern, mold_q / (_LEVELS - 1))
+        palette.append(bytes((color & 0xFF, (color >> 8) & 0xFF,
+                              (color >> 16) & 0xFF, 255)))
+    return palette
+
+
+class WallPyramid:
+    """
+    Mipmap-style pyramid of wall and '42' density.
+    Level 0 has one code per cell, level k one code per 2^k x 2^k block.
+    Built once per maze in O(cells); rendering from it only touches
+    one code per output pixel.
+    """
+
+    def __init__(
+        self,
+        grid: Sequence[Sequence[int]],
+        mold_positions: Iterable[Tuple[int, int]] = (),
+    ) -> None:
+        self.height: int = len(grid)
+        self.width: int = len(grid[0]) if self.height else 0
+        # Each level: (rows, cols, codes[row * cols + col])
+        self.levels: List[Tuple[int, int, bytearray]] = []
+        # Wall count of every block of every level, kept for update()
+        self._walls: List[array] = []
+        # A MoldMask already answers 'in' in O(1)
+        self._build(grid, mold_positions
+                    if isinstance(mold_positions, MoldMask)
+                    else set(mold_positions))
+
+    def _build(
+        self, grid: Sequence[Sequence[int]],
+        mold: Union[Set[Tuple[int, int]], MoldMask]
+    ) -> None:
+        """Sums wall/mold counts bottom-up and quantizes every level."""
+        rows, cols = self.height, self.width
+        walls = array("I", bytes(4 * rows * cols))
+        molds = array("I", bytes(4 * rows * cols))
+        for r, row in enumerate(grid):
+            base = r * cols
+            for c, val in enumerate(row):
+                if (r, c) in mold:
+                    molds[base + c] = 1
+                else:
+                    walls[base + c] = _POPCOUNT[val & 15]
+
+        size = 1
+        while True:
+            self.levels.append(
+                (rows, cols, self._quantize(walls, molds, rows, cols, size)))
+            self._walls.append(walls)
+            if rows == 1 and cols == 1:
+                break
+            walls, molds, rows, cols = self._reduce(walls, molds, rows, cols)
+            size *= 2
+
+    def _quantize(
+        self, walls: array, molds: array, rows: int, cols: int, size: int
+    ) -> bytearray:
+        """Turns block sums into 8-bit palette codes."""
+        codes = bytearray(rows * cols)
+        top = _LEVELS - 1
+        for r in range(rows):
+            n_rows = min(size, self.height - r * size)
+            for c in range(cols):
+                n = n_rows * min(size, self.width - c * size)
+                i = r * cols + c
+                wall_q = (walls[i] * top) // (4 * n)
+                mold_q = (molds[i] * top) // n
+                codes[i] = wall_q * _LEVELS + mold_q
+        return codes
+
+    @staticmethod
+    def _reduce(
+        walls: array, molds: array, rows: int, cols: int
+    ) -> Tuple[array, array, int, int]:
+        """Sums 2x2 blocks into the next (coarser) level."""
+        n_rows, n_cols = (rows + 1) // 2, (cols + 1) // 2
+        out_w = array("I", bytes(4 * n_rows * n_cols))
+        out_m = array("I", bytes(4 * n_rows * n_cols))
+        for r in range(rows):
+            src = r * cols
+            dst = (r // 2) * n_cols
+            for c in range(cols):
+                out_w[dst + c // 2] += walls[src + c]
+                out_m[dst + c // 2] += molds[src + c]
+        return out_w, out_m, n_rows, n_cols
+
+    def update(
+        self, grid: Sequence[Sequence[int]],
+        cells: Iterable[Tuple[int, int]]
+    ) -> None:
+        """
+        Re-reads the walls of 'cells' (changed in place in 'grid') and
+        requantizes the blocks above them: O(levels) per cell instead
+        of a full rebuild. Mold cells never change.
+        """
+        top = _LEVELS - 1
+        level0 = self._walls[0]
+        for r, c in cells:
+            i = r * self.width + c
+            delta = _POPCOUNT[grid[r][c] & 15] - level0[i]
+            if not delta or self.levels[0][2][i] % _LEVELS:
+                continue
+            size = 1
+            for (rows, cols, codes), walls in zip(self.levels, self._walls):
+                br, bc = r // size, c // size
+                j = br * cols + bc
+                walls[j] += delta
+                n = (min(size, self.height - br * size)
+                     * min(size, self.width - bc * size))
+                codes[j] = ((walls[j] * top) // (4 * n) * _LEVELS
+                            + codes[j] % _LEVELS)
+                size *= 2
+
+    def level_for(self, out_w: int, out_h: int) -> int:
+        """Coarsest level that still has at least one block per pixel."""
+        cells_per_px = min(self.width / max(out_w, 1),
+                           self.height / max(out_h, 1))
+        level = 0
+        while (2 ** (level + 1) <= cells_per_px
+               and level + 1 < len(self.levels)):
+            level += 1
+        return level
+
+    def render(
+        self,
+        addr: Buffer,
+        line: int,
+        x: int,
+        y: int,
+        out_w: int,
+        out_h: int,
+        palette: List[bytes],
+    ) -> None:
+        """
+        Draws the whole maze scaled into the out_w x out_h rectangle at
+        (x, y). Cost is O(out_w * out_h) whatever the maze size.
+        The rectangle must lie inside the buffer (no clipping here).
+
+        Args:
+            addr:    BGRA buffer (MLX image data or Canvas.addr).
+            line:    Bytes per buffer row.
+            x, y:    Top-left corner of the destination rectangle.
+            out_w:   Destination width in pixels.
+            out_h:   Destination height in pixels.
+            palette: Pixels from make_palette().
+        """
+        if out_w <= 0 or out_h <= 0 or not self.levels:
+            return
+        level = self.level_for(out_w, out_h)
+        rows, cols, codes = self.levels[level]
+        # Pixel -> block column/row lookup, computed once per call
+        col_of = [min((px * self.width // out_w) >> level, cols - 1)
+                  for px in range(out_w)]
+        last_row = -1
+        row_bytes = b""
+        for py in range(out_h):
+            block_row = min((py * self.height // out_h) >> level, rows - 1)
+            if block_row != last_row:
+                base = block_row * cols
+                row_bytes = b"".join([palette[codes[base + c]]
+                                      for c in col_of])
+                last_row = block_row
+            pos = (y + py) * line + x * 4
+            addr[pos:pos + len(row_bytes)] = row_bytes
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+import os
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Optional
+
+from mazegen.generator import MazeGenerator
+from mazegen.snapshot import MazeSnapshot
+from mazegen.solver import SolverWorkspace, solve
+
+
+class RegenWorker:
+    """
+    Background maze regeneration.
+    The menu thread only calls request(); the worker thread builds a new
+    immutable MazeSnapshot and the render thread picks it up with poll()
+    between two frames, so a frame never sees a half-built grid.
+    With prefetch > 0 the worker keeps that many mazes ready in advance
+    and a request is served instantly.
+    The thread only runs between start() (or the first request()) and
+    stop(), so a caller that fails to set up never leaks it.
+    """
+
+    def __init__(self, template: Any, prefetch: int = 0) -> None:
+        """
+        Args:
+            template: Maze whose size, entry, exit and 'perfect' flag
+                      are reused for every new maze.
+            prefetch: Number of mazes generated ahead of time.
+        """
+        self.width: int = template.width
+        self.height: int = template.height
+        self.entry = template.entry
+        self.exit = template.exit
+        self.perfect: bool = template.perfect
+        self.rng_mode: str = template.rng_mode
+        self.braid_loops: Optional[int] = template.braid_loops
+        self.dead_end_ratio: Optional[float] = template.dead_end_ratio
+        self.mold_scale: int = template.mold_scale
+        self.prefetch = max(0, prefetch)
+        # Only the worker thread touches these: reset, never rebuilt
+        self._maze: Optional[MazeGenerator] = None
+        self._workspace = SolverWorkspace(self.width, self.height)
+
+        self._seeds = random.Random()
+        self._ready: Deque[MazeSnapshot] = deque()
+        self._pending: Optional[MazeSnapshot] = None
+        self._requests = 0
+        self._stopped = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the worker thread (once; prefetching begins)."""
+        with self._cond:
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(
+                    target=self._loop, daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """Lets the worker thread end (after the maze it is building)."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def request(self) -> None:
+        """
+        Asks for a new maze (returns immediately). A maze poll() has
+        not collected yet already answers it: nothing is consumed, so
+        repeated requests between two frames never drop a maze.
+        """
+        self.start()
+        with self._cond:
+            if self._pending is not None:
+                return
+            if self._ready:
+                # Pre-generated maze available: hand it over right away
+                self._pending = self._ready.popleft()
+            else:
+                self._requests += 1
+            self._cond.notify()
+
+    def poll(self) -> Optional[MazeSnapshot]:
+        """Called by the render thread: the finished maze, if any."""
+        with self._cond:
+            snap, self._pending = self._pending, None
+            if snap is not None:
+                # A slot was consumed: let the worker refill the buffer
+                self._cond.notify()
+            return snap
+
+    @property
+    def busy(self) -> bool:
+        """True while a requested maze is still being generated."""
+        return self._requests > 0
+
+    def _build(self) -> MazeSnapshot:
+        """
+        Generates one maze with a fresh random seed. The generator and
+        solver buffers are reused from one maze to the next; only the
+        snapshot itself is new.
+        """
+        # A string, as SEED=<n> in a config file gives back
+        seed = str(self._seeds.randint(0, 9999))
+        maze = self._maze
+        if maze is None:
+            maze = self._maze = MazeGenerator(
+                width=self.width,
+                height=self.height,
+                seed=seed,
+                entry=self.entry,
+                exit=self.exit,
+                output_file=os.devnull,
+                perfect=self.perfect,
+                rng_mode=self.rng_mode,
+                braid_loops=self.braid_loops,
+                dead_end_ratio=self.dead_end_ratio,
+                mold_scale=self.mold_scale,
+            )
+        else:
+            maze.reset(seed)
+        maze.generate()
+        solution = solve(maze.grid, maze.entry, maze.exit,
+                         workspace=self._workspace)
+        return MazeSnapshot.from_generator(maze, solution)
+
+    def _loop(self) -> None:
+        """Worker thread: serve requests first, then fill the buffer."""
+        while True:
+            with self._cond:
+                # A request is served once poll() took the last maze
+                while not self._stopped and not (
+                        self._requests and self._pending is None) and (
+                        len(self._ready) >= self.prefetch):
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                serving = self._requests > 0 and self._pending is None
+                if serving and self._ready:
+                    # Asked while prefetching: a buffered maze is ready
+                    self._requests -= 1
+                    self._pending = self._ready.popleft()
+                    continue
+
+            snap = self._build()  # Heavy work, lock released
+
+            with self._cond:
+                if serving:
+                    self._requests -= 1
+                    self._pending = snap
+                else:
+                    self._ready.append(snap)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+import os
+import select
+import shutil
+import sys
+from typing import Any, List, Optional, Sequence, TextIO, Tuple
+
+from mazegen.flags import MOLD, PATH, CellFlags
+from mazegen.snapshot import MazeSnapshot
+from .regen import RegenWorker
+
+# Box-drawing junction per set of wall segments around a corner,
+# bits: 1 up, 2 right, 4 down, 8 left
+JUNCTIONS = " ╵╶└╷│┌├╴┘─┴┐┤┬┼"
+
+# ANSI styles (SGR parameters); '' is the terminal default
+WALL = ""
+MOLD_STYLE = "90"    # Dark gray
+PATH_STYLE = "32"    # Green
+EXIT_STYLE = "1;31"  # Bold red
+PLAYER_STYLE = "1;35"  # Bold magenta
+
+# One character on screen: (style, char)
+Glyph = Tuple[str, str]
+Frame = List[List[Glyph]]
+
+
+class TerminalRenderer:
+    """
+    Draws a maze with box-drawing characters on a (2 * height + 1) x
+    (2 * width + 1) character lattice: cells on odd rows / columns,
+    walls and corners in between.
+
+    The static part (walls, '42', path) is built once per maze and
+    path. A frame only copies the rows the player and exit touch, and
+    render() compares it with the last emitted frame: untouched rows
+    are skipped by identity, changed ones are diffed column by column
+    and only the changed runs are written, each after a cursor move.
+    Everything goes out in one write() per frame.
+
+    Frames are clipped to the terminal (or 'size'): a line wider than
+    the screen would wrap and shift every later row of the diff.
+    """
+
+    def __init__(
+        self, out: TextIO = sys.stdout,
+        size: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """
+        Args:
+            out: Stream the escape sequences go to.
+            size: (columns, lines) to clip to; default: the terminal
+                  size, read at every render() so resizes apply.
+        """
+        self.out = out
+        self.size = size
+        self.show_path = True
+        self._base: Frame = []
+        # What the static layer was built from (identity checks)
+        self._base_maze: Any = None
+        self._base_path: Any = None
+        self._base_show = True
+        self._last: Optional[Frame] = None
+
+    def _build_base(self, maze: Any, flags: CellFlags) -> Frame:
+        """Walls, '42' mold and (optionally) the path."""
+        grid: Sequence[Sequence[int]] = maze.grid
+        h, w = maze.height, maze.width
+        rows: Frame = []
+        for lr in range(2 * h + 1):
+            row: List[Glyph] = []
+            r = lr // 2
+            for lc in range(2 * w + 1):
+                c = lc // 2
+                if lr % 2 == 0 and lc % 2 == 0:
+                    row.append((WALL, JUNCTIONS[
+                        self._corner(grid, h, w, r, c)]))
+                elif lr % 2 == 0:
+                    row.append((WALL, "─" if self._h_wall(
+                        grid, h, r, c) else " "))
+                elif lc % 2 == 0:
+                    row.append((WALL, "│" if self._v_wall(
+                        grid, w, r, c) else " "))
+                else:
+                    bits = flags.data[r * w + c]
+                    if bits & MOLD:
+                        row.append((MOLD_STYLE, "█"))
+                    elif bits & PATH and self.show_path:
+                        row.append((PATH_STYLE, "·"))
+                    else:
+                        row.append((WALL, " "))
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _h_wall(grid: Sequence[Sequence[int]], h: int, r: int, c: int) -> bool:
+        """Horizontal wall above cell row r (r == h: bottom border)."""
+        return bool(grid[r][c] & 1) if r < h else bool(grid[r - 1][c] & 4)
+
+    @staticmethod
+    def _v_wall(grid: Sequence[Sequence[int]], w: int, r: int, c: int) -> bool:
+        """Vertical wall left of cell column c (c == w: right border)."""
+        return bool(grid[r][c] & 8) if c < w else bool(grid[r][c - 1] & 2)
+
+    def _corner(
+        self, grid: Sequence[Sequence[int]], h: int, w: int, r: int, c: int
+    ) -> int:
+        bits = 0
+        if r > 0 and self._v_wall(grid, w, r - 1, c):
+            bits |= 1
+        if c < w and self._h_wall(grid, h, r, c):
+            bits |= 2
+        if r < h and self._v_wall(grid, w, r, c):
+            bits |= 4
+        if c > 0 and self._h_wall(grid, h, r, c - 1):
+            bits |= 8
+        return bits
+
+    def frame(
+        self, maze: Any, flags: CellFlags, player: Sequence[int]
+    ) -> Frame:
+        """Static layer plus exit and player (only their rows copied)."""
+        if (maze is not self._base_maze or flags.path is not self._base_path
+                or self.show_path != self._base_show):
+            self._base = self._build_base(maze, flags)
+            self._base_maze, self._base_path = maze, flags.path
+            self._base_show = self.show_path
+        rows = list(self._base)
+        for (r, c), glyph in (
+                (maze.exit, (EXIT_STYLE, "X")),
+                (tuple(player), (PLAYER_STYLE, "@"))):
+            lr, lc = 2 * r + 1, 2 * c + 1
+            if rows[lr] is self._base[lr]:
+                rows[lr] = list(rows[lr])
+            rows[lr][lc] = glyph
+        return rows
+
+    def screen_size(self) -> Tuple[int, int]:
+        """(columns, lines) frames are clipped to."""
+        if self.size is not None:
+            return self.size
+        size = shutil.get_terminal_size()
+        return size.columns, size.lines
+
+    def render(self, frame: Frame) -> int:
+        """
+        Writes the difference with the previous frame, clipped to
+        screen_size().
+
+        Returns:
+            int: Number of bytes written (0 if nothing changed).
+        """
+        columns, lines = self.screen_size()
+        if len(frame) > lines or any(len(row) > columns for row in frame):
+            # Copies: clipped rows are diffed column by column
+            frame = [row[:columns] if len(row) > columns else row
+                     for row in frame[:lines]]
+        last = self._last
+        parts: List[str] = []
+        if last is None or len(last) != len(frame) or (
+                frame and len(last[0]) != len(frame[0])):
+            parts.append("\x1b[2J")
+            last = [[] for _ in frame]
+        style = None
+        for y, row in enumerate(frame):
+            old = last[y]
+            if row is old:
+                continue
+            x, n = 0, len(row)
+            while x < n:
+                if x < len(old) and row[x] == old[x]:
+                    x += 1
+                    continue
+                # Changed run: one cursor move, then the glyphs
+                parts.append(f"\x1b[{y + 1};{x + 1}H")
+                while x < n and (x >= len(old) or row[x] != old[x]):
+                    glyph_style, char = row[x]
+                    if glyph_style != style:
+                        parts.append(f"\x1b[0;{glyph_style}m"
+                                     if glyph_style else "\x1b[0m")
+                        style = glyph_style
+                    parts.append(char)
+                    x += 1
+        self._last = frame
+        if not parts:
+            return 0
+        parts.append("\x1b[0m")
+        data = "".join(parts)
+        self.out.write(data)
+        self.out.flush()
+        return len(data.encode())
+
+    def invalidate(self) -> None:
+        """Forces a full redraw on the next render()."""
+        self._last = None
+
+
+class TerminalVisualizer:
+    """
+    Playable maze in a terminal (no X11): arrows / WASD move, P shows
+    the path, R regenerates, Q or ESC quits.
+    """
+
+    def __init__(self, maze_obj: Any, solution: str, prefetch: int = 0,
+                 fps: float = 30.0) -> None:
+        self.maze_obj = maze_obj
+        self.path = solution
+        self.worker = RegenWorker(maze_obj, prefetch)
+        self.frame_time = 1.0 / fps
+        self.renderer = TerminalRenderer()
+        self.flags = CellFlags(
+            maze_obj.width, maze_obj.height, maze_obj.mold_positions,
+            maze_obj.entry, maze_obj.exit, solution)
+        self.player_pos = list(maze_obj.entry)
+        self.won = False
+        self.status = ""
+
+    def swap_maze(self, snap: MazeSnapshot) -> None:
+        self.maze_obj = snap
+        self.path = snap.solution
+        self.flags = CellFlags(
+            snap.width, snap.height, snap.mold_positions,
+            snap.entry, snap.exit, snap.solution)
+        self.player_pos = list(snap.entry)
+        self.won = False
+        self.status = f"New Maze Seed: {snap.seed}"
+
+    def move(self, key: str) -> None:
+        """Moves the player if the wall on that side is open."""
+        moves = {"N": (-1, 0, 1), "S": (1, 0, 4), "W": (0, -1, 8),
+                 "E": (0, 1, 2)}
+        dr, dc, bit = moves[key]
+        r, c = self.player_pos
+        if self.won or self.maze_obj.grid[r][c] & bit:
+            return
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < self.maze_obj.height and 0 <= nc < self.maze_obj.width:
+            self.player_pos = [nr, nc]
+        if tuple(self.player_pos) == self.maze_obj.exit:
+            self.won = True
+            self.status = "YOU WON! (R: new maze, Q: quit)"
+
+    def handle_input(self, data: str) -> bool:
+        """Applies the pressed keys; False to quit."""
+        keys = {"\x1b[A": "N", "\x1b[B": "S", "\x1b[C": "E", "\x1b[D": "W",
+                "w": "N", "s": "S", "d": "E", "a": "W"}
+        i = 0
+        while i < len(data):
+            seq = data[i:i + 3]
+            if seq in keys:
+                self.move(keys[seq])
+                i += 3
+                continue
+            ch = data[i].lower()
+            i += 1
+            if ch in ("q", "\x1b"):
+                return False
+            if ch in keys:
+                self.move(keys[ch])
+            elif ch == "p":
+                self.renderer.show_path = not self.renderer.show_path
+            elif ch == "r":
+                self.worker.request()
+                self.status = "Generating a new maze..."
+        return True
+
+    def draw(self) -> None:
+        frame = self.renderer.frame(
+            self.maze_obj, self.flags, self.player_pos)
+        columns, lines = self.renderer.screen_size()
+        # A maze larger than the screen: show the part around the
+        # player, scrolled by whole screens, and keep the last line
+        # for the status
+        r, c = self.player_pos
+        top = self._origin(2 * r + 1, len(frame), lines - 1)
+        left = self._origin(2 * c + 1, len(frame[0]) if frame else 0,
+                            columns)
+        if top or left or len(frame) > lines - 1:
+            frame = [row[left:left + columns]
+                     for row in frame[top:top + lines - 1]]
+        # Status line under the maze, padded so old text is erased
+        width = len(frame[0]) if frame else 0
+        text = self.status.ljust(max(width, len(self.status)))
+        frame.append([("", ch) for ch in text])
+        self.renderer.render(frame)
+
+    @staticmethod
+    def _origin(pos: int, total: int, span: int) -> int:
+        """First lattice row / column shown so that 'pos' is visible."""
+        if total <= span or span < 1:
+            return 0
+        return min(pos // span * span, total - span)
+
+    def run(self) -> None:
+        """Raw-mode key loop on the alternate screen."""
+        import termios
+        import tty
+
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        sys.stdout.write("\x1b[?1049h\x1b[?25l")
+        self.renderer.invalidate()
+        try:
+            self.worker.start()
+            tty.setcbreak(fd)
+            running = True
+            while running:
+                snap = self.worker.poll()
+                if snap is not None:
+                    self.swap_maze(snap)
+                self.draw()
+                ready, _, _ = select.select([fd], [], [], self.frame_time)
+                if ready:
+                    data = os.read(fd, 64).decode(errors="ignore")
+                    running = self.handle_input(data)
+        finally:
+            self.worker.stop()
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+            sys.stdout.write("\x1b[0m\x1b[?25h\x1b[?1049l")
+            sys.stdout.flush()
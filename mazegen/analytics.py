@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Quality metrics for saved mazes, computed over the whole grid at once.
+
+    python3 -m mazegen.analytics DIR [--out metrics.csv] [--workers N]
+
+Every cell is one byte holding its wall bits; a 256-entry table maps it
+to its number of open sides, so dead ends, corridors and junctions are
+counted without a per-cell Python loop. NumPy is used when installed,
+otherwise bytes.translate / bytes.count do the same job in C.
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from .flags import MOVES, OPEN_SIDES
+from .solver import solve_packed
+from .utils import ConfigError, read_maze_file
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+# Wall bits (value 15 = closed cell, e.g. the '42' mold)
+N, E, S, W = 1, 2, 4, 8
+CLOSED = 15
+
+# Cell byte -> 1 if it is closed / a corridor (2 open sides) / open to
+# the East / open to the South, else 0
+_IS_CLOSED = bytes(v == CLOSED for v in range(256))
+_IS_TWO = bytes(v == 2 for v in range(256))
+_EAST_OPEN = bytes(not v & E for v in range(256))
+_SOUTH_OPEN = bytes(not v & S for v in range(256))
+
+FIELDS = [
+    "file", "width", "height", "dead_ends", "corridors", "junctions",
+    "dead_end_ratio", "corridor_count", "corridor_mean", "corridor_max",
+    "solution_length", "solution_ratio", "tortuosity", "mold_cells",
+    "mold_contact",
+]
+
+
+def read_packed(
+    file_path: str
+) -> Tuple[int, int, bytes, Tuple[int, int], Tuple[int, int], str]:
+    """
+    Reads a maze written by MazeGenerator.save_to_file as one flat
+    byte string (row * width + col), without a per-cell int() call.
+
+    Returns:
+        tuple: (width, height, cells, entry, exit, solution) with entry
+               and exit as (row, col).
+    Raises:
+        OSError, ConfigError: See utils.read_maze_file.
+    """
+    rows, entry, exit, line, packed = read_maze_file(file_path)
+    solution = line if packed is None else str(packed)
+    return (len(rows[0]), len(rows), b"".join(rows), entry, exit,
+            solution)
+
+
+def _as_int(flags: bytes) -> int:
+    return int.from_bytes(flags, "little")
+
+
+def _edge_masks(width: int, size: int) -> Tuple[int, int]:
+    """0/1 byte flags (as ints): not on the last / not on the first
+    column."""
+    rows = size // width
+    not_last = (b"\x01" * (width - 1) + b"\x00") * rows
+    not_first = (b"\x00" + b"\x01" * (width - 1)) * rows
+    return _as_int(not_last), _as_int(not_first)
+
+
+def corridor_lengths(degree: bytes, cells: bytes, width: int) -> List[int]:
+    """
+    Lengths of the chains of 2-sided cells between dead ends / junctions
+    (closed loops of corridor cells are counted too).
+
+    The links between two neighbouring corridor cells are found with
+    whole-grid passes (bytes.translate, then AND of shifted big
+    integers, one bit per byte). With NumPy the chains are labelled by
+    hooking roots and pointer jumping, a few whole-array rounds;
+    without it, a union-find runs over the links only.
+    """
+    size = len(cells)
+    corridor = degree.translate(_IS_TWO)
+    if np is not None:
+        corr = np.frombuffer(corridor, dtype=np.uint8).astype(bool)
+        v = np.frombuffer(cells, dtype=np.uint8)
+        col = np.arange(size) % width
+        east = np.flatnonzero(corr[:-1] & corr[1:] & ((v[:-1] & E) == 0)
+                              & (col[:-1] != width - 1))
+        south = np.flatnonzero(corr[:-width] & corr[width:]
+                               & ((v[:-width] & S) == 0))
+        a = np.concatenate((east, south))
+        b = np.concatenate((east + 1, south + width))
+        labels = np.arange(size)
+        while True:
+            # Hook the larger root of every link onto the smaller one,
+            # then point every cell straight at its root
+            ra, rb = labels[a], labels[b]
+            split = ra != rb
+            if not split.any():
+                break
+            np.minimum.at(labels, np.maximum(ra, rb)[split],
+                          np.minimum(ra, rb)[split])
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+        sizes = np.bincount(labels[corr], minlength=size)
+        return [int(n) for n in sizes[sizes > 0]]
+
+    c = _as_int(corridor)
+    not_last, _ = _edge_masks(width, size)
+    east_bits = (c & (c >> 8) & _as_int(cells.translate(_EAST_OPEN))
+                 & not_last)
+    south_bits = (c & (c >> (8 * width))
+                  & _as_int(cells.translate(_SOUTH_OPEN)))
+    parent = list(range(size))
+
+    def root(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for bits, step in ((east_bits, 1), (south_bits, width)):
+        for pos in compress(range(size), bits.to_bytes(size, "little")):
+            ra, rb = root(pos), root(pos + step)
+            if ra != rb:
+                parent[max(ra, rb)] = min(ra, rb)
+    counts = Counter(root(pos) for pos in compress(range(size), corridor))
+    return list(counts.values())
+
+
+def path_indices(
+    entry: Tuple[int, int], solution: str, width: int, size: int
+) -> List[int]:
+    """Flat indices of the cells walked by 'solution', entry included."""
+    r, c = entry
+    out = [r * width + c]
+    for move in solution:
+        dr, dc = MOVES.get(move, (0, 0))
+        r, c = r + dr, c + dc
+        out.append(r * width + c)
+    return [i for i in out if 0 <= i < size]
+
+
+def mold_contact(
+    cells: bytes, width: int, height: int, path: List[int]
+) -> int:
+    """Number of path cells touching a closed ('42') cell."""
+    if np is not None:
+        mold = np.frombuffer(cells, dtype=np.uint8).reshape(
+            height, width) == CLOSED
+        near = np.zeros_like(mold)
+        near[1:, :] |= mold[:-1, :]
+        near[:-1, :] |= mold[1:, :]
+        near[:, 1:] |= mold[:, :-1]
+        near[:, :-1] |= mold[:, 1:]
+        return int(near.reshape(-1)[np.array(path, dtype=np.intp)].sum())
+
+    if not path:
+        return 0
+    # Same four shifts on big integers (one bit per cell byte)
+    size = width * height
+    closed = _as_int(cells.translate(_IS_CLOSED))
+    not_last, not_first = _edge_masks(width, size)
+    near = ((closed << (8 * width)) | (closed >> (8 * width))
+            | ((closed >> 8) & not_last) | ((closed << 8) & not_first))
+    near &= (1 << (8 * size)) - 1
+    picked = itemgetter(*path)(near.to_bytes(size, "little"))
+    return picked if len(path) == 1 else sum(picked)
+
+
+def analyze(
+    width: int,
+    height: int,
+    cells: bytes,
+    entry: Tuple[int, int],
+    exit: Tuple[int, int],
+    solution: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Computes the metrics of one maze.
+
+    Args:
+        width, height: Grid size.
+        cells: Wall bits, one byte per cell (row * width + col).
+        entry, exit: Coordinates as (row, col).
+        solution: Direction string; solved with BFS when None or empty.
+    Returns:
+        dict: One metrics row (see FIELDS, without 'file').
+    """
+    size = width * height
+    degree = cells.translate(OPEN_SIDES)
+    if np is not None:
+        counts = np.bincount(
+            np.frombuffer(degree, dtype=np.uint8), minlength=5)
+        dead_ends, corridors = int(counts[1]), int(counts[2])
+        junctions = int(counts[3] + counts[4])
+        mold_cells = int(np.count_nonzero(
+            np.frombuffer(cells, dtype=np.uint8) == CLOSED))
+    else:
+        dead_ends, corridors = degree.count(1), degree.count(2)
+        junctions = degree.count(3) + degree.count(4)
+        mold_cells = cells.count(CLOSED)
+
+    if not solution:
+        # Silent on a dead end: solve() would print into '--out -' CSV
+        solution = solve_packed(cells, width, height, entry, exit) or ""
+    lengths = corridor_lengths(degree, cells, width)
+    path = path_indices(entry, solution, width, size)
+    distance = abs(entry[0] - exit[0]) + abs(entry[1] - exit[1])
+
+    return {
+        "width": width,
+        "height": height,
+        "dead_ends": dead_ends,
+        "corridors": corridors,
+        "junctions": junctions,
+        "dead_end_ratio": round(dead_ends / size, 4),
+        "corridor_count": len(lengths),
+        "corridor_mean": round(sum(lengths) / len(lengths), 2)
+        if lengths else 0,
+        "corridor_max": max(lengths, default=0),
+        "solution_length": len(solution),
+        "solution_ratio": round(len(solution) / size, 4),
+        "tortuosity": round(len(solution) / distance, 3) if distance else 0,
+        "mold_cells": mold_cells,
+        "mold_contact": mold_contact(cells, width, height, path),
+    }
+
+
+def analyze_file(file_path: str) -> Dict[str, Any]:
+    """Metrics of one saved maze; {'file', 'error'} if it is invalid."""
+    try:
+        width, height, cells, entry, exit, solution = read_packed(file_path)
+        row = analyze(width, height, cells, entry, exit, solution)
+    except (OSError, ConfigError) as e:
+        return {"file": file_path, "error": str(e)}
+    return {"file": file_path, **row}
+
+
+def analyze_directory(
+    directory: str, pattern: str = "*.txt", workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Analyzes every matching file in parallel, sorted by file name."""
+    files = sorted(glob.glob(os.path.join(directory, pattern)))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(files) < 2:
+        return [analyze_file(f) for f in files]
+    # A few chunks per worker: less IPC than one task per file
+    chunk = max(1, len(files) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(analyze_file, files, chunksize=chunk))
+
+
+def write_csv(rows: List[Dict[str, Any]], out: TextIO) -> None:
+    """Writes the metrics table (invalid files are left out)."""
+    writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for row in rows:
+        if "error" not in row:
+            writer.writerow(row)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maze quality metrics")
+    parser.add_argument("directory", help="folder of saved mazes")
+    parser.add_argument("--pattern", default="*.txt")
+    parser.add_argument("--out", default="-",
+                        help="CSV file (default: standard output)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    rows = analyze_directory(args.directory, args.pattern, args.workers)
+    for row in rows:
+        if "error" in row:
+            print(f"[WARNING] {row['file']}: {row['error']}",
+                  file=sys.stderr)
+    if args.out == "-":
+        write_csv(rows, sys.stdout)
+    else:
+        with open(args.out, "w", newline="") as f:
+            write_csv(rows, f)
+        valid = sum("error" not in row for row in rows)
+        print(f"{valid} maze(s) analyzed, table written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Runs every job of a manifest (see utils.parse_manifest) in this one
+interpreter: the modules are imported once and stay warm for all jobs.
+
+    python3 -m mazegen.batch jobs.txt --workers 2 --status status.jsonl
+
+At most 'workers' jobs run at the same time (threads). A job that is
+invalid or fails is reported and the other jobs go on; the status
+file gets one JSON line per job as soon as it is done.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
+
+from .generator import MazeGenerator
+from .solver import SolverWorkspace, solve
+from .utils import Job, parse_manifest
+
+STATUS_OK, STATUS_INVALID, STATUS_FAILED = "ok", "invalid", "failed"
+
+# Per worker thread: the last job's generator and solver workspace,
+# reset for the next job with the same settings instead of rebuilt
+_reuse = threading.local()
+
+
+@dataclass
+class JobResult:
+    name: str
+    status: str                       # 'ok', 'invalid' or 'failed'
+    seconds: float
+    # Always the config string: SEED=<seed> in a manifest replays it
+    seed: Optional[str] = None
+    output_file: Optional[str] = None
+    solution_length: Optional[int] = None
+    error: Optional[str] = None
+
+
+def _maze_for(
+    config: Dict[str, Any], seed: Any
+) -> Tuple[MazeGenerator, SolverWorkspace]:
+    """A generator for 'config' and 'seed', reused when possible."""
+    key = (config["width"], config["height"], config["entry"],
+           config["exit"], config["perfect"], config.get("rng", "mt"),
+           config.get("braid_loops"), config.get("dead_end_ratio"),
+           config.get("mold_scale", 1))
+    cached = getattr(_reuse, "maze", None)
+    if cached is not None and cached[0] == key:
+        _, maze, workspace = cached
+        maze.reset(seed)
+        maze.output_file = config["output_file"]
+        return maze, workspace
+    maze = MazeGenerator(
+        width=config["width"],
+        height=config["height"],
+        entry=config["entry"],
+        exit=config["exit"],
+        perfect=config["perfect"],
+        output_file=config["output_file"],
+        seed=seed,
+        rng_mode=config.get("rng", "mt"),
+        braid_loops=config.get("braid_loops"),
+        dead_end_ratio=config.get("dead_end_ratio"),
+        mold_scale=config.get("mold_scale", 1),
+    )
+    workspace = SolverWorkspace(maze.width, maze.height)
+    _reuse.maze = (key, maze, workspace)
+    return maze, workspace
+
+
+def run_job(job: Job) -> JobResult:
+    """
+    Generates, solves and saves one job; never raises.
+
+    Returns:
+        JobResult: Its status and wall-clock time.
+    """
+    if not job.valid:
+        return JobResult(job.name, STATUS_INVALID, 0.0,
+                         error="; ".join(job.errors))
+    config = job.config
+    seed = config.get("seed")
+    if seed is None:
+        # As a string, like SEED from a file: the same maze on replay
+        seed = str(random.randint(0, 999999))
+    began = time.perf_counter()
+    result = JobResult(job.name, STATUS_OK, 0.0, seed,
+                       config["output_file"])
+    try:
+        maze, workspace = _maze_for(config, seed)
+        maze.generate()
+        solution = solve(maze.grid, maze.entry, maze.exit,
+                         workspace=workspace)
+        maze.save_to_file(
+            solution, packed=config.get("solution_format") == "packed")
+        result.solution_length = len(solution)
+        if not solution:
+            result.status = STATUS_FAILED
+            result.error = "no path from entry to exit"
+    except Exception as e:
+        result.status = STATUS_FAILED
+        result.error = f"{type(e).__name__}: {e}"
+    result.seconds = time.perf_counter() - began
+    return result
+
+
+def run_manifest(
+    jobs: List[Job],
+    workers: int = 1,
+    on_done: Optional[Callable[[JobResult], None]] = None,
+) -> List[JobResult]:
+    """
+    Runs the jobs with at most 'workers' of them at a time.
+
+    Args:
+        jobs: Parsed manifest (invalid jobs are reported, not run).
+        workers: Concurrency bound.
+        on_done: Called with each result as soon as it is known
+                 (from one thread at a time).
+    Returns:
+        list: The results, in manifest order.
+    """
+    results: Dict[int, JobResult] = {}
+    lock = threading.Lock()
+
+    def report(index: int, result: JobResult) -> None:
+        with lock:
+            results[index] = result
+            if on_done is not None:
+                on_done(result)
+
+    runnable = []
+    for index, job in enumerate(jobs):
+        if job.valid:
+            runnable.append(index)
+        else:
+            report(index, run_job(job))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run_job, jobs[i]): i for i in runnable}
+        for future in as_completed(futures):
+            report(futures[future], future.result())
+    return [results[i] for i in range(len(jobs))]
+
+
+def _printer(status: Optional[TextIO]) -> Callable[[JobResult], None]:
+    def on_done(result: JobResult) -> None:
+        line = f"[{result.status}] {result.name} {result.seconds:.2f}s"
+        if result.error:
+            line += f": {result.error}"
+        elif result.output_file:
+            line += f" (seed {result.seed}) -> {result.output_file}"
+        print(line, flush=True)
+        if status is not None:
+            status.write(json.dumps(asdict(result)) + "\n")
+            status.flush()
+    return on_done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a maze manifest")
+    parser.add_argument("manifest", help="[job] blocks of KEY=VALUE")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="jobs running at the same time")
+    parser.add_argument("--status", default=None, metavar="FILE",
+                        help="write one JSON line per job")
+    args = parser.parse_args()
+
+    try:
+        jobs = parse_manifest(args.manifest)
+    except OSError as e:
+        print(f"Error: cannot read {args.manifest}: {e}")
+        sys.exit(1)
+
+    status = open(args.status, "w") if args.status else None
+    began = time.perf_counter()
+    try:
+        results = run_manifest(jobs, args.workers, _printer(status))
+    finally:
+        if status is not None:
+            status.close()
+    ok = sum(r.status == STATUS_OK for r in results)
+    print(f"{ok}/{len(results)} job(s) ok in "
+          f"{time.perf_counter() - began:.2f}s")
+    if ok != len(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
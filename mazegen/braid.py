@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Braid engine: turns a perfect maze into one with loops, hitting an
+exact target instead of trying (width * height) // 10 random walls.
+
+    BRAID_LOOPS=N       open exactly N walls (each adds one loop)
+    DEAD_END_RATIO=R    open walls at dead ends until at most
+                        R * width * height dead ends are left
+
+Both work on one packed copy of the grid: the walls that can go
+(closed, inside the maze, no '42' cell on either side) or the dead
+ends are listed in one linear pass and drawn in bulk, so no draw is
+spent on a wall that is already open.
+"""
+import heapq
+import random
+from itertools import compress
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .flags import OPEN_SIDES
+from .rng import CounterRNG
+from .solver import DIRECTIONS
+
+try:
+    import numpy as np
+except ImportError:  # Optional dependency
+    np = None
+
+# CounterRNG streams (the generator uses 1-4)
+STREAM_ORDER, STREAM_SIDE = 5, 6
+
+# One opened wall: (row, col, next_row, next_col)
+Opening = Tuple[int, int, int, int]
+# Opposite wall bit of each DIRECTIONS entry
+_OPPOSITE_BIT = (4, 8, 1, 2)
+# Cell byte -> 1 if its North / East wall is closed, else 0
+_NORTH = bytes(v & 1 for v in range(256))
+_EAST = bytes((v >> 1) & 1 for v in range(256))
+_IS_ONE = bytes(v == 1 for v in range(256))
+
+
+def _as_int(flags: bytes) -> int:
+    return int.from_bytes(flags, "little")
+
+
+def removable_walls(cells: bytes, width: int, blocked: bytes) -> List[int]:
+    """
+    Closed inner walls between two open ('42'-free) cells.
+
+    With NumPy, one vectorized mask per side. Without it, the 0/1
+    flags of each condition are combined as big integers (one bit set
+    per byte, so AND / OR work byte-wise, in C) and the wall ids are
+    read with itertools.compress: no per-cell Python code either way.
+
+    Args:
+        cells: Wall bits, cells[row * width + col].
+        width: Grid width.
+        blocked: 1 per '42' cell, 0 elsewhere (same layout).
+    Returns:
+        list: Wall ids, cell * 2 for its North wall, cell * 2 + 1 for
+              its East wall.
+    """
+    size = len(cells)
+    n = size - width
+    if np is not None:
+        v = np.frombuffer(cells, dtype=np.uint8)
+        free = np.frombuffer(blocked, dtype=np.uint8) == 0
+        north_ok = (v[width:] & 1).astype(bool) & free[width:] & free[:n]
+        east_ok = ((v[:-1] & 2).astype(bool) & free[:-1] & free[1:]
+                   & (np.arange(1, size) % width != 0))
+        ids = np.concatenate((
+            (np.flatnonzero(north_ok) + width) * 2,
+            np.flatnonzero(east_ok) * 2 + 1))
+        return ids.tolist()
+    # North wall of cells width.. size - 1, shared with the cell above
+    north = _as_int(cells[width:].translate(_NORTH)) & ~(
+        _as_int(blocked[width:]) | _as_int(blocked[:n]))
+    # East wall of cells 0 .. size - 2 (not on the last column)
+    inner = (b"\x01" * (width - 1) + b"\x00") * (size // width)
+    east = (_as_int(cells[:-1].translate(_EAST)) & _as_int(inner[:-1])
+            & ~(_as_int(blocked[:-1]) | _as_int(blocked[1:])))
+    return (list(compress(range(2 * width, 2 * size, 2),
+                          north.to_bytes(n, "little")))
+            + list(compress(range(1, 2 * size - 2, 2),
+                            east.to_bytes(size - 1, "little"))))
+
+
+def _shuffled(
+    items: List[int], rng: random.Random, counter: Optional[CounterRNG]
+) -> List[int]:
+    """Random order of 'items' (draws keyed by item with a counter)."""
+    if counter is None:
+        rng.shuffle(items)
+        return items
+    keys = counter.many(STREAM_ORDER, items, 1 << 31)
+    return [item for _, item in sorted(zip(keys, items))]
+
+
+def _sample(
+    items: List[int], count: int, rng: random.Random,
+    counter: Optional[CounterRNG]
+) -> List[int]:
+    """'count' distinct items (all of them if there are fewer)."""
+    count = min(count, len(items))
+    if counter is None:
+        return rng.sample(items, count)
+    keys = counter.many(STREAM_ORDER, items, 1 << 31)
+    return [item for _, item in heapq.nsmallest(count, zip(keys, items))]
+
+
+def iter_loops(
+    grid: List[List[int]],
+    mold: bytes,
+    count: int,
+    rng: random.Random,
+    counter: Optional[CounterRNG] = None,
+) -> Iterator[Opening]:
+    """
+    Opens 'count' removable walls (fewer if the maze has fewer). In a
+    perfect maze each one closes exactly one loop.
+
+    Args:
+        grid: Wall bits [row][col], modified in place.
+        mold: 1 per '42' cell (row * width + col), 0 elsewhere.
+        count: Number of walls to open.
+        rng, counter: Draw source ('counter' wins when given).
+    """
+    width = len(grid[0])
+    cells = b"".join(bytes(row) for row in grid)
+    for wall in _sample(removable_walls(cells, width, mold), count,
+                        rng, counter):
+        r, c = divmod(wall >> 1, width)
+        if wall & 1:
+            grid[r][c] &= ~2
+            grid[r][c + 1] &= ~8
+            yield r, c, r, c + 1
+        else:
+            grid[r][c] &= ~1
+            grid[r - 1][c] &= ~4
+            yield r, c, r - 1, c
+
+
+def iter_dead_end_ratio(
+    grid: List[List[int]],
+    mold: bytes,
+    ratio: float,
+    keep: Sequence[int],
+    rng: random.Random,
+    counter: Optional[CounterRNG] = None,
+) -> Iterator[Opening]:
+    """
+    Opens one wall per dead end, in random order, until at most
+    ratio * width * height dead ends are left. A wall between two dead
+    ends removes both, unless that would overshoot the target.
+
+    Args:
+        grid: Wall bits [row][col], modified in place.
+        mold: 1 per '42' cell (row * width + col), 0 elsewhere.
+        ratio: Target dead ends / cells (as analytics reports it).
+        keep: Cells that are never dead ends in the saved maze (entry
+              and exit get a border opening later).
+        rng, counter: Draw source ('counter' wins when given).
+    """
+    height, width = len(grid), len(grid[0])
+    cells = b"".join(bytes(row) for row in grid)
+    degree = bytearray(cells.translate(OPEN_SIDES))
+    for pos in keep:
+        degree[pos] = 4  # Never counted, never picked
+    target = int(ratio * width * height)
+    dead = list(compress(range(len(degree)), degree.translate(_IS_ONE)))
+    left = len(dead)
+
+    for pos in _shuffled(dead, rng, counter):
+        if left <= target:
+            break
+        if degree[pos] != 1:
+            continue  # A neighbour already opened into it
+        r, c = divmod(pos, width)
+        value = grid[r][c]
+        sides: List[Tuple[int, int]] = []
+        for i, (dr, dc, bit, _) in enumerate(DIRECTIONS):
+            nr, nc = r + dr, c + dc
+            if not (value & bit and 0 <= nr < height and 0 <= nc < width):
+                continue
+            npos = nr * width + nc
+            # A closed-off (degree 0) cell would become a new dead end
+            if not mold[npos] and degree[npos]:
+                sides.append((degree[npos] == 1, i))
+        if not sides:
+            continue
+        # Two dead ends at once, unless one more is all that is needed
+        pairs = [s for s in sides if s[0]]
+        if pairs and left - 2 >= target:
+            sides = pairs
+        elif len(pairs) < len(sides):
+            sides = [s for s in sides if not s[0]]
+        if counter is None:
+            _, i = sides[rng.randrange(len(sides))]
+        else:
+            _, i = sides[counter.below(STREAM_SIDE, pos, len(sides))]
+
+        dr, dc, bit, _ = DIRECTIONS[i]
+        nr, nc = r + dr, c + dc
+        npos = nr * width + nc
+        grid[r][c] &= ~bit
+        grid[nr][nc] &= ~_OPPOSITE_BIT[i]
+        left -= 1 + (degree[npos] == 1)
+        degree[pos] += 1
+        degree[npos] += 1
+        yield r, c, nr, nc
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Checkpoints of long generation / solve jobs, so a killed run can be
+resumed (a_maze_ing.py --resume) and still write exactly the file an
+uninterrupted run would.
+
+A checkpoint is one compact binary file, replaced atomically. It is
+written and read in chunks (grid rows, bitset, index lists), so with
+MazeGenerator(storage=...) saving or resuming never holds a whole
+grid in memory:
+
+    MAGIC, header   kind, size, entry, exit, perfect, RNG mode, mold
+                    scale, braid targets, stencil rows, seed
+    generator       counters, packed grid (1 byte / cell), visited
+                    bitset, DFS stack (flat indexes), Mersenne Twister
+                    state (none in 'counter' mode: draws are stateless)
+    solve           (kind 'solve' only) BFS moves, frontier, counters
+    CRC32           of everything above
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from itertools import islice
+from typing import (Any, Iterable, Iterator, List, Optional, Protocol,
+                    Sequence, Tuple, Union)
+
+from .ondisk import MovesBuffer
+
+MAGIC = b"AMZCKPT2"
+# Checkpoints written before the mold / braid settings were stored
+_OLD_MAGIC = b"AMZCKPT1"
+KIND_GENERATE, KIND_SOLVE = 0, 1
+RNG_CODES = {"mt": 0, "counter": 1}
+
+_HEADER = struct.Struct("<BIIIIIIBB")
+# mold_scale, braid_loops (flag, value), dead_end_ratio (flag, value)
+_SHAPE = struct.Struct("<IBQBd")
+_TO_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+_TO_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+# Cells (or indexes) per chunk when a checkpoint is streamed
+_CHUNK = 1 << 20
+
+
+class Rows(Protocol):
+    """Grid rows: lists, mapped memoryview rows or _BitRows."""
+
+    def __len__(self) -> int: ...
+
+    def __getitem__(self, row: int) -> Any: ...
+
+
+class Ints(Protocol):
+    """Sized iterable of flat indexes (list, FlatCells, _StoredInts)."""
+
+    def __len__(self) -> int: ...
+
+    def __iter__(self) -> Iterator[int]: ...
+
+
+def pack_bits(flags: bytes) -> bytes:
+    """0/1 bytes -> bitset (flag i is bit i % 8 of byte i // 8)."""
+    if not flags:
+        return b""
+    value = int(flags[::-1].translate(_TO_CHARS), 2)
+    return value.to_bytes((len(flags) + 7) // 8, "little")
+
+
+def unpack_bits(data: bytes, count: int) -> bytes:
+    """Inverse of pack_bits(): 'count' bytes, each 0 or 1."""
+    if not count:
+        return b""
+    text = format(int.from_bytes(data, "little"), f"0{count}b")
+    return text[::-1].encode().translate(_TO_FLAGS)
+
+
+def _ints(values: Iterable[int]) -> bytes:
+    """Count-prefixed little-endian uint32 array."""
+    arr = array("I", values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return struct.pack("<Q", len(arr)) + arr.tobytes()
+
+
+def _int_chunks(values: Ints) -> Iterator[bytes]:
+    """Same as _ints(), _CHUNK values at a time."""
+    yield struct.pack("<Q", len(values))
+    it = iter(values)
+    while True:
+        arr = array("I", islice(it, _CHUNK))
+        if not arr:
+            return
+        if sys.byteorder == "big":
+            arr.byteswap()
+        yield arr.tobytes()
+
+
+def _row_chunks(
+    rows: Rows, width: int, bits: bool = False
+) -> Iterator[bytes]:
+    """
+    Rows of byte values as about _CHUNK cells at a time; with 'bits',
+    0/1 rows packed by pack_bits() (whole bytes per chunk, so the
+    chunks add up to the bitset of the whole grid).
+    """
+    per = max(1, _CHUNK // max(1, width))
+    if bits:
+        per = (per + 7) // 8 * 8
+    for first in range(0, len(rows), per):
+        data = b"".join(bytes(rows[r])
+                        for r in range(first, min(first + per, len(rows))))
+        yield pack_bits(data) if bits else data
+
+
+class FlatCells:
+    """(row, col) cells (a list, deque or SpillStack) seen as flat
+    indexes, without copying them."""
+
+    def __init__(self, cells: Any, width: int) -> None:
+        self.cells = cells
+        self.width = width
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __iter__(self) -> Iterator[int]:
+        w = self.width
+        return (r * w + c for r, c in self.cells)
+
+
+class _StoredInts:
+    """uint32 array of a read checkpoint, decoded _CHUNK at a time."""
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.data) // 4
+
+    def __iter__(self) -> Iterator[int]:
+        step = 4 * _CHUNK
+        for start in range(0, len(self.data), step):
+            arr = array("I")
+            arr.frombytes(self.data[start:start + step])
+            if sys.byteorder == "big":
+                arr.byteswap()
+            yield from arr
+
+
+class _BitRows:
+    """0/1 rows of a stored bitset, unpacked one row at a time."""
+
+    def __init__(self, data: Any, width: int, height: int) -> None:
+        self.data = data
+        self.width = width
+        self.height = height
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, row: int) -> bytes:
+        start = row * self.width
+        first, last = start // 8, (start + self.width + 7) // 8
+        flags = unpack_bits(self.data[first:last], 8 * (last - first))
+        skip = start - 8 * first
+        return flags[skip:skip + self.width]
+
+
+@dataclass
+class GeneratorState:
+    """Everything MazeGenerator.iter_generate() needs to go on."""
+
+    grid: Rows                        # Wall bits, one row per item
+    visited: Rows                     # 0/1 per cell, one row per item
+    stack: Ints                       # Flat indexes, bottom first
+    rng_state: Optional[Tuple[Any, ...]]
+    counters: Tuple[int, int, int]    # visited, backtracks, max depth
+
+
+@dataclass
+class SolveState:
+    """BFS in progress: see solver.iter_solve()."""
+
+    came_from: Union[MovesBuffer, memoryview]
+    queue: Ints                       # Flat indexes, front first
+    expanded: int
+    peak_queue: int
+
+
+@dataclass
+class Checkpoint:
+    width: int
+    height: int
+    entry: Tuple[int, int]
+    exit: Tuple[int, int]
+    perfect: bool
+    rng_mode: str
+    mold_scale: int
+    braid_loops: Optional[int]
+    dead_end_ratio: Optional[float]
+    stencil: str                      # Stencil rows, '\n'-joined
+    seed: Any
+    generator: GeneratorState
+    solve: Optional[SolveState] = None
+
+    def matches(self, maze: Any) -> bool:
+        """
+        Whether the checkpoint belongs to a maze with this config:
+        everything that changes the walls but the seed (restored).
+        """
+        return (self.width, self.height, self.entry, self.exit,
+                self.perfect, self.rng_mode, self.mold_scale,
+                self.braid_loops, self.dead_end_ratio, self.stencil) == (
+            maze.width, maze.height, tuple(maze.entry), tuple(maze.exit),
+            maze.perfect, maze.rng_mode, maze.mold_scale,
+            maze.braid_loops, maze.dead_end_ratio,
+            stencil_text(maze.stencil))
+
+
+def stencil_text(stencil: Any) -> str:
+    """Rows of a mold Stencil as stored in a checkpoint ('' for None)."""
+    return "" if stencil is None else "\n".join(stencil.rows)
+
+
+def _chunks(ckpt: Checkpoint) -> Iterator[bytes]:
+    """The checkpoint without its CRC, a bounded piece at a time."""
+    gen = ckpt.generator
+    kind = KIND_GENERATE if ckpt.solve is None else KIND_SOLVE
+    seed_tag = 0 if ckpt.seed is None else (
+        1 if isinstance(ckpt.seed, int) else 2)
+    seed_text = b"" if ckpt.seed is None else str(ckpt.seed).encode()
+    yield MAGIC + _HEADER.pack(
+        kind, ckpt.width, ckpt.height, *ckpt.entry, *ckpt.exit,
+        ckpt.perfect, RNG_CODES[ckpt.rng_mode])
+    stencil = ckpt.stencil.encode()
+    yield _SHAPE.pack(
+        ckpt.mold_scale, ckpt.braid_loops is not None,
+        ckpt.braid_loops or 0, ckpt.dead_end_ratio is not None,
+        ckpt.dead_end_ratio or 0.0) + struct.pack(
+            "<I", len(stencil)) + stencil
+    yield struct.pack("<BI", seed_tag, len(seed_text)) + seed_text
+    yield struct.pack("<QQQ", *gen.counters)
+    yield from _row_chunks(gen.grid, ckpt.width)
+    yield from _row_chunks(gen.visited, ckpt.width, bits=True)
+    yield from _int_chunks(gen.stack)
+    if gen.rng_state is None:
+        yield b"\x00"
+    else:
+        _, internal, gauss = gen.rng_state
+        yield b"\x01" + _ints(internal)[8:]
+        yield struct.pack("<Bd", gauss is not None, gauss or 0.0)
+    if ckpt.solve is not None:
+        solve = ckpt.solve
+        moves = memoryview(solve.came_from)
+        for start in range(0, len(moves), _CHUNK):
+            yield bytes(moves[start:start + _CHUNK])
+        yield struct.pack("<QQ", solve.expanded, solve.peak_queue)
+        yield from _int_chunks(solve.queue)
+
+
+def encode(ckpt: Checkpoint) -> bytes:
+    """The whole checkpoint file in memory (see write_checkpoint)."""
+    data = b"".join(_chunks(ckpt))
+    return data + struct.pack("<I", zlib.crc32(data))
+
+
+class _Reader:
+    def __init__(self, data: Any) -> None:
+        self.data = data
+        self.pos = 0
+
+    def take(self, size: int) -> Any:
+        if self.pos + size > len(self.data):
+            raise ValueError("truncated checkpoint")
+        chunk = self.data[self.pos:self.pos + size]
+        self.pos += size
+        return chunk
+
+    def unpack(self, fmt: str) -> Tuple[Any, ...]:
+        return struct.unpack(fmt, self.take(struct.calcsize(fmt)))
+
+    def ints(self, count: Optional[int] = None) -> List[int]:
+        if count is None:
+            count = self.unpack("<Q")[0]
+        arr = array("I")
+        arr.frombytes(self.take(count * arr.itemsize))
+        if sys.byteorder == "big":
+            arr.byteswap()
+        return arr.tolist()
+
+
+def decode(data: Any) -> Checkpoint:
+    """
+    Args:
+        data: bytes, or a memoryview of a mapped file: the grid, the
+              visited bitset, the stack and the BFS moves then stay
+              views of it, read row by row (or chunk by chunk) when
+              restored.
+    Raises:
+        ValueError: not a checkpoint, truncated or corrupted.
+    """
+    if data[:len(MAGIC)] == _OLD_MAGIC:
+        raise ValueError("checkpoint from an older version (no mold or "
+                         "braid settings): start over without --resume")
+    if data[:len(MAGIC)] != MAGIC or len(data) < len(MAGIC) + 4:
+        raise ValueError("not a maze checkpoint")
+    (crc,) = struct.unpack("<I", data[-4:])
+    if zlib.crc32(data[:-4]) != crc:
+        raise ValueError("corrupted checkpoint (CRC mismatch)")
+    r = _Reader(data[:-4])
+    r.take(len(MAGIC))
+    kind, w, h, er, ec, xr, xc, perfect, rng = r.unpack(_HEADER.format)
+    scale, has_loops, loops, has_ratio, ratio = r.unpack(_SHAPE.format)
+    stencil = bytes(r.take(r.unpack("<I")[0])).decode()
+    seed_tag, seed_len = r.unpack("<BI")
+    seed_text = bytes(r.take(seed_len)).decode()
+    seed: Any = (None, int, str)[seed_tag]
+    if seed is not None:
+        seed = seed(seed_text)
+    counters = r.unpack("<QQQ")
+    cells = r.take(w * h)
+    grid = [cells[i * w:(i + 1) * w] for i in range(h)]
+    visited = _BitRows(r.take((w * h + 7) // 8), w, h)
+    stack = _StoredInts(r.take(4 * r.unpack("<Q")[0]))
+    rng_state: Optional[Tuple[Any, ...]] = None
+    if r.take(1) == b"\x01":
+        internal = tuple(r.ints(625))
+        has_gauss, gauss = r.unpack("<Bd")
+        rng_state = (3, internal, gauss if has_gauss else None)
+    solve = None
+    if kind == KIND_SOLVE:
+        came_from = r.take(w * h)
+        expanded, peak = r.unpack("<QQ")
+        solve = SolveState(came_from, _StoredInts(
+            r.take(4 * r.unpack("<Q")[0])), expanded, peak)
+    modes = {code: mode for mode, code in RNG_CODES.items()}
+    return Checkpoint(
+        w, h, (er, ec), (xr, xc), bool(perfect), modes[rng], scale,
+        loops if has_loops else None, ratio if has_ratio else None,
+        stencil, seed,
+        GeneratorState(grid, visited, stack, rng_state,
+                       (counters[0], counters[1], counters[2])),
+        solve)
+
+
+def read_checkpoint(path: str) -> Checkpoint:
+    """Maps the file: see decode() (views stay valid after a rename
+    or removal of 'path')."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < len(MAGIC) + 4:
+            raise ValueError("not a maze checkpoint")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return decode(memoryview(data))
+
+
+def write_checkpoint(path: str, ckpt: Checkpoint) -> None:
+    """Writes next to 'path' then renames: a crash never leaves half."""
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        crc = 0
+        for chunk in _chunks(ckpt):
+            f.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+        f.write(struct.pack("<I", crc))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    """
+    Periodic checkpoint writer for MazeGenerator and iter_solve().
+
+    Like ProgressReporter, the hot loops only compare a counter with
+    the threshold it returns; every 'every' steps it looks at the clock
+    and writes a checkpoint once 'interval' seconds have passed.
+    """
+
+    def __init__(
+        self, path: str, interval: float = 60.0, every: int = 65536
+    ) -> None:
+        """
+        Args:
+            path: Checkpoint file (rewritten in place).
+            interval: Seconds between two checkpoints.
+            every: Steps between two clock checks.
+        """
+        self.path = path
+        self.interval = interval
+        self.every = max(1, every)
+        self.saved = 0
+        # Set by MazeGenerator: the solve checkpoints need its grid
+        self.maze: Any = None
+        self._last = time.monotonic()
+
+    def begin(self, done: int = 0) -> int:
+        """Returns the first step count to check at."""
+        return done + self.every
+
+    def _due(self) -> bool:
+        now = time.monotonic()
+        if now - self._last < self.interval:
+            return False
+        self._last = now
+        return True
+
+    def _generator_state(
+        self, stack: Iterable[Tuple[int, int]], counters: Tuple[int, int, int]
+    ) -> GeneratorState:
+        maze = self.maze
+        # Live rows and stack: written chunk by chunk, never copied whole
+        return GeneratorState(
+            grid=maze.grid,
+            visited=maze.visited,
+            stack=FlatCells(stack, maze.width),
+            rng_state=(maze.rng.getstate() if maze.counter is None
+                       else None),
+            counters=counters,
+        )
+
+    def _write(
+        self, generator: GeneratorState, solve: Optional[SolveState] = None
+    ) -> None:
+        maze = self.maze
+        write_checkpoint(self.path, Checkpoint(
+            maze.width, maze.height, tuple(maze.entry), tuple(maze.exit),
+            maze.perfect, maze.rng_mode, maze.mold_scale, maze.braid_loops,
+            maze.dead_end_ratio, stencil_text(maze.stencil), maze.seed,
+            generator, solve))
+        self.saved += 1
+
+    def generator(
+        self, stack: Iterable[Tuple[int, int]], visited: int,
+        backtracks: int, max_depth: int
+    ) -> int:
+        """DFS state (called between two steps); next threshold."""
+        if self._due():
+            self._write(self._generator_state(
+                stack, (visited, backtracks, max_depth)))
+        return visited + self.every
+
+    def solver(
+        self, came_from: MovesBuffer, queue: Sequence[Tuple[int, int]],
+        expanded: int, peak_queue: int
+    ) -> int:
+        """BFS state (called between two expansions); next threshold."""
+        if self._due():
+            stats = self.maze.stats
+            self._write(
+                self._generator_state([], (
+                    stats.get("cells_visited", 0),
+                    stats.get("backtracks", 0),
+                    stats.get("max_stack_depth", 0))),
+                SolveState(came_from, FlatCells(queue, self.maze.width),
+                           expanded, peak_queue))
+        return expanded + self.every
+
+    def discard(self) -> None:
+        """Removes the checkpoint once the job is complete."""
+        for path in (self.path, self.path + ".tmp"):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+import os
+from collections import OrderedDict
+from typing import List, Tuple
+
+from .generator import MazeGenerator
+from .mask import STENCIL_42
+from .rng import mix
+
+# One generated chunk: 'chunk_size' rows of wall bits (same encoding as
+# MazeGenerator.grid, readable as chunk[row][col])
+Chunk = Tuple[bytes, ...]
+
+
+def chunk_seed(seed: int, cx: int, cy: int) -> int:
+    """Seed of chunk (cx, cy): independent of every other chunk."""
+    return mix(seed, 0, cx, cy)
+
+
+class ChunkedMaze:
+    """
+    Maze of unbounded size, generated lazily one square chunk at a time.
+
+    Chunk (cx, cy) covers the cells x in [cx * size, (cx + 1) * size)
+    and y in [cy * size, (cy + 1) * size) and only depends on
+    (seed, cx, cy): inside, it is a perfect MazeGenerator maze (with the
+    '42' stencil), and each of its four borders has one opening whose
+    position is hashed from the seam coordinates. Both chunks sharing a
+    seam compute the same opening, so borders always agree and every
+    chunk is connected to its four neighbours.
+
+    Recently used chunks are kept in an LRU cache; the rest are simply
+    regenerated when needed, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        chunk_size: int = 31,
+        cache_size: int = 256,
+        stencil_every: int = 1,
+    ) -> None:
+        """
+        Args:
+            seed: World seed.
+            chunk_size: Side of a chunk in cells (at least 9, so the
+                        '42' never touches a seam).
+            cache_size: Maximum number of chunks kept in memory.
+            stencil_every: Draw the '42' in chunks whose coordinates
+                           are both multiples of this (1: every chunk,
+                           0: never).
+        """
+        if chunk_size < 9:
+            raise ValueError("chunk_size must be at least 9")
+        if cache_size < 1:
+            raise ValueError("cache_size must be positive")
+        self.seed: int = seed
+        self.size: int = chunk_size
+        self.cache_size: int = cache_size
+        self.stencil_every: int = stencil_every
+        self._cache: "OrderedDict[Tuple[int, int], Chunk]" = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def seam_opening(self, seam: str, cx: int, cy: int) -> int:
+        """
+        Offset of the opening in a seam.
+
+        Args:
+            seam: 'W' for the vertical seam on the left of chunk
+                  (cx, cy), 'N' for the horizontal seam above it.
+        Returns:
+            int: Row ('W') or column ('N') inside the chunk.
+        """
+        return mix(self.seed, 1 if seam == "W" else 2, cx, cy) % self.size
+
+    def has_stencil(self, cx: int, cy: int) -> bool:
+        """Whether chunk (cx, cy) gets the '42' stencil."""
+        n = self.stencil_every
+        return n > 0 and cx % n == 0 and cy % n == 0
+
+    def chunk(self, cx: int, cy: int) -> Chunk:
+        """Wall bits of chunk (cx, cy), from the cache or generated."""
+        key = (cx, cy)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        chunk = self._generate(cx, cy)
+        self._cache[key] = chunk
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return chunk
+
+    def _generate(self, cx: int, cy: int) -> Chunk:
+        size = self.size
+        # Start next to the corner: never on the '42', never on an edge,
+        # so MazeGenerator does not open any outer wall itself
+        maze = MazeGenerator(
+            width=size,
+            height=size,
+            seed=chunk_seed(self.seed, cx, cy),
+            entry=(1, 1),
+            exit=(1, 1),
+            output_file=os.devnull,
+            perfect=True,
+            stencil=STENCIL_42 if self.has_stencil(cx, cy) else None,
+        )
+        maze.generate()
+        grid = maze.grid
+
+        # Seam openings, shared with the neighbour on the other side
+        west = self.seam_opening("W", cx, cy)
+        east = self.seam_opening("W", cx + 1, cy)
+        north = self.seam_opening("N", cx, cy)
+        south = self.seam_opening("N", cx, cy + 1)
+        grid[west][0] &= ~8
+        grid[east][size - 1] &= ~2
+        grid[0][north] &= ~1
+        grid[size - 1][south] &= ~4
+        return tuple(bytes(row) for row in grid)
+
+    def cell(self, x: int, y: int) -> int:
+        """Wall bits of the cell at world coordinates (x, y)."""
+        cx, col = divmod(x, self.size)
+        cy, row = divmod(y, self.size)
+        return self.chunk(cx, cy)[row][col]
+
+    def window(
+        self, x: int, y: int, width: int, height: int
+    ) -> List[List[int]]:
+        """
+        A width x height region as a regular grid [row][col], e.g. for
+        the renderer or solve(). Walls crossing the region's border are
+        left as generated (seam openings may lead outside).
+        """
+        size = self.size
+        # Column spans (chunk x, first col, count), same for every row
+        spans: List[Tuple[int, int, int]] = []
+        wx = x
+        while wx < x + width:
+            cx, col = divmod(wx, size)
+            take = min(size - col, x + width - wx)
+            spans.append((cx, col, take))
+            wx += take
+
+        out: List[List[int]] = []
+        wy = y
+        while wy < y + height:
+            cy, row = divmod(wy, size)
+            rows = min(size - row, y + height - wy)
+            # Fetch each chunk once per band of rows (no LRU thrashing)
+            chunks = [self.chunk(cx, cy) for cx, _, _ in spans]
+            for r in range(row, row + rows):
+                line: List[int] = []
+                for chunk, (_, col, take) in zip(chunks, spans):
+                    line.extend(chunk[r][col:col + take])
+                out.append(line)
+            wy += rows
+        return out
+
+    def cached_chunks(self) -> int:
+        """Number of chunks currently held in memory."""
+        return len(self._cache)
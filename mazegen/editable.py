@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+from array import array
+from collections import deque
+from heapq import heappop, heappush
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .mask import MoldMask
+from .solver import DIRECTIONS
+
+# Side letter -> (index in DIRECTIONS, opposite side letter)
+SIDES = {"N": (0, "S"), "E": (1, "W"), "S": (2, "N"), "W": (3, "E")}
+
+# Wall bits -> indexes (in DIRECTIONS) of the open sides (not to be
+# confused with flags.OPEN_SIDES, which counts them)
+OPEN_DIRECTIONS = [
+    tuple(i for i, (_, _, bit, _) in enumerate(DIRECTIONS) if not v & bit)
+    for v in range(16)
+]
+
+
+class EditableMaze:
+    """
+    Mutable copy of a maze whose walls can be toggled live, keeping the
+    BFS distance field (from the entry) and the solution up to date.
+
+    An edit only repairs the cells whose distance actually changes:
+    opening a wall spreads the shorter distances outwards from it;
+    closing one collects the cells that lost their only shortest route
+    and recomputes just those. A full BFS only runs when that region
+    is too large to be worth it.
+
+    Exposes the attributes the visualizer reads (grid, width, height,
+    entry, exit, mold_positions, ...) so it can stand in for the maze.
+    """
+
+    def __init__(self, maze: Any, full_bfs_ratio: float = 0.25) -> None:
+        """
+        Args:
+            maze: MazeGenerator or MazeSnapshot to copy.
+            full_bfs_ratio: Rebuild everything with one BFS when a wall
+                            closure affects more than this share of the
+                            cells.
+        """
+        self.width: int = maze.width
+        self.height: int = maze.height
+        self.seed: Optional[Union[int, str]] = maze.seed
+        self.entry: Tuple[int, int] = maze.entry
+        self.exit: Tuple[int, int] = maze.exit
+        self.perfect: bool = maze.perfect
+        self.rng_mode: str = maze.rng_mode
+        self.braid_loops: Optional[int] = maze.braid_loops
+        self.dead_end_ratio: Optional[float] = maze.dead_end_ratio
+        self.mold_scale: int = maze.mold_scale
+        # Read-only and shared: the '42' never changes while editing
+        self.mold_positions: MoldMask = maze.mold_positions
+        self.grid: List[List[int]] = [list(row) for row in maze.grid]
+        self.full_bfs_ratio = full_bfs_ratio
+
+        w = self.width
+        self._steps = [dr * w + dc for dr, dc, _, _ in DIRECTIONS]
+        # Flat copy of the walls with the outer border always closed
+        # (entry / exit openings lead nowhere): no bounds checks needed
+        self._walls = bytearray(v & 15 for row in self.grid for v in row)
+        for col in range(w):
+            self._walls[col] |= 1
+            self._walls[(self.height - 1) * w + col] |= 4
+        for row in range(self.height):
+            self._walls[row * w] |= 8
+            self._walls[row * w + w - 1] |= 2
+        self._start = self.entry[0] * w + self.entry[1]
+        self._goal = self.exit[0] * w + self.exit[1]
+        # Distance from the entry per cell (row * width + col), -1 when
+        # unreachable
+        self.dist = array("i", [-1]) * (w * self.height)
+        self._on_path = bytearray(w * self.height)
+        self.solution: str = ""
+        # 'incremental' / 'full' repairs done, cells touched last time
+        self.stats: Dict[str, int] = {
+            "incremental": 0, "full": 0, "last_region": 0}
+        self._full_bfs()
+        self._rebuild_path()
+
+    def _open_neighbors(self, pos: int) -> List[int]:
+        """Cells reachable from 'pos' in one move."""
+        steps = self._steps
+        return [pos + steps[i] for i in OPEN_DIRECTIONS[self._walls[pos]]]
+
+    def _full_bfs(self) -> None:
+        dist, steps, walls = self.dist, self._steps, self._walls
+        dist[:] = array("i", [-1]) * len(dist)
+        dist[self._start] = 0
+        queue = deque([self._start])
+        while queue:
+            pos = queue.popleft()
+            nd = dist[pos] + 1
+            for i in OPEN_DIRECTIONS[walls[pos]]:
+                nxt = pos + steps[i]
+                if dist[nxt] == -1:
+                    dist[nxt] = nd
+                    queue.append(nxt)
+        self.stats["full"] += 1
+        self.stats["last_region"] = len(dist)
+
+    def _rebuild_path(self) -> None:
+        """Walks down the distance field from the exit to the entry."""
+        for pos in self._path_cells():
+            self._on_path[pos] = 0
+        dist, pos = self.dist, self._goal
+        if dist[pos] == -1:
+            self.solution = ""
+            return
+        moves: List[str] = []
+        self._on_path[pos] = 1
+        while pos != self._start:
+            for i in OPEN_DIRECTIONS[self._walls[pos]]:
+                nxt = pos + self._steps[i]
+                if dist[nxt] == dist[pos] - 1:
+                    break
+            # We stepped back with side i: the path uses its opposite
+            moves.append(SIDES[DIRECTIONS[i][3]][1])
+            pos = nxt
+            self._on_path[pos] = 1
+        self.solution = "".join(reversed(moves))
+
+    def _path_cells(self) -> List[int]:
+        pos = self._start
+        cells = [pos]
+        for move in self.solution:
+            pos += self._steps[SIDES[move][0]]
+            cells.append(pos)
+        return cells
+
+    def has_wall(self, r: int, c: int, side: str) -> bool:
+        """Whether the 'side' ('N', 'E', 'S' or 'W') wall is closed."""
+        return bool(self.grid[r][c] & DIRECTIONS[SIDES[side][0]][2])
+
+    def toggle_wall(self, r: int, c: int, side: str) -> int:
+        """Opens a closed wall or closes an open one (see set_wall)."""
+        return self.set_wall(r, c, side, not self.has_wall(r, c, side))
+
+    def set_wall(self, r: int, c: int, side: str, closed: bool) -> int:
+        """
+        Sets one wall on both cells that share it and repairs the
+        distances and the solution.
+
+        Args:
+            r, c: Cell coordinates.
+            side: 'N', 'E', 'S' or 'W'.
+            closed: True to build the wall, False to open it.
+        Returns:
+            int: Number of cells whose distance was recomputed.
+        """
+        index, opposite = SIDES[side]
+        dr, dc, bit, _ = DIRECTIONS[index]
+        if self.has_wall(r, c, side) == closed:
+            return 0
+        self.grid[r][c] ^= bit
+        nr, nc = r + dr, c + dc
+        if not (0 <= nr < self.height and 0 <= nc < self.width):
+            return 0  # Outer wall: no cell on the other side
+        opp_bit = DIRECTIONS[SIDES[opposite][0]][2]
+        self.grid[nr][nc] ^= opp_bit
+
+        a, b = r * self.width + c, nr * self.width + nc
+        self._walls[a] ^= bit
+        self._walls[b] ^= opp_bit
+        if closed:
+            changed = self._after_close(a, b)
+        else:
+            changed = self._after_open(a, b) + self._after_open(b, a)
+        if changed or (self._on_path[a] and self._on_path[b]):
+            self._rebuild_path()
+        return changed
+
+    def _after_open(self, a: int, b: int) -> int:
+        """Spreads shorter distances from 'a' through 'b'."""
+        dist = self.dist
+        if dist[a] == -1 or -1 < dist[b] <= dist[a] + 1:
+            return 0
+        dist[b] = dist[a] + 1
+        queue = deque([b])
+        changed = 0
+        while queue:
+            pos = queue.popleft()
+            changed += 1
+            nd = dist[pos] + 1
+            for nxt in self._open_neighbors(pos):
+                if dist[nxt] == -1 or dist[nxt] > nd:
+                    dist[nxt] = nd
+                    queue.append(nxt)
+        self.stats["incremental"] += 1
+        self.stats["last_region"] = changed
+        return changed
+
+    def _after_close(self, a: int, b: int) -> int:
+        """Repairs the cells that relied on the removed passage a-b."""
+        dist = self.dist
+        if dist[a] == -1 or abs(dist[a] - dist[b]) != 1:
+            return 0  # No shortest route used the passage
+        v = b if dist[b] > dist[a] else a
+        if any(dist[n] == dist[v] - 1 for n in self._open_neighbors(v)):
+            return 0  # 'v' has another way in at the same distance
+
+        # Cells whose every shortest route went through 'v'. BFS order:
+        # when a cell is checked, all affected cells one step closer to
+        # the entry are already marked.
+        marked = {v}
+        queue = deque([v])
+        region: List[int] = []
+        limit = self.full_bfs_ratio * len(dist)
+        while queue:
+            pos = queue.popleft()
+            region.append(pos)
+            if len(region) > limit:
+                # Too big: one plain BFS is cheaper than a repair
+                self._full_bfs()
+                return len(dist)
+            for nxt in self._open_neighbors(pos):
+                if nxt in marked or dist[nxt] != dist[pos] + 1:
+                    continue
+                if not any(dist[n] == dist[nxt] - 1 and n not in marked
+                           for n in self._open_neighbors(nxt)):
+                    marked.add(nxt)
+                    queue.append(nxt)
+
+        # Re-enter the region from its unaffected border, shortest first
+        heap: List[Tuple[int, int]] = []
+        for pos in region:
+            dist[pos] = -1
+        for pos in region:
+            best = min((dist[n] for n in self._open_neighbors(pos)
+                        if n not in marked and dist[n] != -1), default=-1)
+            if best != -1:
+                dist[pos] = best + 1
+                heappush(heap, (best + 1, pos))
+        while heap:
+            d, pos = heappop(heap)
+            if d > dist[pos]:
+                continue
+            for nxt in self._open_neighbors(pos):
+                if nxt in marked and (dist[nxt] == -1 or dist[nxt] > d + 1):
+                    dist[nxt] = d + 1
+                    heappush(heap, (d + 1, nxt))
+        self.stats["incremental"] += 1
+        self.stats["last_region"] = len(region)
+        return len(region)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+from typing import Iterable, Iterator, List, Tuple
+
+from .mask import MoldMask
+
+# Bits stored for every cell in CellFlags.data
+MOLD = 1   # Part of the '42' stencil
+PATH = 2   # On the solution path
+ENTRY = 4
+EXIT = 8
+
+# Move letter -> (row_delta, col_delta)
+MOVES = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}
+
+# Cell byte -> number of open sides (only the low 4 bits are walls),
+# for bytes.translate over a whole packed grid
+OPEN_SIDES = bytes(4 - bin(v & 15).count("1") for v in range(256))
+
+
+def path_cells(
+    entry: Tuple[int, int], solution: Iterable[str]
+) -> Iterator[Tuple[int, int]]:
+    """Cells visited by a direction string, entry excluded."""
+    r, c = entry
+    for move in solution:
+        dr, dc = MOVES[move]
+        r, c = r + dr, c + dc
+        yield r, c
+
+
+class CellFlags:
+    """
+    Compact per-cell flag layer: one byte per cell, indexed row * width
+    + col. Built once per maze / solution so renderers replace list
+    scans and path walks with a single array lookup.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        mold_positions: Iterable[Tuple[int, int]],
+        entry: Tuple[int, int],
+        exit: Tuple[int, int],
+        solution: Iterable[str] = "",
+    ) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.entry = entry
+        self.data: bytearray = bytearray(width * height)
+        # Path cells in walking order, for the path renderer
+        self.path: List[Tuple[int, int]] = []
+
+        if isinstance(mold_positions, MoldMask):
+            # Box rows copied whole: a mold byte is 1, i.e. MOLD
+            for r, c, row in mold_positions.rows():
+                start = r * width + c
+                self.data[start:start + len(row)] = row
+        else:
+            for r, c in mold_positions:
+                self.data[r * width + c] |= MOLD
+        self.data[entry[0] * width + entry[1]] |= ENTRY
+        self.data[exit[0] * width + exit[1]] |= EXIT
+        self.set_path(solution)
+
+    def set_path(self, solution: Iterable[str]) -> None:
+        """Replaces the PATH bits; cost is O(old path + new path)."""
+        data, width = self.data, self.width
+        for r, c in self.path:
+            data[r * width + c] &= ~PATH & 0xFF
+        self.path = list(path_cells(self.entry, solution))
+        for r, c in self.path:
+            data[r * width + c] |= PATH
+
+    def get(self, r: int, c: int) -> int:
+        """Flags of one cell."""
+        return self.data[r * self.width + c]
@@ -1,6 +1,27 @@
 #!/usr/bin/env python3
 import random
-from typing import Tuple, Optional, List
+import sys
+from typing import Dict, Iterator, Tuple, Optional, List, Union, cast
+
+from .braid import iter_dead_end_ratio, iter_loops
+from .checkpoint import Checkpointer, GeneratorState
+from .mask import (STENCIL_42, MoldMask, Stencil, blocked_cell, mold_mask,
+                   scaled_mask)
+from .ondisk import MappedGrid, SpillStack
+from .pathcodec import to_line
+from .profiling import PhaseProfiler, phase
+from .progress import ProgressReporter
+from .rng import RNG_MODES, CounterRNG
+
+# CounterRNG streams used by the generator
+STREAM_DFS, STREAM_ROW, STREAM_COL, STREAM_WALL = 1, 2, 3, 4
+
+# One generation step: (kind, row, col, next_row, next_col)
+Step = Tuple[str, int, int, int, int]
+# DFS stack: a list, or a SpillStack for out-of-core mazes
+Stack = Union[List[Tuple[int, int]], SpillStack]
+# Wall bits (0-15) -> hex digit, for bytes.translate
+HEX_DIGITS = bytes.maketrans(bytes(range(16)), b"0123456789ABCDEF")
 
 
 class MazeGenerator:
@@ -12,11 +33,20 @@ class MazeGenerator:
         self,
         width: int,
         height: int,
-        seed: Optional[int],
+        seed: Optional[Union[int, str]],
         entry: Tuple[int, int],
         exit: Tuple[int, int],
         output_file: str,
         perfect: bool,
+        profiler: Optional[PhaseProfiler] = None,
+        progress: Optional[ProgressReporter] = None,
+        rng_mode: str = "mt",
+        checkpoint: Optional[Checkpointer] = None,
+        storage: Optional[str] = None,
+        braid_loops: Optional[int] = None,
+        dead_end_ratio: Optional[float] = None,
+        stencil: Optional[Stencil] = STENCIL_42,
+        mold_scale: int = 1,
     ) -> None:
         """
         Initializes a maze generator with the given configuration.
@@ -24,95 +54,217 @@ class MazeGenerator:
         Args:
             width: Number of columns.
             height: Number of rows.
-            seed: Optional seed for deterministic generation.
+            seed: Optional seed for deterministic generation. A config
+                  file's SEED is a string: random.Random('17') and
+                  random.Random(17) are different mazes.
             entry: Start coordinates as (row, col).
             exit: End coordinates as (row, col).
             output_file: Path to save the hex string.
             perfect: Whether to ensure exactly one path (DFS).
+            profiler: Optional PhaseProfiler timing draw_42 and
+                      _break_extra_walls.
+            progress: Optional ProgressReporter told about carved
+                      cells; its cancel token can stop generate().
+            rng_mode: 'mt' (default) replays random.Random(seed) as
+                      always, so existing seeds keep their maze;
+                      'counter' draws from a CounterRNG, where every
+                      draw only depends on (seed, cell, step).
+            checkpoint: Optional Checkpointer saving the DFS state
+                        periodically (see restore()).
+            storage: Directory for a file-backed grid, visited map and
+                     DFS stack (mazes larger than RAM); None keeps
+                     everything in lists.
+            braid_loops: Non-perfect mazes only: open exactly this
+                         many walls (see braid.py) instead of the
+                         legacy random walls.
+            dead_end_ratio: Non-perfect mazes only: open dead ends
+                            until dead ends / cells <= this ratio.
+            stencil: Bitmap blocked in the middle of the maze (None:
+                     no mold).
+            mold_scale: Cells per stencil pixel side; 0 picks the
+                        largest scale using a third of the maze.
         """
+        if rng_mode not in RNG_MODES:
+            raise ValueError(f"Unknown RNG mode: {rng_mode!r}")
+        if braid_loops is not None and dead_end_ratio is not None:
+            raise ValueError(
+                "braid_loops and dead_end_ratio are mutually exclusive")
         self.width: int = width
         self.height: int = height
-        self.seed: Optional[int] = seed
+        self.seed: Optional[Union[int, str]] = seed
         self.entry: Tuple[int, int] = entry
         self.exit: Tuple[int, int] = exit
         self.output_file: str = output_file
         self.perfect: bool = perfect
-        self.mold_positions: List[Tuple[int, int]] = []
+        self.stencil = stencil
+        self.mold_scale: int = mold_scale
+        self.mold_positions: MoldMask = mold_mask(None, width, height)
+        self.profiler = profiler
+        self.progress = progress
+        self.checkpoint = checkpoint
+        self.storage = storage
+        self.braid_loops = braid_loops
+        self.dead_end_ratio = dead_end_ratio
+        if checkpoint is not None:
+            checkpoint.maze = self
+        # DFS stack and counters to go on from (set by restore())
+        self._resume: Optional[
+            Tuple[Iterator[Tuple[int, int]], Tuple[int, int, int]]] = None
+        # Hot-path counters of the last generation (see iter_generate)
+        self.stats: Dict[str, int] = {}
 
         # We configure randomness with the seed.
-        # Freeze randomness (deterministic generation)
-        random.seed(self.seed)
+        # Private RNG instance: same sequence as random.seed(seed), but
+        # another thread (menu, background worker) cannot disturb it.
+        self.rng: random.Random = random.Random(self.seed)
+        self.rng_mode: str = rng_mode
+        self.counter: Optional[CounterRNG] = None
+        self._init_counter()
         self.setup_matrices()
-        self.draw_42()
+        with phase(self.profiler, "draw_42"):
+            self.draw_42()
+        # A mold cell is closed for good: entry / exit there is unusable
+        error = blocked_cell(
+            self.mold_positions, (("Entry", entry), ("Exit", exit)))
+        if error is not None:
+            raise ValueError(error)
+
+    def _init_counter(self) -> None:
+        """CounterRNG of the current seed ('counter' mode only)."""
+        self.counter = None
+        if self.rng_mode == "counter":
+            if self.seed is None:
+                # Keep the drawn seed: it is all a maze depends on
+                self.seed = self.rng.getrandbits(64)
+            self.counter = CounterRNG(self.seed)
+
+    def reset(self, seed: Optional[Union[int, str]]) -> None:
+        """
+        Prepares a new maze of the same size and settings in the
+        existing buffers: walls closed and cells unvisited with one
+        bulk row copy each, RNG reseeded. The next generate() builds
+        exactly the maze a new MazeGenerator(seed=seed) would.
+        """
+        self.seed = seed
+        self.rng.seed(seed)
+        self._init_counter()
+        self._resume = None
+        self.stats = {}
+        self.clear_matrices()
+
+    def clear_matrices(self) -> None:
+        """Closes every wall and unvisits every cell, in place."""
+        w = self.width
+        if self.storage is not None:
+            # Mapped rows take bytes; 0 reads as False like a bool
+            walls, empty = bytes([15]) * w, bytes(w)
+            for row in self.grid:
+                row[:] = walls
+            for flags in cast(List[bytearray], self.visited):
+                flags[:] = empty
+            return
+        # list * n and slice assignment copy pointers in C
+        wall_row, empty_row = [15] * w, [False] * w
+        for row in self.grid:
+            row[:] = wall_row
+        for visited in self.visited:
+            visited[:] = empty_row
 
     def setup_matrices(self) -> None:
         """
         Initializes the grid with all walls closed (15) and visit tracker.
         """
-        self.grid: list[list[int]] = [
-            [15 for _ in range(self.width)] for _ in range(self.height)
-        ]
+        self.grid: list[list[int]]
+        self.visited: list[list[bool]]
+        if self.storage is not None:
+            # memoryview rows read and assign like lists of ints
+            self.grid = cast(List[List[int]], MappedGrid(
+                self.width, self.height, 15, self.storage).rows)
+            self.visited = cast(List[List[bool]], MappedGrid(
+                self.width, self.height, 0, self.storage).rows)
+            return
+        self.grid = [[15] * self.width for _ in range(self.height)]
         # Create the control matrix (everything unvisited = False)
-        self.visited: list[list[bool]] = [
-            [False for _ in range(self.width)] for _ in range(self.height)
-        ]
+        self.visited = [[False] * self.width for _ in range(self.height)]
 
     def draw_42(self) -> None:
-        """Defines and centers the '42' stencil within the maze grid."""
-        # Simple drawing of a 4 and a 2
-        mold_42 = {
-            # The number 4
-            (0, 0),
-            (1, 0),
-            (2, 0),  # Left stick
-            (2, 1),  # Crossbar
-            (0, 2),
-            (1, 2),
-            (2, 2),
-            (3, 2),
-            (4, 2),  # Right post
-            # The number 2 (starting in column 4 to leave space)
-            (0, 4),
-            (0, 5),
-            (0, 6),  # Roof
-            (1, 6),  # Right slope
-            (2, 6),
-            (2, 5),
-            (2, 4),  # Middle
-            (3, 4),  # Left slope
-            (4, 4),
-            (4, 5),
-            (4, 6),  # Floor
-        }
+        """Centers the stencil (the '42' by default) within the maze."""
+        # Cached per size: mazes of the same shape share one mask
+        self.mold_positions = scaled_mask(
+            self.stencil, self.width, self.height, self.mold_scale)
 
+    def restore(self, state: GeneratorState) -> None:
         """
-        Center the stencil: subtract half of the stencil size so
-        its top-left corner lands correctly
-        (the stencil spans  x=0-6 => width 7 -> 7//2 = 3, and
-                            y=0-4 => height 5 -> 5//2 = 2)
+        Loads a checkpointed state: the next generate() goes on from
+        there and ends with the same walls as an uninterrupted run.
         """
-        offset_row = self.height // 2 - 2
-        offset_col = self.width // 2 - 3
-
-        self.mold_positions = []
-        # "Paint" the 42 into the visited matrix
-        for dy, dx in mold_42:
-            r_real = offset_row + dy
-            c_real = offset_col + dx
-            # Only if the point falls inside the maze (safety check)
-            if 0 <= r_real < self.height and 0 <= c_real < self.width:
-                self.mold_positions.append((r_real, c_real))
+        w = self.width
+        # Slice assignment: works for lists and mapped rows alike, one
+        # row of the (possibly mapped) checkpoint at a time
+        for r in range(self.height):
+            self.grid[r][:] = state.grid[r]
+            # 0 / 1 bytes: falsy / truthy like the bools
+            self.visited[r][:] = cast(List[bool], state.visited[r])
+        if state.rng_state is not None:
+            self.rng.setstate(state.rng_state)
+        # Read lazily by iter_generate() (straight into a SpillStack)
+        self._resume = ((divmod(pos, w) for pos in state.stack),
+                        state.counters)
 
     def generate(self) -> None:
         """Generate the maze using DFS and handle perfection logic."""
-        # Mark '42' cells as visited to block them
-        for r, c in self.mold_positions:
-            self.visited[r][c] = True
+        for _ in self.iter_generate():
+            pass
 
-        stack: List[Tuple[int, int]] = []
-        r_start, c_start = self.entry
-        stack.append((r_start, c_start))
-        self.visited[r_start][c_start] = True
+    def iter_generate(self) -> Iterator[Step]:
+        """
+        Step-wise version of generate(): same walls for the same seed,
+        but yields after every change so callers can animate, pause or
+        stop the generation at any point.
+
+        Yields:
+            (kind, row, col, next_row, next_col) where kind is
+            'start'     first cell pushed (next == cell),
+            'carve'     wall opened and next cell pushed on the stack,
+            'backtrack' cell popped, next is the new top of the stack,
+            'braid'     extra wall opened (non-perfect mazes),
+            'open'      entry/exit border wall opened (next == cell).
+
+        When the DFS ends, self.stats holds 'cells_visited',
+        'backtracks' and 'max_stack_depth'.
+
+        Raises:
+            Cancelled: if the progress reporter's token was cancelled.
+        """
+        resume, self._resume = self._resume, None
+        if resume is None:
+            # Mark '42' cells as visited to block them
+            for r, c in self.mold_positions:
+                self.visited[r][c] = True
+
+            stack = self._new_stack()
+            r_start, c_start = self.entry
+            stack.append((r_start, c_start))
+            self.visited[r_start][c_start] = True
+            yield ("start", r_start, c_start, r_start, c_start)
+            # Counters kept in locals: a dict update per step is too slow
+            visited_count, backtracks, max_depth = 1, 0, 1
+        else:
+            stack = self._new_stack()
+            stack.extend(resume[0])
+            visited_count, backtracks, max_depth = resume[1]
+        # Reporting costs one int comparison per carved cell
+        progress = self.progress
+        counter = self.counter
+        width = self.width
+        next_tick = sys.maxsize
+        if progress is not None:
+            total = self.width * self.height - self.mold_positions.count
+            next_tick = progress.begin("generate", total)
+        checkpoint = self.checkpoint
+        next_save = sys.maxsize
+        if checkpoint is not None:
+            next_save = checkpoint.begin(visited_count)
 
         # Standard DFS for Perfect Maze
         while stack:
@@ -120,17 +272,49 @@ class MazeGenerator:
             neighbors = self._get_unvisited_neighbors(cr, cc)
 
             if neighbors:
-                nr, nc, d, opp = random.choice(neighbors)
+                if counter is None:
+                    nr, nc, d, opp = self.rng.choice(neighbors)
+                else:
+                    # The number of unvisited neighbours only shrinks,
+                    # so it tells apart the successive picks of a cell
+                    n = len(neighbors)
+                    nr, nc, d, opp = neighbors[counter.below(
+                        STREAM_DFS, (cr * width + cc) * 4 + n - 1, n)]
                 self.grid[cr][cc] -= d
                 self.grid[nr][nc] -= opp
                 self.visited[nr][nc] = True
                 stack.append((nr, nc))
+                visited_count += 1
+                if len(stack) > max_depth:
+                    max_depth = len(stack)
+                if visited_count >= next_tick and progress is not None:
+                    next_tick = progress.tick(visited_count)
+                if visited_count >= next_save and checkpoint is not None:
+                    next_save = checkpoint.generator(
+                        stack, visited_count, backtracks, max_depth)
+                yield ("carve", cr, cc, nr, nc)
             else:
                 stack.pop()
+                backtracks += 1
+                tr, tc = stack[-1] if stack else (cr, cc)
+                yield ("backtrack", cr, cc, tr, tc)
+
+        self.stats = {
+            "cells_visited": visited_count,
+            "backtracks": backtracks,
+            "max_stack_depth": max_depth,
+        }
+        if progress is not None:
+            progress.finish(visited_count)
 
         # If NOT perfect, break some extra walls to create loops
-        if not self.perfect:
-            self._break_extra_walls()
+        if not self.perfect and (self.braid_loops is not None
+                                 or self.dead_end_ratio is not None):
+            with phase(self.profiler, "braid"):
+                yield from self._iter_braid()
+        elif not self.perfect:
+            with phase(self.profiler, "_break_extra_walls"):
+                yield from self._iter_break_extra_walls()
 
         # --- CORRECTED: Open entrance and exit based on (row, col) ---
         for r, c in [self.entry, self.exit]:
@@ -142,21 +326,66 @@ class MazeGenerator:
                 self.grid[r][c] &= ~8
             elif c == self.width - 1:        # Right edge
                 self.grid[r][c] &= ~2
+            yield ("open", r, c, r, c)
+
+    def _new_stack(self) -> Stack:
+        if self.storage is not None:
+            return SpillStack(self.width, directory=self.storage)
+        return []
+
+    def _iter_braid(self) -> Iterator[Step]:
+        """Loops from the braid engine; stats gets 'braid_walls'."""
+        w = self.width
+        mold = self.mold_positions.flags()
+        if self.braid_loops is not None:
+            walls = iter_loops(self.grid, mold, self.braid_loops,
+                               self.rng, self.counter)
+        else:
+            keep = [r * w + c for r, c in (self.entry, self.exit)]
+            walls = iter_dead_end_ratio(
+                self.grid, mold, self.dead_end_ratio or 0.0, keep,
+                self.rng, self.counter)
+        opened = 0
+        for r, c, nr, nc in walls:
+            opened += 1
+            yield ("braid", r, c, nr, nc)
+        self.stats["braid_walls"] = opened
 
     def _break_extra_walls(self) -> None:
         """Breaks random walls to create a non-perfect maze (braid maze)."""
+        for _ in self._iter_break_extra_walls():
+            pass
+
+    def _iter_break_extra_walls(self) -> Iterator[Step]:
+        """Step-wise _break_extra_walls(): yields every wall it opens."""
         extra_walls = (self.width * self.height) // 10
-        for _ in range(extra_walls):
-            r = random.randint(1, self.height - 2)
-            c = random.randint(1, self.width - 2)
+        for r, c, wall in self._extra_wall_picks(extra_walls):
             # Break a random wall (North or East) if it exists
-            wall = random.choice([1, 2])
             if self.grid[r][c] & wall:
                 self.grid[r][c] &= ~wall
                 if wall == 1:
                     self.grid[r - 1][c] &= ~4
+                    yield ("braid", r, c, r - 1, c)
                 else:
                     self.grid[r][c + 1] &= ~8
+                    yield ("braid", r, c, r, c + 1)
+
+    def _extra_wall_picks(self, count: int) -> Iterator[Tuple[int, int, int]]:
+        """(row, col, wall bit) of each wall _break_extra_walls tries."""
+        if self.counter is None:
+            for _ in range(count):
+                r = self.rng.randint(1, self.height - 2)
+                c = self.rng.randint(1, self.width - 2)
+                wall = self.rng.choice([1, 2])
+                yield r, c, wall
+            return
+        # Pick k only depends on k: all of them are drawn in bulk
+        picks = range(count)
+        rows = self.counter.many(STREAM_ROW, picks, self.height - 2)
+        cols = self.counter.many(STREAM_COL, picks, self.width - 2)
+        walls = self.counter.many(STREAM_WALL, picks, 2)
+        for r, c, w in zip(rows, cols, walls):
+            yield r + 1, c + 1, w + 1
 
     def _get_unvisited_neighbors(
         self, r: int, c: int
@@ -186,21 +415,22 @@ class MazeGenerator:
                 neighbors.append((nr, nc, bit, opp_bit))
         return neighbors
 
-    def save_to_file(self, solution: str) -> None:
+    def save_to_file(self, solution: str, packed: bool = False) -> None:
         """
         Save the maze following the strict format:
         - Hex grid (one row per line)
         - Empty line
         - Entry coordinates (X,Y according to subject)
         - Exit coordinates (X,Y according to subject)
-        - Solution path
+        - Solution path ('PACKED:...' line with packed=True, see
+          pathcodec)
         """
-        hexa = "0123456789ABCDEF"
         with open(self.output_file, "w") as f:
+            # One row at a time: a mapped grid is streamed from disk
             for row in self.grid:
-                f.write("".join(hexa[cell] for cell in row) + "\n")
+                f.write(bytes(row).translate(HEX_DIGITS).decode() + "\n")
             f.write("\n")
             # IMPORTANT: For the output file, we swap back to (X, Y)
             f.write(f"{self.entry[1]},{self.entry[0]}\n")
             f.write(f"{self.exit[1]},{self.exit[0]}\n")
-            f.write(f"{solution}\n")
+            f.write(f"{to_line(solution) if packed else solution}\n")
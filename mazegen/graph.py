@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+import heapq
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .flags import OPEN_SIDES
+from .solver import DIRECTIONS, solve_packed
+
+# Opposite direction index in DIRECTIONS order (N, E, S, W)
+OPPOSITE = (2, 3, 0, 1)
+LETTERS = "".join(char for _, _, _, char in DIRECTIONS)
+
+# For a cell with exactly two open sides: (walls * 4 + side entered
+# through) -> the other open side. 255 where it does not apply.
+_OTHER_SIDE = bytearray(b"\xff" * 64)
+for _walls in range(16):
+    _open = [i for i in range(4) if not _walls & DIRECTIONS[i][2]]
+    if len(_open) == 2:
+        _OTHER_SIDE[_walls * 4 + _open[0]] = _open[1]
+        _OTHER_SIDE[_walls * 4 + _open[1]] = _open[0]
+
+
+class CorridorGraph:
+    """
+    Compressed view of a maze: every chain of 2-sided (corridor) cells
+    becomes one weighted edge between the cells at its ends (junctions
+    and dead ends). A DFS maze is mostly
+    corridors, so searches settle far fewer nodes than a cell BFS.
+
+    Adjacency is stored in CSR form (compact arrays):
+        node_cell[n]                     flat cell index of node n,
+        offsets[n] .. offsets[n + 1]     slice of its edges in
+        targets / weights / first_move   (neighbour node, corridor
+                                         length, direction index of
+                                         the first step).
+    Paths are expanded back into N/E/S/W strings by walking the
+    corridor from its first step, which is unambiguous.
+    """
+
+    def __init__(
+        self, cells: Sequence[int], width: int, height: int
+    ) -> None:
+        """
+        Builds the graph in one linear pass.
+
+        Args:
+            cells: Wall bits, cells[row * width + col] (e.g. bytes).
+            width, height: Grid size.
+        """
+        self.width: int = width
+        self.height: int = height
+        walls = bytearray(cells)
+        # Close the entry / exit openings: walks must stay in the grid
+        for c in range(width):
+            walls[c] |= 1
+            walls[(height - 1) * width + c] |= 4
+        for r in range(height):
+            walls[r * width] |= 8
+            walls[r * width + width - 1] |= 2
+        self.walls: bytes = bytes(walls)
+        degree = self.walls.translate(OPEN_SIDES)
+        self.steps: Tuple[int, ...] = tuple(
+            dr * width + dc for dr, dc, _, _ in DIRECTIONS)
+
+        # Nodes: every open cell that is not a corridor (sorted)
+        self.node_cell = array("i", (
+            pos for pos, d in enumerate(degree) if d != 2 and d != 0))
+        self.offsets = array("i", [0])
+        self.targets = array("i")
+        self.weights = array("i")
+        self.first_move = bytearray()
+
+        bits = [bit for _, _, bit, _ in DIRECTIONS]
+        for pos in self.node_cell:
+            value = self.walls[pos]
+            for side in range(4):
+                if value & bits[side]:
+                    continue
+                end, length = self._follow(pos, side)
+                node = self.node_of(end)
+                if node is not None:
+                    self.targets.append(node)
+                    self.weights.append(length)
+                    self.first_move.append(side)
+            self.offsets.append(len(self.targets))
+
+    def __len__(self) -> int:
+        return len(self.node_cell)
+
+    def node_of(self, pos: int) -> Optional[int]:
+        """Node number of a flat cell index, None for corridor cells."""
+        i = bisect_left(self.node_cell, pos)
+        if i < len(self.node_cell) and self.node_cell[i] == pos:
+            return i
+        return None
+
+    def _follow(self, pos: int, side: int) -> Tuple[int, int]:
+        """
+        Steps out of 'pos' through 'side' and along the corridor.
+
+        Returns:
+            tuple: (cell where the corridor ends, number of moves).
+            Ends back on 'pos' for a loop without junctions.
+        """
+        walls, steps = self.walls, self.steps
+        start = pos
+        pos += steps[side]
+        length = 1
+        while pos != start:
+            nxt = _OTHER_SIDE[walls[pos] * 4 + OPPOSITE[side]]
+            if nxt == 255:
+                break
+            side = nxt
+            pos += steps[side]
+            length += 1
+        return pos, length
+
+    def _sides(self, pos: int, side: int, length: int) -> List[int]:
+        """Direction indexes of a corridor walk (see _follow)."""
+        walls, steps = self.walls, self.steps
+        out = [side]
+        pos += steps[side]
+        for _ in range(length - 1):
+            side = _OTHER_SIDE[walls[pos] * 4 + OPPOSITE[side]]
+            out.append(side)
+            pos += steps[side]
+        return out
+
+    def _exits(self, pos: int) -> List[Tuple[int, int, int]]:
+        """(end cell, length, first side) of each way out of 'pos'."""
+        value = self.walls[pos]
+        return [(*self._follow(pos, side), side)
+                for side in range(4) if not value & DIRECTIONS[side][2]]
+
+    def _links(self, pos: int) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        (node, length, first side) of the nodes next to a cell: itself
+        (length 0, side -1) when it is a node, else both corridor ends.
+        None when the corridor is a loop without any node.
+        """
+        node = self.node_of(pos)
+        if node is not None:
+            return [(node, 0, -1)]
+        links = []
+        for cell, length, side in self._exits(pos):
+            node = self.node_of(cell)
+            if node is None:
+                return None
+            links.append((node, length, side))
+        return links
+
+    def shortest_path(
+        self,
+        start: Tuple[int, int],
+        end: Tuple[int, int],
+        astar: bool = True,
+        stats: Optional[Dict[str, int]] = None,
+    ) -> Optional[str]:
+        """
+        Shortest path between two cells: A* (Manhattan distance, never
+        more than a corridor's length) or plain Dijkstra.
+
+        Args:
+            start: Entry coordinates as (row, col).
+            end: Exit coordinates as (row, col).
+            astar: Use the distance-to-exit heuristic.
+            stats: Optional dict filled with 'nodes_settled'.
+        Returns:
+            str: Direction string, or None when the exit is unreachable.
+        """
+        width = self.width
+        src = start[0] * width + start[1]
+        dst = end[0] * width + end[1]
+        if src == dst:
+            return ""
+        starts, goals = self._links(src), self._links(dst)
+        if starts is None or goals is None:
+            # Corridor loop without any junction: too small to matter
+            return solve_packed(self.walls, width, self.height, start, end)
+        if not starts or not goals:
+            return None  # A closed cell (e.g. part of the '42')
+
+        best = float("inf")
+        best_path: Optional[str] = None
+        # Start and exit on the same corridor: the direct walk
+        if starts[0][2] >= 0:
+            for side in range(4):
+                if self.walls[src] & DIRECTIONS[side][2]:
+                    continue
+                moves = self._walk_to(src, side, dst)
+                if moves is not None and len(moves) < best:
+                    best = len(moves)
+                    best_path = "".join(LETTERS[m] for m in moves)
+
+        end_r, end_c = end
+
+        def guess(node: int) -> int:
+            if not astar:
+                return 0
+            r, c = divmod(self.node_cell[node], width)
+            return abs(r - end_r) + abs(c - end_c)
+
+        # node -> (length, index in goals) of its shortest link to the
+        # exit: a corridor loop can link the exit twice to one junction
+        goal_link: Dict[int, Tuple[int, int]] = {}
+        for i, (node, length, _) in enumerate(goals):
+            known = goal_link.get(node)
+            if known is None or length < known[0]:
+                goal_link[node] = (length, i)
+        dist: Dict[int, int] = {}
+        # node -> (previous node, edge index) or (-1, start link index)
+        parent: Dict[int, Tuple[int, int]] = {}
+        heap: List[Tuple[int, int, int]] = []
+        for i, (node, length, _) in enumerate(starts):
+            if length < dist.get(node, best):
+                dist[node] = length
+                parent[node] = (-1, i)
+                heapq.heappush(heap, (length + guess(node), length, node))
+
+        settled = 0
+        reached: Optional[int] = None
+        reached_link = -1
+        while heap:
+            estimate, d, node = heapq.heappop(heap)
+            if estimate >= best:
+                break
+            if d > dist[node]:
+                continue
+            settled += 1
+            link = goal_link.get(node)
+            if link is not None and d + link[0] < best:
+                best = d + link[0]
+                reached, reached_link = node, link[1]
+            for e in range(self.offsets[node], self.offsets[node + 1]):
+                nxt = self.targets[e]
+                nd = d + self.weights[e]
+                if nd < dist.get(nxt, best):
+                    dist[nxt] = nd
+                    parent[nxt] = (node, e)
+                    heapq.heappush(heap, (nd + guess(nxt), nd, nxt))
+
+        if stats is not None:
+            stats["nodes_settled"] = settled
+        if reached is None:
+            return best_path
+        return self._expand(
+            reached, parent, starts, goals[reached_link], src, dst)
+
+    def _walk_to(self, pos: int, side: int, dst: int) -> Optional[List[int]]:
+        """Moves from 'pos' through 'side' if 'dst' is on that corridor."""
+        _, length = self._follow(pos, side)
+        moves = self._sides(pos, side, length)
+        for i, move in enumerate(moves):
+            pos += self.steps[move]
+            if pos == dst:
+                return moves[:i + 1]
+        return None
+
+    def _expand(
+        self,
+        node: int,
+        parent: Dict[int, Tuple[int, int]],
+        starts: List[Tuple[int, int, int]],
+        goal: Tuple[int, int, int],
+        src: int,
+        dst: int,
+    ) -> str:
+        """
+        Turns the node chain ending at 'node' into a move string; 'goal'
+        is the exit link (node, length, first side) the search used.
+        """
+        # Last leg: node -> exit cell, the reverse of the exit's link
+        tail: List[int] = []
+        _, length, side = goal
+        if side >= 0:
+            back = self._sides(dst, side, length)
+            tail = [OPPOSITE[m] for m in reversed(back)]
+
+        legs: List[List[int]] = [tail]
+        while True:
+            prev, e = parent[node]
+            if prev == -1:
+                _, length, side = starts[e]
+                if side >= 0:
+                    legs.append(self._sides(src, side, length))
+                break
+            legs.append(self._sides(
+                self.node_cell[prev], self.first_move[e], self.weights[e]))
+            node = prev
+        return "".join(LETTERS[m] for leg in reversed(legs) for m in leg)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Mold masks: a bitmap stencil (the '42', a logo, text...) rasterized
+once per (stencil, width, height, scale) and shared by everything that
+asks whether a cell is part of it.
+
+Only the stencil's bounding box is stored (one 0/1 byte per box cell),
+so a mask costs the same on a 10x10 and a 100000x100000 maze, and a
+membership test is a bounds check plus one byte read. mold_mask() is
+cached: every MazeGenerator of the same size shares one mask.
+"""
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from itertools import compress
+from typing import Iterable, Iterator, Optional, Tuple, cast
+
+
+@dataclass(frozen=True)
+class Stencil:
+    """Bitmap drawn in the middle of the maze ('#' cells are blocked)."""
+
+    name: str
+    rows: Tuple[str, ...]
+
+    @property
+    def width(self) -> int:
+        return max(len(row) for row in self.rows)
+
+    @property
+    def height(self) -> int:
+        return len(self.rows)
+
+
+# A 4 and a 2, one column apart
+STENCIL_42 = Stencil("42", (
+    "#.#.###",
+    "#.#...#",
+    "###.###",
+    "..#.#..",
+    "..#.###",
+))
+
+
+class MoldMask:
+    """
+    The cells of one stencil on one maze size. Iterates like the old
+    list of (row, col) positions (row by row), supports len() and
+    'cell in mask'.
+    """
+
+    def __init__(
+        self, width: int, height: int, top: int, left: int,
+        box_width: int, box: bytes, scale: int = 1, fits: bool = True
+    ) -> None:
+        """
+        Args:
+            width, height: Maze size.
+            top, left: Maze cell of the box's first byte.
+            box_width: Columns of the box (already clipped to the maze).
+            box: 0/1 per box cell, row by row.
+            scale: Stencil cells per mold cell side.
+            fits: False if the maze is too small for the whole stencil
+                  (the box was clipped).
+        """
+        self.width: int = width
+        self.height: int = height
+        self.top: int = top
+        self.left: int = left
+        self.box_width: int = box_width
+        self.box_height: int = len(box) // box_width if box_width else 0
+        self.box: bytes = box
+        self.scale: int = scale
+        self.fits: bool = fits
+        self.count: int = box.count(1)
+
+    def __contains__(self, cell: object) -> bool:
+        r, c = cast(Tuple[int, int], cell)
+        r -= self.top
+        c -= self.left
+        return (0 <= r < self.box_height and 0 <= c < self.box_width
+                and self.box[r * self.box_width + c] == 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(self.positions)
+
+    @cached_property
+    def positions(self) -> Tuple[Tuple[int, int], ...]:
+        """(row, col) of every mold cell, row by row."""
+        bw = self.box_width
+        return tuple((self.top + pos // bw, self.left + pos % bw)
+                     for pos in compress(range(len(self.box)), self.box))
+
+    def rows(self) -> Iterator[Tuple[int, int, bytes]]:
+        """(maze row, first column, 0/1 flags) of every box row."""
+        bw = self.box_width
+        for i in range(self.box_height):
+            yield self.top + i, self.left, self.box[i * bw:(i + 1) * bw]
+
+    def flags(self) -> bytes:
+        """1 per mold cell (row * width + col), 0 elsewhere."""
+        out = bytearray(self.width * self.height)
+        for r, c, row in self.rows():
+            start = r * self.width + c
+            out[start:start + len(row)] = row
+        return bytes(out)
+
+
+def auto_scale(stencil: Stencil, width: int, height: int) -> int:
+    """Largest scale at which the stencil spans at most a third of the
+    maze in both directions (at least 1)."""
+    return max(1, min(width // (3 * stencil.width),
+                      height // (3 * stencil.height)))
+
+
+def blocked_cell(
+    mask: MoldMask, cells: Iterable[Tuple[str, Tuple[int, int]]]
+) -> Optional[str]:
+    """
+    Error message for the first (name, cell) inside the mask, None if
+    all are clear. A clipped stencil (maze too small for it) is not
+    checked: that case only gets a warning.
+    """
+    if not mask.fits:
+        return None
+    for name, cell in cells:
+        if tuple(cell) in mask:
+            return f"{name} {cell} is inside the mold (scale {mask.scale})"
+    return None
+
+
+def scaled_mask(
+    stencil: Optional[Stencil], width: int, height: int, scale: int = 1
+) -> MoldMask:
+    """mold_mask() for a MOLD_SCALE value (0: auto_scale())."""
+    if scale == 0 and stencil is not None:
+        scale = auto_scale(stencil, width, height)
+    return mold_mask(stencil, width, height, max(1, scale))
+
+
+@lru_cache(maxsize=64)
+def mold_mask(
+    stencil: Optional[Stencil], width: int, height: int, scale: int = 1
+) -> MoldMask:
+    """
+    Rasterizes 'stencil' centered on a width x height maze, each of its
+    cells drawn as a scale x scale block; parts outside the maze are
+    dropped. Cached: treat the result as read-only.
+
+    Args:
+        stencil: The bitmap (None: an empty mask).
+        width, height: Maze size.
+        scale: Block size (1: the stencil as drawn).
+    """
+    if stencil is None:
+        return MoldMask(width, height, 0, 0, 0, b"", scale)
+    span_w, span_h = stencil.width * scale, stencil.height * scale
+    # Same centering as always: height // 2 - 2, width // 2 - 3 at 1x
+    top = height // 2 - span_h // 2
+    left = width // 2 - span_w // 2
+    c0, c1 = max(0, left), min(width, left + span_w)
+    r0, r1 = max(0, top), min(height, top + span_h)
+    fits = span_w <= width and span_h <= height
+    if c0 >= c1 or r0 >= r1:
+        return MoldMask(width, height, 0, 0, 0, b"", scale, fits)
+
+    box = bytearray()
+    for r in range(r0, r1):
+        text = stencil.rows[(r - top) // scale].ljust(stencil.width, ".")
+        line = bytes(ch == "#" for ch in text for _ in range(scale))
+        box += line[c0 - left:c1 - left]
+    return MoldMask(width, height, r0, c0, c1 - c0, bytes(box), scale,
+                    fits)
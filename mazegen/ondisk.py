@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+File-backed storage for mazes larger than RAM.
+
+The grid, the visited flags and the BFS moves live in memory-mapped
+temporary files (one byte per cell) and the DFS stack spills to disk
+in chunks: the OS page cache decides what stays in memory. The files
+are anonymous (already unlinked), so nothing is left behind.
+"""
+import mmap
+import tempfile
+from array import array
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Bytes written at a time when a mapped file is filled
+_FILL_BLOCK = 1 << 20
+
+# One byte per cell, in RAM or in a mapped file (see solver.solve)
+MovesBuffer = Union[bytearray, mmap.mmap]
+
+
+def mapped_buffer(
+    size: int, fill: int = 0, directory: Optional[str] = None
+) -> mmap.mmap:
+    """
+    Writable mapping of a new temporary file of 'size' bytes.
+
+    Args:
+        size: Length in bytes (at least 1).
+        fill: Initial value of every byte (0 keeps the file sparse).
+        directory: Where to create the file (default: the temp dir).
+    """
+    with tempfile.TemporaryFile(dir=directory) as f:
+        if fill:
+            block = bytes([fill]) * min(size, _FILL_BLOCK)
+            for start in range(0, size, len(block)):
+                f.write(block[:size - start])
+        f.truncate(size)
+        f.flush()
+        # The mapping keeps the (unlinked) file alive after close
+        return mmap.mmap(f.fileno(), size)
+
+
+class MappedGrid:
+    """
+    width x height bytes in a mapped file, readable and writable as
+    rows[row][col] like a list of lists (each row is a memoryview).
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        fill: int = 0,
+        directory: Optional[str] = None,
+    ) -> None:
+        self.width: int = width
+        self.height: int = height
+        self.map = mapped_buffer(width * height, fill, directory)
+        view = memoryview(self.map)
+        self.rows: List[memoryview] = [
+            view[r * width:(r + 1) * width] for r in range(height)]
+
+
+class SpillStack:
+    """
+    DFS stack of (row, col) cells whose bottom is written to a file.
+
+    The top 2 * chunk cells stay in a list; when it is full, the oldest
+    chunk goes to disk as flat uint32 indexes and comes back when the
+    list runs empty. A DFS stack only moves at its top, so each chunk
+    is written and read at most once per trip.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        chunk: int = 1 << 20,
+        directory: Optional[str] = None,
+    ) -> None:
+        self.width: int = width
+        self.chunk: int = max(1, chunk)
+        self.directory = directory
+        self._top: List[Tuple[int, int]] = []
+        self._file: Optional[IO[bytes]] = None
+        self._spilled = 0  # Chunks on disk
+
+    def __len__(self) -> int:
+        return self._spilled * self.chunk + len(self._top)
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        """Indexes the in-memory top only (stack[-1] is the top)."""
+        return self._top[index]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Bottom to top, like a list."""
+        for n in range(self._spilled):
+            yield from self._read(n)
+        yield from self._top
+
+    def append(self, cell: Tuple[int, int]) -> None:
+        self._top.append(cell)
+        if len(self._top) >= 2 * self.chunk:
+            self._spill()
+
+    def extend(self, cells: Iterable[Tuple[int, int]]) -> None:
+        for cell in cells:
+            self.append(cell)
+
+    def pop(self) -> Tuple[int, int]:
+        cell = self._top.pop()
+        if not self._top and self._spilled:
+            self._spilled -= 1
+            self._top = self._read(self._spilled)
+        return cell
+
+    def _spill(self) -> None:
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(dir=self.directory)
+        w = self.width
+        data = array("I", [r * w + c for r, c in self._top[:self.chunk]])
+        self._file.seek(self._spilled * self.chunk * data.itemsize)
+        self._file.write(data.tobytes())
+        del self._top[:self.chunk]
+        self._spilled += 1
+
+    def _read(self, n: int) -> List[Tuple[int, int]]:
+        assert self._file is not None
+        data = array("I")
+        self._file.seek(n * self.chunk * data.itemsize)
+        data.frombytes(self._file.read(self.chunk * data.itemsize))
+        w = self.width
+        return [divmod(pos, w) for pos in data]
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Packed solution paths.
+
+A solution is stored as one byte per move ('N', 'E', 'S', 'W'); this
+codec needs at most a quarter of that:
+
+    bits    2 bits per move, four moves per byte (move i in bits
+            2 * (i % 4) of byte i // 4), codes N=0 E=1 S=2 W=3
+    rle     one byte per straight run: code << 6 | (length - 1), runs
+            longer than 64 moves split over several bytes
+    turns   the first move's code, then each later move as a turn
+            (0 straight, 1 right, 2 left), five base-3 digits per byte
+            (turn i worth 3 ** (i % 5) in byte i // 5). A shortest path
+            never turns back, so this fits every solution.
+
+All start with a header (codec, move count). pack_path() picks the
+smallest one unless told otherwise. In a saved maze file the packed
+path replaces the solution line as 'PACKED:' + Base85 text: 5
+characters per 4 bytes, so the turn codes give about 4 moves per
+character (3.99x shorter than the text line on a 100000-move path,
+where the 2-bit codes give 3.2x).
+"""
+import base64
+import re
+import struct
+from itertools import accumulate
+from typing import Iterator, List, Optional
+
+CODEC_BITS, CODEC_RLE, CODEC_TURNS = 0, 1, 2
+# SOLUTION_FORMAT config values: 'packed' makes save_to_file use to_line
+SOLUTION_FORMATS = ("text", "packed")
+PACKED_PREFIX = "PACKED:"
+MOVE_LETTERS = "NESW"
+# Longest run in one RLE byte
+MAX_RUN = 64
+
+_HEADER = struct.Struct("<BQ")
+_TO_CODE = bytes.maketrans(b"NESW", b"\x00\x01\x02\x03")
+_TO_LETTER = bytes.maketrans(b"\x00\x01\x02\x03", b"NESW")
+# Byte -> code << 2k (packing) and byte -> its k-th code (unpacking)
+_SHIFT = [bytes((v << 2 * k) & 0xFF for v in range(256)) for k in range(4)]
+_FIELD = [bytes((v >> 2 * k) & 3 for v in range(256)) for k in range(4)]
+# Byte -> its four moves, for lazy decoding
+_QUADS = ["".join(MOVE_LETTERS[(v >> 2 * k) & 3] for k in range(4))
+          for v in range(256)]
+_RUNS = re.compile(r"N+|E+|S+|W+")
+# Turn codes: (previous code * 4 + next code) -> turn, 255 for a U-turn;
+# per byte of five turns, byte -> turn * 3 ** k (packing) and byte ->
+# the k-th turn as a code difference 0, 1 or 3 (unpacking)
+_TURN = bytes((0, 1, 255, 2)[(b - a) % 4] for a in range(4)
+              for b in range(4)) + b"\xff" * 240
+_DELTA = (0, 1, 3)
+_TRIT = [bytes(v * 3 ** k if v < 3 else 0 for v in range(256))
+         for k in range(5)]
+_TRIT_DELTA = [bytes(_DELTA[v // 3 ** k % 3] for v in range(256))
+               for k in range(5)]
+_QUINTS = [tuple(_DELTA[v // 3 ** k % 3] for k in range(5))
+           for v in range(256)]
+
+
+def _bits(codes: bytes) -> bytes:
+    """Four 2-bit codes per byte, combined as big integers (in C)."""
+    codes += b"\x00" * (-len(codes) % 4)
+    value = 0
+    for k in range(4):
+        value |= int.from_bytes(codes[k::4].translate(_SHIFT[k]), "little")
+    return value.to_bytes(len(codes) // 4, "little")
+
+
+def _turns(codes: bytes) -> Optional[bytes]:
+    """First code and five turns per byte; None if the path turns back."""
+    # Both codes of every step side by side: one big-integer multiply-add
+    # (each byte stays below 16, no carries)
+    steps = int.from_bytes(codes[:-1], "little") * 4 + int.from_bytes(
+        codes[1:], "little")
+    turns = steps.to_bytes(len(codes) - 1, "little").translate(_TURN)
+    if 255 in turns:
+        return None
+    turns += b"\x00" * (-len(turns) % 5)
+    value = 0
+    for k in range(5):
+        # At most 2 * (1 + 3 + 9 + 27 + 81) = 242 per byte: no carries
+        value += int.from_bytes(turns[k::5].translate(_TRIT[k]), "little")
+    return codes[:1] + value.to_bytes(len(turns) // 5, "little")
+
+
+def _rle(path: str) -> bytes:
+    out = bytearray()
+    for run in _RUNS.finditer(path):
+        code = MOVE_LETTERS.index(path[run.start()]) << 6
+        length = run.end() - run.start()
+        while length > 0:
+            out.append(code | (min(length, MAX_RUN) - 1))
+            length -= MAX_RUN
+    return bytes(out)
+
+
+def pack_path(path: str, rle: Optional[bool] = None) -> bytes:
+    """
+    Encodes a direction string.
+
+    Args:
+        path: Moves, e.g. 'EESNW'.
+        rle: Force run-length encoding (True) or 2-bit codes (False);
+             None keeps the smallest of those and the turn codes.
+    Raises:
+        ValueError: 'path' has a letter other than N, E, S, W.
+    """
+    if path.strip(MOVE_LETTERS):
+        raise ValueError("a path only has N, E, S and W moves")
+    codes = path.encode().translate(_TO_CODE)
+    if rle is None:
+        # One RLE byte per run (and per MAX_RUN moves of a long one)
+        runs = sum((len(m.group()) + MAX_RUN - 1) // MAX_RUN
+                   for m in _RUNS.finditer(path))
+        bits = (len(path) + 3) // 4
+        turns = _turns(codes) if path else None
+        if turns is not None and len(turns) <= min(runs, bits):
+            return _HEADER.pack(CODEC_TURNS, len(path)) + turns
+        rle = runs < bits
+    if rle:
+        return _HEADER.pack(CODEC_RLE, len(path)) + _rle(path)
+    return _HEADER.pack(CODEC_BITS, len(path)) + _bits(codes)
+
+
+class PackedPath:
+    """
+    A packed path read lazily: iterating yields one move at a time
+    (e.g. straight into flags.path_cells()), str() decodes it whole.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """
+        Raises:
+            ValueError: Not a packed path, or a truncated one.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("truncated packed path")
+        self.codec, self.count = _HEADER.unpack_from(data)
+        self.payload = data[_HEADER.size:]
+        if self.codec == CODEC_BITS:
+            if len(self.payload) != (self.count + 3) // 4:
+                raise ValueError("truncated packed path")
+        elif self.codec == CODEC_TURNS:
+            if len(self.payload) != (self.count + 8) // 5 or (
+                    self.payload[:1] > b"\x03"):
+                raise ValueError("truncated packed path")
+        elif self.codec != CODEC_RLE:
+            raise ValueError(f"unknown path codec {self.codec}")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        left = self.count
+        if self.codec == CODEC_BITS:
+            for byte in self.payload:
+                quad = _QUADS[byte]
+                if left < 4:
+                    yield from quad[:left]
+                    return
+                yield from quad
+                left -= 4
+            return
+        if self.codec == CODEC_TURNS:
+            if not left:
+                return
+            code = self.payload[0]
+            yield MOVE_LETTERS[code]
+            left -= 1
+            for byte in self.payload[1:]:
+                for delta in _QUINTS[byte][:left]:
+                    code = (code + delta) & 3
+                    yield MOVE_LETTERS[code]
+                left -= 5
+            return
+        for byte in self.payload:
+            yield from MOVE_LETTERS[byte >> 6] * ((byte & 63) + 1)
+
+    def __str__(self) -> str:
+        if self.codec == CODEC_BITS:
+            fields = bytearray(len(self.payload) * 4)
+            for k in range(4):
+                fields[k::4] = self.payload.translate(_FIELD[k])
+            return fields[:self.count].translate(_TO_LETTER).decode()
+        if self.codec == CODEC_TURNS:
+            if not self.count:
+                return ""
+            turns = self.payload[1:]
+            fields = bytearray(len(turns) * 5)
+            for k in range(5):
+                fields[k::5] = turns.translate(_TRIT_DELTA[k])
+            # Each code is the first one plus the turns so far, mod 4
+            del fields[self.count - 1:]
+            codes = bytes(map((3).__and__, accumulate(
+                fields, initial=self.payload[0])))
+            return codes.translate(_TO_LETTER).decode()
+        parts: List[str] = [MOVE_LETTERS[byte >> 6] * ((byte & 63) + 1)
+                            for byte in self.payload]
+        path = "".join(parts)
+        if len(path) != self.count:
+            raise ValueError("truncated packed path")
+        return path
+
+
+def unpack_path(data: bytes) -> str:
+    """Inverse of pack_path()."""
+    return str(PackedPath(data))
+
+
+def to_line(path: str, rle: Optional[bool] = None) -> str:
+    """Solution line of a saved file: 'PACKED:' + Base85 text."""
+    return PACKED_PREFIX + base64.b85encode(pack_path(path, rle)).decode()
+
+
+def read_line(line: str) -> Optional[PackedPath]:
+    """
+    Returns:
+        PackedPath: The path of a 'PACKED:' solution line, None for a
+                    plain direction string.
+    """
+    if not line.startswith(PACKED_PREFIX):
+        return None
+    return PackedPath(base64.b85decode(line[len(PACKED_PREFIX):]))
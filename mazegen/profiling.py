@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+
+class PhaseProfiler:
+    """
+    Wall time and peak memory (tracemalloc) per named phase, plus free
+    form counters. Phases may be nested: a parent's peak includes the
+    peaks of its children.
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        """
+        Args:
+            memory: Track peak memory with tracemalloc (slower).
+        """
+        self.memory = memory
+        # Insertion ordered: {name: {"seconds": float, "peak_kb": float}}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self._peaks: List[int] = []
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the enclosed block under 'name'."""
+        if self.memory:
+            if self._peaks:
+                # Save the parent's peak so far before resetting it
+                self._peaks[-1] = max(
+                    self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak = 0
+            if self.memory:
+                peak = max(self._peaks.pop(),
+                           tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+                tracemalloc.reset_peak()
+            entry = self.phases.setdefault(
+                name, {"seconds": 0.0, "peak_kb": 0.0})
+            entry["seconds"] += seconds
+            entry["peak_kb"] = max(entry["peak_kb"], peak / 1024)
+
+    def count(self, values: Dict[str, int]) -> None:
+        """Merges hot-path counters (e.g. MazeGenerator.stats)."""
+        self.counters.update(values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"phases": self.phases, "counters": self.counters}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def table(self) -> str:
+        """Human readable summary."""
+        lines = [f"{'Phase':<20}{'Time (ms)':>12}{'Peak (KB)':>12}"]
+        for name, entry in self.phases.items():
+            peak = f"{entry['peak_kb']:12.1f}" if self.memory else " " * 9
+            lines.append(
+                f"{name:<20}{entry['seconds'] * 1000:12.2f}{peak}")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'Counter':<20}{'Value':>12}")
+            for name, value in self.counters.items():
+                lines.append(f"{name:<20}{value:>12}")
+        return "\n".join(lines)
+
+
+def phase(
+    profiler: Optional[PhaseProfiler], name: str
+) -> ContextManager[None]:
+    """profiler.phase(name), or a no-op when profiling is off."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import sys
+import threading
+import time
+from typing import Callable, Optional
+
+# callback(phase, done, total, eta_seconds or None)
+ProgressCallback = Callable[[str, int, int, Optional[float]], None]
+
+
+class Cancelled(Exception):
+    """Raised inside a job whose CancelToken was cancelled."""
+
+
+class CancelToken:
+    """
+    Cooperative cancellation: any thread (or a signal handler) calls
+    cancel(), the job notices at its next progress check and raises
+    Cancelled, leaving files and the terminal in a clean state.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        """Raises Cancelled if cancel() was called."""
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class ProgressReporter:
+    """
+    Observer for long loops (MazeGenerator.iter_generate, iter_solve).
+
+    The hot loop only compares its counter with the threshold returned
+    by begin() / tick(): the reporter is called once every 'every'
+    steps, checks the cancel token, and calls 'callback' at most once
+    per 'interval' seconds with an ETA from the average rate so far.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback,
+        interval: float = 0.2,
+        every: int = 4096,
+        cancel: Optional[CancelToken] = None,
+    ) -> None:
+        """
+        Args:
+            callback: Called with (phase, done, total, eta).
+            interval: Minimum seconds between two callbacks.
+            every: Steps between two checks (cancel token and clock).
+            cancel: Optional token checked at every tick.
+        """
+        self.callback = callback
+        self.interval = interval
+        self.every = max(1, every)
+        self.cancel = cancel
+        self.phase = ""
+        self.total = 0
+        self._start = 0.0
+        self._last = 0.0
+
+    def begin(self, phase: str, total: int) -> int:
+        """Starts a phase; returns the first step count to tick at."""
+        if self.cancel is not None:
+            self.cancel.check()
+        self.phase = phase
+        self.total = total
+        self._start = self._last = time.perf_counter()
+        self.callback(phase, 0, total, None)
+        return self.every
+
+    def tick(self, done: int) -> int:
+        """Reports 'done' steps if due; returns the next threshold."""
+        if self.cancel is not None:
+            self.cancel.check()
+        now = time.perf_counter()
+        if now - self._last >= self.interval:
+            self._last = now
+            rate = done / (now - self._start)
+            eta = max(0, self.total - done) / rate if rate > 0 else None
+            self.callback(self.phase, done, self.total, eta)
+        return done + self.every
+
+    def finish(self, done: int) -> None:
+        """
+        Final report: 'done' becomes the total (a BFS usually stops
+        before it has seen every cell).
+        """
+        self.total = done
+        self.callback(self.phase, done, done, 0.0)
+
+
+def progress_bar(width: int = 30) -> ProgressCallback:
+    """
+    Callback drawing a one-line terminal bar on stderr, e.g.
+    'generate [#######.......]  48%  1240000/2560000  ETA 3.1s'.
+    """
+    def draw(phase: str, done: int, total: int, eta: Optional[float]) -> None:
+        ratio = min(1.0, done / total) if total else 1.0
+        filled = int(ratio * width)
+        eta_text = f"ETA {eta:5.1f}s" if eta is not None else "ETA   ?"
+        sys.stderr.write(
+            f"\r{phase:<9} [{'#' * filled}{'.' * (width - filled)}] "
+            f"{ratio * 100:4.0f}%  {done}/{total}  {eta_text}")
+        if done >= total:
+            sys.stderr.write("\n")
+        sys.stderr.flush()
+
+    return draw
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Counter-based random numbers.
+
+A draw is a pure function of (seed, stream, index): nothing is
+consumed, so the draws of any cell can be computed alone, in bulk
+(vectorized with NumPy when installed) or in any order, and the same
+seed gives the same maze on every Python version and worker count.
+"""
+import hashlib
+from typing import Dict, List, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only speeds up CounterRNG.many()
+    np = None
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+
+# Supported MazeGenerator modes: 'mt' replays random.Random(seed)
+# (compatible with every seed saved so far), 'counter' uses CounterRNG
+RNG_MODES = ("mt", "counter")
+
+
+def splitmix64(value: int) -> int:
+    """SplitMix64 finalizer: spreads any 64-bit input over all bits."""
+    value = (value + GOLDEN) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def mix(seed: int, *values: int) -> int:
+    """Deterministic hash of a seed and integers (negatives allowed)."""
+    h = splitmix64(seed & MASK64)
+    for v in values:
+        h = splitmix64(h ^ (v & MASK64))
+    return h
+
+
+def int_seed(seed: object) -> int:
+    """
+    Integer key of a seed: ints (or int strings, as read from a config
+    file) as they are, anything else hashed with SHA-256 (stable across
+    runs, unlike hash()).
+    """
+    if isinstance(seed, int):
+        return seed
+    try:
+        return int(str(seed))
+    except ValueError:
+        digest = hashlib.sha256(str(seed).encode()).digest()
+        return int.from_bytes(digest[:8], "little")
+
+
+class CounterRNG:
+    """
+    Random draws addressed by (stream, index) instead of a hidden state.
+
+    Each stream has its own key, mix(seed, stream); draw i of a stream
+    is splitmix64(key + i * GOLDEN), i.e. element i of a SplitMix64
+    sequence, reached directly.
+    """
+
+    def __init__(self, seed: object) -> None:
+        """
+        Args:
+            seed: Any seed accepted by int_seed().
+        """
+        self.seed: int = int_seed(seed)
+        self._keys: Dict[int, int] = {}
+
+    def key(self, stream: int) -> int:
+        key = self._keys.get(stream)
+        if key is None:
+            key = self._keys[stream] = mix(self.seed, stream)
+        return key
+
+    def draw(self, stream: int, index: int) -> int:
+        """64 random bits for (stream, index)."""
+        return splitmix64((self.key(stream) + index * GOLDEN) & MASK64)
+
+    def below(self, stream: int, index: int, n: int) -> int:
+        """
+        Integer in [0, n) for (stream, index), n < 2 ** 32.
+
+        Multiply-shift on the top 32 bits: exact in 64-bit integer
+        arithmetic, so many() gives the same values with NumPy.
+        """
+        if n < 1:
+            raise ValueError("empty range for below()")
+        return ((self.draw(stream, index) >> 32) * n) >> 32
+
+    def many(self, stream: int, indices: Sequence[int], n: int) -> List[int]:
+        """below(stream, i, n) for every i in 'indices', in one pass."""
+        if n < 1:
+            raise ValueError("empty range for many()")
+        if np is None:
+            return [self.below(stream, i, n) for i in indices]
+        # uint64 arithmetic wraps modulo 2 ** 64, like the '& MASK64'
+        state = np.asarray(indices, dtype=np.uint64) * np.uint64(GOLDEN)
+        state += np.uint64((self.key(stream) + GOLDEN) & MASK64)
+        state ^= state >> np.uint64(30)
+        state *= np.uint64(0xBF58476D1CE4E5B9)
+        state ^= state >> np.uint64(27)
+        state *= np.uint64(0x94D049BB133111EB)
+        state ^= state >> np.uint64(31)
+        state = ((state >> np.uint64(32)) * np.uint64(n)) >> np.uint64(32)
+        return [int(v) for v in state.tolist()]
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Finds seeds whose maze matches target properties.
+
+    python3 -m mazegen.seed_search config.txt --count 5 --min-length 200
+
+Candidate seeds are split into batches and checked by a process pool.
+The cheap checks run first: dead ends are counted with one
+bytes.translate / bytes.count pass before any BFS is spent on the
+seed. The search stops as soon as 'count' matches are found.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import (FIRST_COMPLETED, Future,
+                                ProcessPoolExecutor, wait)
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .analytics import mold_contact, path_indices
+from .flags import OPEN_SIDES
+from .generator import MazeGenerator
+from .solver import solve_packed
+from .utils import parse_config
+
+# (seed, metrics) of a matching maze
+Match = Tuple[int, Dict[str, int]]
+
+
+@dataclass(frozen=True)
+class SearchCriteria:
+    """Target properties; None means 'no limit'."""
+
+    min_length: Optional[int] = None
+    max_length: Optional[int] = None
+    min_dead_ends: Optional[int] = None
+    max_dead_ends: Optional[int] = None
+    # Path cells that must run along the '42' stencil
+    min_mold_contact: Optional[int] = None
+
+
+def _within(value: int, low: Optional[int], high: Optional[int]) -> bool:
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def evaluate(
+    settings: Dict[str, Any], criteria: SearchCriteria, seed: int
+) -> Optional[Dict[str, int]]:
+    """
+    Generates the maze of one seed and checks it, cheapest test first.
+
+    Args:
+        settings: Parsed config ('width', 'height', 'entry', 'exit',
+                  'perfect').
+        criteria: The properties to match.
+        seed: Candidate seed (generated as the string a config file
+              would give, so that SEED=<seed> reproduces the maze).
+    Returns:
+        dict: The metrics of a matching maze, None otherwise.
+    """
+    width, height = settings["width"], settings["height"]
+    maze = MazeGenerator(
+        width=width,
+        height=height,
+        # As read back from SEED=<seed>: random.Random('17') is not
+        # random.Random(17)
+        seed=str(seed),
+        entry=settings["entry"],
+        exit=settings["exit"],
+        output_file=os.devnull,
+        perfect=settings["perfect"],
+        rng_mode=settings.get("rng", "mt"),
+        braid_loops=settings.get("braid_loops"),
+        dead_end_ratio=settings.get("dead_end_ratio"),
+        mold_scale=settings.get("mold_scale", 1),
+    )
+    maze.generate()
+    cells = b"".join(bytes(row) for row in maze.grid)
+
+    dead_ends = cells.translate(OPEN_SIDES).count(1)
+    if not _within(dead_ends, criteria.min_dead_ends,
+                   criteria.max_dead_ends):
+        return None
+
+    path = solve_packed(cells, width, height, maze.entry, maze.exit)
+    if path is None or not _within(len(path), criteria.min_length,
+                                   criteria.max_length):
+        return None
+
+    metrics = {"solution_length": len(path), "dead_ends": dead_ends}
+    if criteria.min_mold_contact is not None:
+        contact = mold_contact(
+            cells, width, height,
+            path_indices(maze.entry, path, width, width * height))
+        if contact < criteria.min_mold_contact:
+            return None
+        metrics["mold_contact"] = contact
+    return metrics
+
+
+def _check_batch(
+    settings: Dict[str, Any], criteria: SearchCriteria, first: int, size: int
+) -> List[Match]:
+    """Runs in a worker: checks seeds first .. first + size - 1."""
+    found = []
+    for seed in range(first, first + size):
+        metrics = evaluate(settings, criteria, seed)
+        if metrics is not None:
+            found.append((seed, metrics))
+    return found
+
+
+def search(
+    settings: Dict[str, Any],
+    criteria: SearchCriteria,
+    count: int = 1,
+    start: int = 0,
+    limit: Optional[int] = None,
+    workers: Optional[int] = None,
+    batch: int = 16,
+) -> Tuple[List[Match], int, float]:
+    """
+    Checks seeds start, start + 1, ... until 'count' matches are found
+    (or 'limit' seeds were checked).
+
+    Only a few batches per worker are in flight at a time, so the pool
+    stops quickly once enough matches came in. Batches finish out of
+    order: the matches are the first 'count' found, sorted by seed, not
+    necessarily the smallest matching seeds.
+
+    Returns:
+        tuple: (matches, seeds checked, elapsed seconds).
+    """
+    workers = workers or os.cpu_count() or 1
+    end = start + limit if limit is not None else None
+    matches: List[Match] = []
+    checked = 0
+    next_seed = start
+    began = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Set["Future[List[Match]]"] = set()
+        batch_sizes: Dict["Future[List[Match]]", int] = {}
+        while True:
+            # Keep the pool busy, without queueing the whole seed range
+            while len(pending) < 2 * workers and (
+                    end is None or next_seed < end):
+                size = batch if end is None else min(batch, end - next_seed)
+                future = pool.submit(
+                    _check_batch, settings, criteria, next_seed, size)
+                pending.add(future)
+                batch_sizes[future] = size
+                next_seed += size
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                checked += batch_sizes.pop(future)
+                matches.extend(future.result())
+            if len(matches) >= count:
+                for future in pending:
+                    future.cancel()
+                break
+
+    elapsed = time.perf_counter() - began
+    return sorted(matches)[:count], checked, elapsed
+
+
+def _range(text: str) -> Tuple[Optional[int], Optional[int]]:
+    """'MIN:MAX' with either side optional (e.g. '100:', ':250')."""
+    low, _, high = text.partition(":")
+    return (int(low) if low else None, int(high) if high else None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed search")
+    parser.add_argument("config_file",
+                        help="size, entry, exit and PERFECT to search")
+    parser.add_argument("--count", type=int, default=1,
+                        help="stop after this many matches (K)")
+    parser.add_argument("--start", type=int, default=0,
+                        help="first seed to try")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="give up after this many seeds")
+    parser.add_argument("--length", type=_range, default=(None, None),
+                        metavar="MIN:MAX", help="solution length range")
+    parser.add_argument("--dead-ends", type=_range, default=(None, None),
+                        metavar="MIN:MAX", help="dead end count range")
+    parser.add_argument("--near-42", type=int, default=None, metavar="N",
+                        help="at least N path cells along the '42'")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=16,
+                        help="seeds per task")
+    args = parser.parse_args()
+
+    settings = parse_config(args.config_file)
+    criteria = SearchCriteria(
+        min_length=args.length[0],
+        max_length=args.length[1],
+        min_dead_ends=args.dead_ends[0],
+        max_dead_ends=args.dead_ends[1],
+        min_mold_contact=args.near_42,
+    )
+    matches, checked, elapsed = search(
+        settings, criteria, args.count, args.start, args.limit,
+        args.workers, args.batch)
+
+    for seed, metrics in matches:
+        details = ", ".join(f"{k}={v}" for k, v in metrics.items())
+        print(f"SEED={seed}  ({details})")
+    rate = checked / elapsed if elapsed > 0 else 0.0
+    print(f"{len(matches)} match(es), {checked} seeds checked in "
+          f"{elapsed:.2f}s ({rate:.1f} seeds/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Batch solving of many (entry, exit) queries on one big maze.
+
+The grid is packed once (one byte per cell) into a
+multiprocessing.shared_memory block. Worker processes attach to it
+read-only when they start, so a query only carries four integers and
+a path string instead of a pickled copy of the whole grid.
+
+    python3 -m mazegen.shared_solve --size 301 --queries 1000
+"""
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .solver import solve_packed
+
+# (entry, exit) as (row, col) pairs
+Query = Tuple[Tuple[int, int], Tuple[int, int]]
+
+# Per worker process: (shared block, read-only view, width, height)
+_worker: Optional[
+    Tuple[shared_memory.SharedMemory, memoryview, int, int]] = None
+
+
+def _attach(name: str, width: int, height: int) -> None:
+    """Pool initializer: maps the published grid into this worker."""
+    global _worker
+    # Workers share the publisher's resource tracker: only close() in
+    # the publisher unlinks the block
+    shm = shared_memory.SharedMemory(name=name)
+    assert shm.buf is not None
+    _worker = (shm, shm.buf.toreadonly(), width, height)
+
+
+def _solve_batch(batch: List[Query]) -> List[Optional[str]]:
+    """Runs in a worker: solves a batch against the attached grid."""
+    assert _worker is not None, "worker not attached"
+    _, cells, width, height = _worker
+    return [solve_packed(cells, width, height, start, end)
+            for start, end in batch]
+
+
+class SharedGridSolver:
+    """
+    Publishes a grid in shared memory and solves query batches with a
+    pool of worker processes. Use as a context manager (or call close())
+    so the shared block is released.
+    """
+
+    def __init__(
+        self, grid: Sequence[Sequence[int]], workers: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            grid: The maze matrix [row][col] (e.g. MazeGenerator.grid).
+            workers: Number of processes (default: one per CPU).
+        """
+        self.height: int = len(grid)
+        self.width: int = len(grid[0]) if grid else 0
+        size = max(1, self.width * self.height)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        buf = self.shm.buf
+        assert buf is not None
+        for r, row in enumerate(grid):
+            buf[r * self.width:(r + 1) * self.width] = bytes(row)
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach,
+            initargs=(self.shm.name, self.width, self.height),
+        )
+
+    def solve_batches(
+        self, batches: Iterable[List[Query]]
+    ) -> Iterator[List[Optional[str]]]:
+        """
+        Streams the results of each batch, in order, as soon as it (and
+        the batches before it) are done. None marks unreachable exits.
+        """
+        return self.pool.map(_solve_batch, batches)
+
+    def solve_all(
+        self, queries: Sequence[Query], batch_size: int = 256
+    ) -> Iterator[Optional[str]]:
+        """Splits 'queries' into batches and yields one result each."""
+        batches = (list(queries[i:i + batch_size])
+                   for i in range(0, len(queries), batch_size))
+        for results in self.solve_batches(batches):
+            yield from results
+
+    def close(self) -> None:
+        """Stops the workers and frees the shared block."""
+        self.pool.shutdown()
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> "SharedGridSolver":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main() -> None:
+    from .generator import MazeGenerator
+
+    parser = argparse.ArgumentParser(description="Shared memory solving")
+    parser.add_argument("--size", type=int, default=301)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    n = args.size
+    maze = MazeGenerator(n, n, 42, (0, 0), (n - 1, n - 1), "", False)
+    maze.generate()
+    rng = random.Random(0)
+    mold = maze.mold_positions
+    cells = [(r, c) for r in range(n) for c in range(n)
+             if (r, c) not in mold]
+    queries = [(rng.choice(cells), rng.choice(cells))
+               for _ in range(args.queries)]
+
+    with SharedGridSolver(maze.grid, args.workers) as solver:
+        start = time.perf_counter()
+        total = sum(len(p or "") for p in solver.solve_all(queries,
+                                                           args.batch))
+        elapsed = time.perf_counter() - start
+    print(f"{len(queries)} queries in {elapsed:.2f}s "
+          f"({len(queries) / elapsed:.0f} queries/s, "
+          f"{total} moves in total)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+from .generator import MazeGenerator
+from .mask import MoldMask
+from .solver import solve
+
+
+@dataclass(frozen=True)
+class MazeSnapshot:
+    """
+    Immutable, fully solved maze. Safe to hand from a worker thread to
+    the render thread: nobody can modify it after it is built.
+    Exposes the same attributes the visualizer reads on MazeGenerator.
+    """
+
+    width: int
+    height: int
+    seed: Optional[Union[int, str]]
+    entry: Tuple[int, int]
+    exit: Tuple[int, int]
+    perfect: bool
+    grid: Tuple[Tuple[int, ...], ...]
+    mold_positions: MoldMask         # Shared, read-only
+    solution: str
+    rng_mode: str = "mt"
+    braid_loops: Optional[int] = None
+    dead_end_ratio: Optional[float] = None
+    mold_scale: int = 1
+
+    @classmethod
+    def from_generator(
+        cls, maze: MazeGenerator, solution: str
+    ) -> "MazeSnapshot":
+        """Freezes an already generated MazeGenerator."""
+        return cls(
+            width=maze.width,
+            height=maze.height,
+            seed=maze.seed,
+            entry=maze.entry,
+            exit=maze.exit,
+            perfect=maze.perfect,
+            grid=tuple(tuple(row) for row in maze.grid),
+            mold_positions=maze.mold_positions,
+            solution=solution,
+            rng_mode=maze.rng_mode,
+            braid_loops=maze.braid_loops,
+            dead_end_ratio=maze.dead_end_ratio,
+            mold_scale=maze.mold_scale,
+        )
+
+    @classmethod
+    def build(
+        cls,
+        width: int,
+        height: int,
+        entry: Tuple[int, int],
+        exit: Tuple[int, int],
+        perfect: bool,
+        seed: Optional[Union[int, str]],
+        rng_mode: str = "mt",
+        braid_loops: Optional[int] = None,
+        dead_end_ratio: Optional[float] = None,
+        mold_scale: int = 1,
+    ) -> "MazeSnapshot":
+        """Generates and solves a brand new maze (no shared state)."""
+        maze = MazeGenerator(
+            width=width,
+            height=height,
+            seed=seed,
+            entry=entry,
+            exit=exit,
+            output_file=os.devnull,
+            perfect=perfect,
+            rng_mode=rng_mode,
+            braid_loops=braid_loops,
+            dead_end_ratio=dead_end_ratio,
+            mold_scale=mold_scale,
+        )
+        maze.generate()
+        return cls.from_generator(maze, solve(maze.grid, entry, exit))
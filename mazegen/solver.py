@@ -1,11 +1,61 @@
 #!/usr/bin/env python3
-from typing import Tuple, List
+import sys
+from typing import Dict, Generator, Optional, Sequence, Tuple, List
 from collections import deque
 
+from .checkpoint import Checkpointer, SolveState
+from .ondisk import MovesBuffer
+from .progress import ProgressReporter
+
+# Directions mapping: (row_delta, col_delta, wall_bit, move_char)
+# North (1): r-1 | East (2): c+1 | South (4): r+1 | West (8): c-1
+# IMPORTANT: The bit must match the wall we want to CROSS.
+DIRECTIONS = [
+    (-1, 0, 1, "N"),  # North: bit 1
+    (0, 1, 2, "E"),  # East:  bit 2
+    (1, 0, 4, "S"),  # South: bit 4
+    (0, -1, 8, "W"),  # West:  bit 8
+]
+
+# One search step: (kind, row, col) with kind 'expand' or 'frontier'
+SearchStep = Tuple[str, int, int]
+
+
+class SolverWorkspace:
+    """
+    BFS buffers kept between solves of same-sized mazes: the per-cell
+    moves array is cleared with one bulk copy instead of reallocated,
+    and the queue object is reused.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.size: int = width * height
+        self.moves: bytearray = bytearray(self.size)
+        self.queue: deque[Tuple[int, int]] = deque()
+        # bytes(n) is calloc'd: zero pages cost no memory until read
+        self._zeros = bytes(self.size)
+
+    def take(self, size: int) -> bytearray:
+        """The cleared moves array (reallocated if the size changed)."""
+        if size != self.size:
+            self.size = size
+            self.moves = bytearray(size)
+            self._zeros = bytes(size)
+        else:
+            self.moves[:] = self._zeros
+        self.queue.clear()
+        return self.moves
+
 
 def solve(
-        grid: List[List[int]],
-        start: Tuple[int, int], end: Tuple[int, int]) -> str:
+        grid: Sequence[Sequence[int]],
+        start: Tuple[int, int], end: Tuple[int, int],
+        stats: Optional[Dict[str, int]] = None,
+        progress: Optional[ProgressReporter] = None,
+        checkpoint: Optional[Checkpointer] = None,
+        resume: Optional[SolveState] = None,
+        scratch: Optional[MovesBuffer] = None,
+        workspace: Optional[SolverWorkspace] = None) -> str:
     """
     Find the shortest path using BFS.
     Receive the matrix generated.
@@ -14,9 +64,64 @@ def solve(
         grid:  The maze matrix [row][col].
         start: Entry coordinates as (row, col).
         end:   Exit coordinates as (row, col).
+        stats: Optional dict filled with 'nodes_expanded' and
+               'peak_queue'.
+        progress: Optional ProgressReporter (expanded cells); raises
+               Cancelled if its token is cancelled.
+        checkpoint: Optional Checkpointer saving the BFS periodically.
+        resume: Checkpointed BFS state to go on from.
+        scratch: Zero-filled buffer of width * height bytes for the
+               BFS moves (e.g. ondisk.mapped_buffer()); default: a
+               new bytearray.
+        workspace: Optional SolverWorkspace whose buffers are reused
+               (instead of 'scratch' and a new queue).
     Returns:
         str:   Direction string (e.g. 'EESNW').
     """
+    steps = iter_solve(grid, start, end, stats, progress, checkpoint,
+                       resume, scratch, workspace)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            path: Optional[str] = done.value
+            break
+
+    if path is None:
+        # If no path is found
+        # It means the maze generation or the coordinates are wrong
+        print("[ERROR] No valid path found. Check boundary walls.")
+        return ""
+    return path
+
+
+def iter_solve(
+        grid: Sequence[Sequence[int]],
+        start: Tuple[int, int], end: Tuple[int, int],
+        stats: Optional[Dict[str, int]] = None,
+        progress: Optional[ProgressReporter] = None,
+        checkpoint: Optional[Checkpointer] = None,
+        resume: Optional[SolveState] = None,
+        scratch: Optional[MovesBuffer] = None,
+        workspace: Optional[SolverWorkspace] = None
+) -> Generator[SearchStep, None, Optional[str]]:
+    """
+    Step-wise BFS: same path as solve(), one event at a time.
+
+    Yields:
+        ('expand', row, col)   cell taken out of the queue,
+        ('frontier', row, col) cell discovered and queued.
+    Returns:
+        str: The direction string ('' if start == end),
+             or None when the exit cannot be reached.
+    If given, 'stats' receives 'nodes_expanded' and 'peak_queue' and
+    'progress' is told about expanded cells (the total is the cell
+    count, an upper bound: the search stops at the exit). 'checkpoint'
+    saves the search between two expansions; 'resume' (one of those
+    saves) continues it, with the same result. 'scratch' replaces the
+    per-cell moves bytearray and 'workspace' both it and the queue
+    (see solve()).
+    """
     # Safety check for empty grid
     height = len(grid)
     if height == 0:
@@ -27,39 +132,118 @@ def solve(
     start_r, start_c = start
     end_r, end_c = end
 
-    # Queue stores: (current_row, current_col, path_string)
-    # Positions I have yet to explore
-    queue: deque[Tuple[int, int, str]] = deque([(start_r, start_c, "")])
-    visited: set[Tuple[int, int]] = {(start_r, start_c)}
-
-    # Directions mapping: (row_delta, col_delta, wall_bit, move_char)
-    # North (1): r-1 | East (2): c+1 | South (4): r+1 | West (8): c-1
-    # IMPORTANT: The bit must match the wall we want to CROSS.
-    directions = [
-        (-1, 0, 1, "N"),  # North: bit 1
-        (0, 1, 2, "E"),  # East:  bit 2
-        (1, 0, 4, "S"),  # South: bit 4
-        (0, -1, 8, "W"),  # West:  bit 8
-    ]
+    # Instead of carrying a path string per queued cell, remember the
+    # move used to reach each cell (index in DIRECTIONS + 1, 0 = unseen)
+    # and rebuild the path once at the end.
+    queue: deque[Tuple[int, int]]
+    if workspace is not None:
+        came_from: MovesBuffer = workspace.take(width * height)
+        queue = workspace.queue
+    else:
+        came_from = scratch if scratch is not None else bytearray(
+            width * height)
+        queue = deque()
+    came_from[start_r * width + start_c] = 255
+    queue.append((start_r, start_c))
+    expanded, peak_queue = 0, 1
+    if resume is not None:
+        came_from[:] = resume.came_from
+        queue = deque(divmod(pos, width) for pos in resume.queue)
+        expanded, peak_queue = resume.expanded, resume.peak_queue
+    next_tick = sys.maxsize
+    if progress is not None:
+        next_tick = progress.begin("solve", width * height)
+    next_save = sys.maxsize
+    if checkpoint is not None:
+        next_save = checkpoint.begin(expanded)
 
     while queue:
-        row, col, path = queue.popleft()
+        if expanded >= next_save and checkpoint is not None:
+            next_save = checkpoint.solver(
+                came_from, queue, expanded, peak_queue)
+        row, col = queue.popleft()
+        expanded += 1
+        if expanded >= next_tick and progress is not None:
+            next_tick = progress.tick(expanded)
+        yield ("expand", row, col)
 
         # Check if target reached
         if (row, col) == (end_r, end_c):
-            return path
+            if stats is not None:
+                stats.update(nodes_expanded=expanded, peak_queue=peak_queue)
+            if progress is not None:
+                progress.finish(expanded)
+            return _rebuild_path(came_from, width, start, end)
 
-        for dr, dc, bit, char in directions:
+        for i, (dr, dc, bit, _) in enumerate(DIRECTIONS):
             nr, nc = row + dr, col + dc
 
             # Check map boundaries
             if 0 <= nr < height and 0 <= nc < width:
                 # Check if the wall in THAT direction is open (bit is 0)
-                if not (grid[row][col] & bit) and (nr, nc) not in visited:
-                    visited.add((nr, nc))
-                    queue.append((nr, nc, path + char))
-
-    # If no path is found
-    # It means the maze generation or the coordinates are wrong
-    print("[ERROR] No valid path found. Check boundary walls.")
-    return ""
+                if not (grid[row][col] & bit) and (
+                        not came_from[nr * width + nc]):
+                    came_from[nr * width + nc] = i + 1
+                    queue.append((nr, nc))
+                    if len(queue) > peak_queue:
+                        peak_queue = len(queue)
+                    yield ("frontier", nr, nc)
+
+    if stats is not None:
+        stats.update(nodes_expanded=expanded, peak_queue=peak_queue)
+    if progress is not None:
+        progress.finish(expanded)
+    return None
+
+
+def solve_packed(
+        cells: Sequence[int], width: int, height: int,
+        start: Tuple[int, int], end: Tuple[int, int]) -> Optional[str]:
+    """
+    BFS over a flat grid (cells[row * width + col]), e.g. a bytes
+    object or a shared memory view. Same path as solve(), but without
+    per-step events or row lookups, for batch queries.
+
+    Returns:
+        str: The direction string, or None when the exit is unreachable.
+    """
+    start_i = start[0] * width + start[1]
+    end_i = end[0] * width + end[1]
+    size = width * height
+    came_from = bytearray(size)
+    came_from[start_i] = 255
+    # Flat index steps, in DIRECTIONS order (ties break the same way)
+    steps = [(-width, 1), (1, 2), (width, 4), (-1, 8)]
+    queue: deque[int] = deque([start_i])
+
+    while queue:
+        pos = queue.popleft()
+        if pos == end_i:
+            return _rebuild_path(came_from, width, start, end)
+        walls = cells[pos]
+        col = pos % width
+        for i, (step, bit) in enumerate(steps):
+            if walls & bit:
+                continue
+            nxt = pos + step
+            # Open border walls (entry / exit) must not wrap around
+            if (not 0 <= nxt < size or (bit == 2 and col == width - 1)
+                    or (bit == 8 and col == 0)):
+                continue
+            if not came_from[nxt]:
+                came_from[nxt] = i + 1
+                queue.append(nxt)
+    return None
+
+
+def _rebuild_path(
+        came_from: MovesBuffer, width: int,
+        start: Tuple[int, int], end: Tuple[int, int]) -> str:
+    """Walks the recorded moves back from the exit to the entry."""
+    moves: List[str] = []
+    r, c = end
+    while (r, c) != start:
+        dr, dc, _, char = DIRECTIONS[came_from[r * width + c] - 1]
+        moves.append(char)
+        r, c = r - dr, c - dc
+    return "".join(reversed(moves))
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
-from typing import Dict, Any
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
 import sys
 
+from .mask import STENCIL_42, blocked_cell, scaled_mask
+from .pathcodec import SOLUTION_FORMATS, PackedPath, read_line
+from .rng import RNG_MODES
+
 """
 This module provides functions to read and parse a configurate file.
 The configuration file should have key=value pairs, optionally with comments
@@ -42,30 +47,76 @@ def get_raw_config(file_path: str) -> Dict[str, str]:
     return raw_data
 
 
+def convert_value(key: str, value: str) -> Any:
+    """
+    Converts a string value to the appropriate Python type based on
+    the key.
+
+    Raises:
+        ValueError: The value is not valid for this key.
+    """
+    value = value.replace("'", "").replace('"', "")
+
+    if key in ("WIDTH", "HEIGHT"):
+        n = int(value)
+        if n <= 0:
+            raise ValueError(f"{key} must be a positive number")
+        return n
+    elif key == "PREFETCH":
+        n = int(value)
+        if n < 0:
+            raise ValueError(f"{key} must be zero or positive")
+        return n
+    elif key in ("ENTRY", "EXIT"):
+        parts = value.split(",")
+        if len(parts) != 2:
+            raise ValueError(f"Invalid value for {key}: {value}")
+        return (int(parts[1]), int(parts[0]))
+    elif key == "BRAID_LOOPS":
+        n = int(value)
+        if n < 0:
+            raise ValueError(f"{key} must be zero or positive")
+        return n
+    elif key == "DEAD_END_RATIO":
+        ratio = float(value)
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError(f"{key} must be between 0 and 1")
+        return ratio
+    elif key == "RNG":
+        value = value.lower()
+        if value not in RNG_MODES:
+            raise ValueError(
+                f"RNG must be one of: {', '.join(RNG_MODES)}")
+        return value
+    elif key == "MOLD_SCALE":
+        # 'auto' (0): the largest '42' using a third of the maze
+        if value.lower() == "auto":
+            return 0
+        n = int(value)
+        if n < 1:
+            raise ValueError(f"{key} must be 'auto' or a positive number")
+        return n
+    elif key == "SOLUTION_FORMAT":
+        value = value.lower()
+        if value not in SOLUTION_FORMATS:
+            raise ValueError(
+                f"SOLUTION_FORMAT must be one of: "
+                f"{', '.join(SOLUTION_FORMATS)}")
+        return value
+    elif key == "PERFECT":
+        if value.lower() == "true":
+            return True
+        elif value.lower() == "false":
+            return False
+        else:
+            raise ValueError("PERFECT must be 'True' or 'False'")
+    return value
+
+
 def format_value(key: str, value: str) -> Any:
-    """Converts a string value to the appropriate
-    Python type based on the key."""
+    """convert_value() for the CLI: exits on a bad value."""
     try:
-        value = value.replace("'", "").replace('"', "")
-
-        if key in ("WIDTH", "HEIGHT"):
-            n = int(value)
-            if n <= 0:
-                raise ValueError(f"{key} must be a positive number")
-            return n
-        elif key in ("ENTRY", "EXIT"):
-            parts = value.split(",")
-            if len(parts) != 2:
-                raise ValueError(f"Invalid value for {key}: {value}")
-            return (int(parts[1]), int(parts[0]))
-        elif key == "PERFECT":
-            if value.lower() == "true":
-                return True
-            elif value.lower() == "false":
-                return False
-            else:
-                raise ValueError("PERFECT must be 'True' or 'False'")
-        return value
+        return convert_value(key, value)
     except ValueError as e:
         print(f"Error converting {key}='{value}': {e}")
         sys.exit(1)
@@ -96,6 +147,17 @@ def validate_logic(config: Dict[str, Any]) -> bool:
         raise ConfigError(
             f"Exit {exit_} out of bounds for {height}x{width}")
 
+    if "braid_loops" in config and "dead_end_ratio" in config:
+        raise ConfigError(
+            "BRAID_LOOPS and DEAD_END_RATIO cannot be used together")
+
+    # Same mask as MazeGenerator.draw_42 (MOLD_SCALE=auto included)
+    mold = scaled_mask(STENCIL_42, width, height,
+                       config.get("mold_scale", 1))
+    error = blocked_cell(mold, (("Entry", entry), ("Exit", exit_)))
+    if error is not None:
+        raise ConfigError(error)
+
     return True
 
 
@@ -111,6 +173,209 @@ def parse_config(file_path: str) -> Dict[str, Any]:
     return raw_data
 
 
+# Keys every job needs (validate_logic reads them)
+REQUIRED_KEYS = ("WIDTH", "HEIGHT", "ENTRY", "EXIT", "PERFECT")
+
+
+@dataclass
+class Job:
+    """One job of a manifest (see parse_manifest)."""
+
+    name: str
+    line: int                         # Line of its [name] header
+    config: Dict[str, Any] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+
+def _check_job(
+    job: Job, raw: Dict[str, Tuple[str, int]], outputs: Dict[str, str]
+) -> None:
+    """Converts and validates one job, collecting every error."""
+    for key, (value, line) in raw.items():
+        try:
+            job.config[key.lower()] = convert_value(key, value)
+        except ValueError as e:
+            job.errors.append(f"line {line}: {key}: {e}")
+    missing = [key for key in REQUIRED_KEYS if key not in raw]
+    if missing:
+        job.errors.append(f"missing {', '.join(missing)}")
+    if job.valid:
+        try:
+            validate_logic(job.config)
+        except ConfigError as e:
+            job.errors.append(str(e))
+    output = job.config.setdefault("output_file", f"{job.name}.txt")
+    if output in outputs:
+        job.errors.append(
+            f"OUTPUT_FILE {output} is also used by job {outputs[output]}")
+    else:
+        outputs[output] = job.name
+
+
+def parse_manifest(file_path: str) -> List[Job]:
+    """
+    Reads a manifest of several configurations in one pass:
+
+        # Shared by every job (before the first header)
+        WIDTH=20
+        HEIGHT=15
+        [small]
+        ENTRY=0,0
+        EXIT=19,14
+        PERFECT=True
+        [braided]
+        ...
+
+    A job is its [name] block on top of the shared keys; OUTPUT_FILE
+    defaults to '<name>.txt'. Unlike parse_config(), a bad value does
+    not end the process: it is recorded in that job's 'errors' and
+    the other jobs are still parsed.
+
+    Raises:
+        OSError: The manifest cannot be read.
+    """
+    jobs: List[Job] = []
+    names = set()
+    outputs: Dict[str, str] = {}
+    shared: Dict[str, Tuple[str, int]] = {}
+    shared_errors: List[str] = []
+    job: Optional[Job] = None
+    raw: Dict[str, Tuple[str, int]] = {}
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        for i, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("[") and line.endswith("]"):
+                if job is not None:
+                    _check_job(job, raw, outputs)
+                job = Job(line[1:-1].strip(), i, errors=list(shared_errors))
+                if not job.name:
+                    job.errors.append(f"line {i}: empty job name")
+                elif job.name in names:
+                    job.errors.append(
+                        f"line {i}: duplicate job name {job.name}")
+                names.add(job.name)
+                jobs.append(job)
+                raw = dict(shared)
+                continue
+            key, sep, value = line.partition("=")
+            key = key.strip()
+            if not sep or not key:
+                error = f"line {i}: expected KEY=VALUE: {line}"
+                (shared_errors if job is None else job.errors).append(error)
+            elif job is None:
+                shared[key] = (value.strip(), i)
+            else:
+                raw[key] = (value.strip(), i)
+    if job is not None:
+        _check_job(job, raw, outputs)
+    return jobs
+
+
+# Hex digit (ASCII) -> its value, used to decode a whole row at once
+# (anything else is rejected first: see HEX_CHARS)
+HEX_CHARS = b"0123456789abcdefABCDEF"
+HEX_VALUES = bytes(
+    int(chr(v), 16) if v in HEX_CHARS else 0 for v in range(256))
+
+
+def _read_coords(file_path: str, line: str) -> Tuple[int, int]:
+    """An 'X,Y' line, swapped to (row, col)."""
+    try:
+        x, y = line.split(",")
+        return int(y), int(x)
+    except ValueError:
+        raise ConfigError(f"{file_path}: bad entry/exit line {line!r}")
+
+
+def read_maze_file(file_path: str) -> Tuple[
+    List[bytes], Tuple[int, int], Tuple[int, int], str,
+    Optional[PackedPath]
+]:
+    """
+    The one parser of the files written by MazeGenerator.save_to_file
+    (load_maze_file and analytics.read_packed build on it).
+
+    Args:
+        file_path: Path of the hex-encoded maze file.
+    Returns:
+        tuple: (rows, entry, exit, solution line, packed): one bytes
+               object of wall bits per row, entry and exit as
+               (row, col), the raw solution line ('' if missing) and
+               its PackedPath (None for a plain direction string).
+    Raises:
+        OSError: The file cannot be read.
+        ConfigError: Any malformed part: non-hex digit, rows of
+                     different widths, missing or bad entry/exit line,
+                     bad packed solution.
+    """
+    with open(file_path, "rb") as file:
+        lines = file.read().split(b"\n")
+
+    rows: List[bytes] = []
+    i = 0
+    while i < len(lines) and lines[i].strip():
+        raw = lines[i].strip()
+        if raw.translate(None, HEX_CHARS):
+            raise ConfigError(
+                f"{file_path}: line {i + 1} has a non-hex character")
+        if rows and len(raw) != len(rows[0]):
+            raise ConfigError(
+                f"{file_path}: line {i + 1} has {len(raw)} cells, "
+                f"expected {len(rows[0])}")
+        rows.append(raw.translate(HEX_VALUES))
+        i += 1
+    if not rows:
+        raise ConfigError(f"{file_path} does not contain a maze grid")
+
+    # Skip the separator line, then the entry, exit and solution lines
+    try:
+        tail = [line.strip().decode("ascii") for line in lines[i + 1:]]
+    except UnicodeDecodeError:
+        raise ConfigError(f"{file_path}: non-ASCII text after the grid")
+    if len(tail) < 2 or not tail[1]:
+        raise ConfigError(f"{file_path} is missing entry/exit lines")
+    entry = _read_coords(file_path, tail[0])
+    exit = _read_coords(file_path, tail[1])
+
+    line = tail[2] if len(tail) > 2 else ""
+    try:
+        packed = read_line(line)
+    except ValueError as e:
+        raise ConfigError(f"{file_path}: bad packed solution: {e}")
+    return rows, entry, exit, line, packed
+
+
+def load_maze_file(file_path: str) -> Dict[str, Any]:
+    """
+    Reads a maze written by MazeGenerator.save_to_file back into memory.
+
+    Args:
+        file_path: Path of the hex-encoded maze file.
+    Returns:
+        dict: 'grid' [row][col], 'entry' and 'exit' as (row, col),
+              the 'solution' string (empty if missing, decoded if
+              packed) and 'moves', the same moves to iterate: a lazy
+              PackedPath for a packed file.
+    Raises:
+        OSError, ConfigError: See read_maze_file.
+    """
+    rows, entry, exit, line, packed = read_maze_file(file_path)
+    return {
+        "grid": [list(row) for row in rows],
+        "entry": entry,
+        "exit": exit,
+        "solution": line if packed is None else str(packed),
+        "moves": line if packed is None else packed,
+    }
+
+
 # if __name__ == "__main__":
 #     # Quick test to see if it works
 #     config = parse_config("../config.txt")
@@ -9,6 +9,37 @@ import os
 
 class Mlx:
 
+# C signatures: name -> (argtypes, restype). Bound once in __init__,
+#  setting them again on every call is pure ctypes overhead.
+# Hook functions are not listed: their argtypes depend on the callback
+#  type and they are only called when registering a callback.
+  _SIGNATURES = {
+    "mlx_init": ([], c_void_p),
+    "mlx_release": ([c_void_p], c_int),
+    "mlx_new_window": ([c_void_p, c_uint, c_uint, c_char_p], c_void_p),
+    "mlx_clear_window": ([c_void_p, c_void_p], c_int),
+    "mlx_pixel_put": ([c_void_p, c_void_p, c_uint, c_uint, c_uint], c_int),
+    "mlx_destroy_window": ([c_void_p, c_void_p], c_int),
+    "mlx_new_image": ([c_void_p, c_uint, c_uint], c_void_p),
+    "mlx_get_data_addr": ([c_void_p, POINTER(c_uint), POINTER(c_uint), POINTER(c_uint)], POINTER(c_char)),
+    "mlx_put_image_to_window": ([c_void_p, c_void_p, c_void_p, c_int, c_int], c_int),
+    "mlx_destroy_image": ([c_void_p, c_void_p], c_int),
+    "mlx_loop": ([c_void_p], c_int),
+    "mlx_loop_exit": ([c_void_p], c_int),
+    "mlx_string_put": ([c_void_p, c_void_p, c_uint, c_uint, c_uint, c_char_p], c_int),
+    "mlx_xpm_file_to_image": ([c_void_p, c_char_p, c_void_p, c_void_p], c_void_p),
+    "mlx_png_file_to_image": ([c_void_p, c_char_p, c_void_p, c_void_p], c_void_p),
+    "mlx_mouse_hide": ([c_void_p], c_int),
+    "mlx_mouse_show": ([c_void_p], c_int),
+    "mlx_mouse_move": ([c_void_p, c_int, c_int], c_int),
+    "mlx_mouse_get_pos": ([c_void_p, c_void_p, c_void_p], c_int),
+    "mlx_do_key_autorepeatoff": ([c_void_p], c_int),
+    "mlx_do_key_autorepeaton": ([c_void_p], c_int),
+    "mlx_get_screen_size": ([c_void_p, POINTER(c_uint), POINTER(c_uint)], c_int),
+    "mlx_do_sync": ([c_void_p], c_int),
+    "mlx_sync": ([c_void_p, c_int, c_void_p], c_int),
+  }
+
   def __init__(self):
     module_dir = os.path.dirname(os.path.abspath(__file__))
     self.so_file = os.path.join(module_dir, "libmlx.so")
@@ -16,43 +47,42 @@ class Mlx:
     self._python_ref_std = {}
     self._python_ref_gen = {}
     self._img_height = {}
+    self._img_data = {}
+    self._bind()
+
+  def _bind(self):
+    # Keep each prepared function object as self._<name>
+    for name, (argtypes, restype) in self._SIGNATURES.items():
+      func = getattr(self.mlx_func, name, None)
+      if func is None:
+        continue  # symbol missing from this libmlx build
+      func.argtypes = argtypes
+      func.restype = restype
+      setattr(self, "_" + name, func)
     
 # Initialisation
   def mlx_init(self):
-    self.mlx_func.mlx_init.restype = c_void_p
-    return self.mlx_func.mlx_init()
+    return self._mlx_init()
 
   def mlx_release(self, mlx_ptr):
-    self.mlx_func.mlx_release.argtypes = [c_void_p]
-    self.mlx_func.mlx_release.restypes = [c_int]
-    return self.mlx_func.mlx_release(mlx_ptr)
+    return self._mlx_release(mlx_ptr)
 
 # Windows
   def mlx_new_window(self, mlx_ptr, width, height, title):
-    self.mlx_func.mlx_new_window.argtypes = [c_void_p, c_uint, c_uint, c_char_p]
-    self.mlx_func.mlx_new_window.restype = c_void_p
-    return self.mlx_func.mlx_new_window(mlx_ptr, width, height, title.encode('utf-8'))
+    return self._mlx_new_window(mlx_ptr, width, height, title.encode('utf-8'))
 
   def mlx_clear_window(self, mlx_ptr, win_ptr):
-    self.mlx_func.mlx_clear_window.argtypes = [c_void_p, c_void_p]
-    self.mlx_func.mlx_clear_window.restype = c_int
-    return self.mlx_func.mlx_clear_window(mlx_ptr, win_ptr)
+    return self._mlx_clear_window(mlx_ptr, win_ptr)
 
   def mlx_pixel_put(self, mlx_ptr, win_ptr, x, y, color):
-    self.mlx_func.mlx_pixel_put.argtypes = [c_void_p, c_void_p, c_uint, c_uint, c_uint]
-    self.mlx_func.mlx_pixel_put.restype = c_int
-    return self.mlx_func.mlx_pixel_put(mlx_ptr, win_ptr, x, y, color)
+    return self._mlx_pixel_put(mlx_ptr, win_ptr, x, y, color)
 
   def mlx_destroy_window(self, mlx_ptr, win_ptr):
-    self.mlx_func.mlx_destroy_window.argtypes = [c_void_p, c_void_p]
-    self.mlx_func.mlx_destroy_window.restype = c_int
-    return self.mlx_func.mlx_destroy_window(mlx_ptr, win_ptr)
+    return self._mlx_destroy_window(mlx_ptr, win_ptr)
 
 # Images
   def mlx_new_image(self, mlx_ptr, width, height):
-    self.mlx_func.mlx_new_image.argtypes = [c_void_p, c_uint, c_uint]
-    self.mlx_func.mlx_new_image.restype = c_void_p
-    ret = self.mlx_func.mlx_new_image(mlx_ptr, width, height)
+    ret = self._mlx_new_image(mlx_ptr, width, height)
     if ret is not None:
       self._img_height[str(ret)] = height
     return ret
@@ -63,37 +93,80 @@ class Mlx:
     size_line = c_uint()
     theformat = c_uint()
     data = POINTER(c_char)
-    self.mlx_func.mlx_get_data_addr.argtypes = [c_void_p, POINTER(c_uint), POINTER(c_uint), POINTER(c_uint)]
-    self.mlx_func.mlx_get_data_addr.restype = POINTER(c_char)
-    data = self.mlx_func.mlx_get_data_addr(img_ptr, byref(bits_per_pixel), byref(size_line), byref(theformat))
+    data = self._mlx_get_data_addr(img_ptr, byref(bits_per_pixel), byref(size_line), byref(theformat))
     data_array = c_char * (self._img_height[str(img_ptr)] * size_line.value)
     data_view = data_array.from_address(addressof(data.contents))
-    return (memoryview(data_view).cast('B'), bits_per_pixel.value, size_line.value, theformat.value)
+    view = memoryview(data_view).cast('B')
+    self._img_data[str(img_ptr)] = (view, bits_per_pixel.value, size_line.value)
+    return (view, bits_per_pixel.value, size_line.value, theformat.value)
 
   def mlx_put_image_to_window(self, mlx_ptr, win_ptr, img_ptr, x, y):
-    self.mlx_func.mlx_put_image_to_window.argtypes = [c_void_p, c_void_p, c_void_p, c_int, c_int]
-    self.mlx_func.mlx_put_image_to_window.restype = c_int
-    return self.mlx_func.mlx_put_image_to_window(mlx_ptr, win_ptr, img_ptr, x, y)
+    return self._mlx_put_image_to_window(mlx_ptr, win_ptr, img_ptr, x, y)
 
   def mlx_destroy_image(self, mlx_ptr, img_ptr):
     self._img_height.pop(str(img_ptr))
-    self.mlx_func.mlx_destroy_image.argtypes = [c_void_p, c_void_p]
-    self.mlx_func.mlx_destroy_image.restype = c_int
-    return self.mlx_func.mlx_destroy_image(mlx_ptr, img_ptr)
+    self._img_data.pop(str(img_ptr), None)
+    return self._mlx_destroy_image(mlx_ptr, img_ptr)
+
+# Bulk helpers (Python side, no C call per pixel)
+# They work on the buffer returned by mlx_get_data_addr for img_ptr,
+#  which must have been called once before.
+
+  def _img_geometry(self, img_ptr):
+    view, bpp, size_line = self._img_data[str(img_ptr)]
+    return view, bpp // 8, size_line, self._img_height[str(img_ptr)]
+
+  def mlx_fill_rect(self, img_ptr, x, y, width, height, color):
+    view, bytes_pp, size_line, img_h = self._img_geometry(img_ptr)
+    x0, y0 = max(x, 0), max(y, 0)
+    x1 = min(x + width, size_line // bytes_pp)
+    y1 = min(y + height, img_h)
+    if x0 >= x1 or y0 >= y1:
+      return 0
+    pixel = (color | 0xFF000000).to_bytes(4, 'little')[:bytes_pp]
+    row = pixel * (x1 - x0)
+    for yy in range(y0, y1):
+      pos = yy * size_line + x0 * bytes_pp
+      view[pos:pos + len(row)] = row
+    return 0
+
+  def mlx_blit(self, img_ptr, buf, buf_width, buf_height, x=0, y=0):
+    # buf: bytes-like, buf_height rows of buf_width pixels, same pixel
+    #  format as the image (rows are clipped to the image)
+    view, bytes_pp, size_line, img_h = self._img_geometry(img_ptr)
+    src = memoryview(buf).cast('B')
+    src_line = buf_width * bytes_pp
+    x0 = max(x, 0)
+    skip = (x0 - x) * bytes_pp
+    n = min(src_line - skip, size_line - x0 * bytes_pp)
+    if n <= 0:
+      return 0
+    for row in range(max(0, -y), min(buf_height, img_h - y)):
+      pos = (y + row) * size_line + x0 * bytes_pp
+      start = row * src_line + skip
+      view[pos:pos + n] = src[start:start + n]
+    return 0
+
+  def mlx_new_double_buffer(self, mlx_ptr, width, height):
+    return MlxDoubleBuffer(self, mlx_ptr, width, height)
+
+  def mlx_put_images_to_window(self, mlx_ptr, win_ptr, images):
+    # images: iterable of (img_ptr, x, y), pushed in order
+    put = self._mlx_put_image_to_window
+    ret = 0
+    for img_ptr, x, y in images:
+      ret = put(mlx_ptr, win_ptr, img_ptr, x, y)
+    return ret
 
 # Events & main loop
 # Note: Python can't catch C^-C from keyboard during mlx_loop execution.
 #  Use C^-\ to kill your program.
 
   def mlx_loop(self, mlx_ptr):
-    self.mlx_func.mlx_loop.argtypes = [c_void_p]
-    self.mlx_func.mlx_loop.restype = c_int
-    return self.mlx_func.mlx_loop(mlx_ptr)
+    return self._mlx_loop(mlx_ptr)
 
   def mlx_loop_exit(self, mlx_ptr):
-    self.mlx_func.mlx_loop_exit.argtypes = [c_void_p]
-    self.mlx_func.mlx_loop_exit.restype = c_int
-    return self.mlx_func.mlx_loop_exit(mlx_ptr)
+    return self._mlx_loop_exit(mlx_ptr)
 
   def mlx_mouse_hook(self, win_ptr, callback, param):
     self.mlx_func.mlx_mouse_hook.restype = c_int
@@ -179,17 +252,13 @@ class Mlx:
 # Misc.
 
   def mlx_string_put(self, mlx_ptr, win_ptr, x, y, color, string):
-    self.mlx_func.mlx_string_put.argtypes = [c_void_p, c_void_p, c_uint, c_uint, c_uint, c_char_p]
-    self.mlx_func.mlx_string_put.restype = c_int
-    return self.mlx_func.mlx_string_put(mlx_ptr, win_ptr, x, y, color, string.encode('utf-8'))
+    return self._mlx_string_put(mlx_ptr, win_ptr, x, y, color, string.encode('utf-8'))
 
 # API break, returns tuple
   def mlx_xpm_file_to_image(self, mlx_ptr, filename):
     width = c_uint()
     height = c_uint()
-    self.mlx_func.mlx_xpm_file_to_image.argtypes = [c_void_p, c_char_p, c_void_p, c_void_p]
-    self.mlx_func.mlx_xpm_file_to_image.restype = c_void_p
-    img = self.mlx_func.mlx_xpm_file_to_image(mlx_ptr, filename.encode('utf8'), byref(width), byref(height))
+    img = self._mlx_xpm_file_to_image(mlx_ptr, filename.encode('utf8'), byref(width), byref(height))
     if img is not None:
       self._img_height[str(img)] = height.value
     return (img, width.value, height.value)
@@ -198,9 +267,7 @@ class Mlx:
   def mlx_png_file_to_image(self, mlx_ptr, filename):
     width = c_uint()
     height = c_uint()
-    self.mlx_func.mlx_png_file_to_image.argtypes = [c_void_p, c_char_p, c_void_p, c_void_p]
-    self.mlx_func.mlx_png_file_to_image.restype = c_void_p
-    img = self.mlx_func.mlx_png_file_to_image(mlx_ptr, filename.encode('utf8'), byref(width), byref(height))
+    img = self._mlx_png_file_to_image(mlx_ptr, filename.encode('utf8'), byref(width), byref(height))
     if img is not None:
       self._img_height[str(img)] = height.value
     return (img, width.value, height.value)
@@ -210,59 +277,109 @@ class Mlx:
 #			  unsigned int *width, unsigned int *height);
 
   def mlx_mouse_hide(self, mlx_ptr):
-    self.mlx_func.mlx_mouse_hide.argtypes = [c_void_p]
-    self.mlx_func.mlx_mouse_hide.restype = c_int
-    return self.mlx_func.mlx_mouse_hide(mlx_ptr)
+    return self._mlx_mouse_hide(mlx_ptr)
 
   def mlx_mouse_show(self, mlx_ptr):
-    self.mlx_func.mlx_mouse_show.argtypes = [c_void_p]
-    self.mlx_func.mlx_mouse_show.restype = c_int
-    return self.mlx_func.mlx_mouse_show(mlx_ptr)
+    return self._mlx_mouse_show(mlx_ptr)
 
   def mlx_mouse_move(self, mlx_ptr, x, y):
-    self.mlx_func.mlx_mouse_move.argtypes = [c_void_p, c_int, c_int]
-    self.mlx_func.mlx_mouse_move.restype = c_int
-    return self.mlx_func.mlx_mouse_move(mlx_ptr, x, y)
+    return self._mlx_mouse_move(mlx_ptr, x, y)
 
 # API break, returns tuple
   def mlx_mouse_get_pos(self, mlx_ptr):
     x = c_int()
     y = c_int()
-    self.mlx_func.mlx_mouse_get_pos.argtypes = [c_void_p, c_void_p, c_void_p]
-    self.mlx_func.mlx_mouse_get_pos.restype = c_int
-    val = self.mlx_func.mlx_mouse_get_pos(mlx_ptr, byref(x), byref(y))
+    val = self._mlx_mouse_get_pos(mlx_ptr, byref(x), byref(y))
     return (val, x.value, y.value)
 
   def mlx_do_key_autorepeatoff(self, mlx_ptr):
-    self.mlx_func.mlx_do_key_autorepeatoff.argtypes = [c_void_p]
-    self.mlx_func.mlx_do_key_autorepeatoff.restype = c_int
-    return self.mlx_func.mlx_do_key_autorepeatoff(mlx_ptr)
+    return self._mlx_do_key_autorepeatoff(mlx_ptr)
 
   def mlx_do_key_autorepeaton(self, mlx_ptr):
-    self.mlx_func.mlx_do_key_autorepeaton.argtypes = [c_void_p]
-    self.mlx_func.mlx_do_key_autorepeaton.restype = c_int
-    return self.mlx_func.mlx_do_key_autorepeaton(mlx_ptr)
+    return self._mlx_do_key_autorepeaton(mlx_ptr)
 
 # API break, returns tuple
   def mlx_get_screen_size(self, mlx_ptr):
     w = c_uint()
     h = c_uint()
-    self.mlx_func.mlx_get_screen_size.argtypes = [c_void_p, POINTER(c_uint), POINTER(c_uint)]
-    self.mlx_func.mlx_get_screen_size.restype = c_int
-    val = self.mlx_func.mlx_get_screen_size(mlx_ptr, byref(w), byref(h))
+    val = self._mlx_get_screen_size(mlx_ptr, byref(w), byref(h))
     return (val, w.value, h.value)
 
 # Sync funct
   def mlx_do_sync(self, mlx_ptr):
-    self.mlx_func.mlx_do_sync.argtypes = [c_void_p]
-    self.mlx_func.mlx_do_sync.restype = c_int
-    return self.mlx_func.mlx_do_sync(mlx_ptr)
+    return self._mlx_do_sync(mlx_ptr)
 
   def mlx_sync(self, mlx_ptr, cmd, img_or_win_ptr):
-    self.mlx_func.mlx_sync.argtypes = [c_void_p, c_int, c_void_p]
-    self.mlx_func.mlx_sync.restype = c_int
-    return self.mlx_func.mlx_sync(mlx_ptr, cmd, img_or_win_ptr)
+    return self._mlx_sync(mlx_ptr, cmd, img_or_win_ptr)
 
   SYNC_IMAGE_WRITABLE = 1
   SYNC_WIN_FLUSH = 2
   SYNC_WIN_COMPLETED = 3
+
+
+# Double buffering on top of mlx_new_image / mlx_get_data_addr.
+# Draw into the back image, then present(): back and front are swapped
+#  and the new front is pushed to the window, so a half drawn frame is
+#  never shown.
+# Each image is exposed twice:
+#  data   -> bytes view ('B'), line = bytes per row
+#  pixels -> 32-bit view ('I'), stride = pixels per row, one store per
+#            pixel: pixels[y * stride + x] = 0xAARRGGBB
+
+class MlxDoubleBuffer:
+
+  def __init__(self, mlx, mlx_ptr, width, height):
+    self.mlx = mlx
+    self.mlx_ptr = mlx_ptr
+    self.width = width
+    self.height = height
+    self.images = []
+    self.datas = []
+    self.views = []
+    for _ in range(2):
+      img = mlx.mlx_new_image(mlx_ptr, width, height)
+      data, bpp, line, _ = mlx.mlx_get_data_addr(img)
+      if bpp != 32:
+        raise ValueError(f"32 bits per pixel expected, got {bpp}")
+      self.images.append(img)
+      self.datas.append(data)
+      self.views.append(data.cast('I'))
+    self.line = line
+    self.stride = line // 4
+    self.back = 0
+
+  @property
+  def back_img(self):
+    return self.images[self.back]
+
+  @property
+  def front_img(self):
+    return self.images[1 - self.back]
+
+  @property
+  def data(self):
+    return self.datas[self.back]
+
+  @property
+  def pixels(self):
+    return self.views[self.back]
+
+  def swap(self):
+    self.back = 1 - self.back
+
+  def present(self, win_ptr, x=0, y=0, keep=True):
+    # keep=True copies the shown frame into the new back image so
+    #  renderers can keep drawing only what changed
+    self.swap()
+    ret = self.mlx.mlx_put_image_to_window(
+      self.mlx_ptr, win_ptr, self.front_img, x, y)
+    if keep:
+      self.views[self.back][:] = self.views[1 - self.back]
+    return ret
+
+  def destroy(self):
+    for img in self.images:
+      self.mlx.mlx_destroy_image(self.mlx_ptr, img)
+    self.images = []
+    self.datas = []
+    self.views = []
@@ -0,0 +1,88 @@
+# Micro-benchmark: per-call ctypes overhead and bulk drawing helpers.
+# Runs without X11 / libmlx.so:
+#  - C call cost is measured on libc labs(), old style (argtypes and
+#    restype set on every call, like the former wrapper) vs prebound.
+#  - Drawing cost is measured on a plain buffer: 4 byte stores per
+#    pixel vs Mlx.mlx_fill_rect / Mlx.mlx_blit row copies.
+# Usage: python3 mlx_source/test/bench_calls.py
+
+import os
+import sys
+import timeit
+from ctypes import CDLL, c_long
+from ctypes.util import find_library
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mlx import Mlx  # noqa: E402
+
+N = 200000
+
+libc = CDLL(find_library("c"))
+
+
+def old_call():
+  libc.labs.argtypes = [c_long]
+  libc.labs.restype = c_long
+  return libc.labs(-42)
+
+
+bound = CDLL(find_library("c")).labs
+bound.argtypes = [c_long]
+bound.restype = c_long
+
+
+def new_call():
+  return bound(-42)
+
+
+def report(name, old, new, n):
+  print(f"{name:<24} old {old / n * 1e9:9.1f} ns   new {new / n * 1e9:9.1f} ns"
+        f"   x{old / new:5.1f}")
+
+
+report("C call (labs)", timeit.timeit(old_call, number=N),
+       timeit.timeit(new_call, number=N), N)
+
+# Fake image: Mlx object without libmlx.so, buffer registered by hand
+W, H = 800, 600
+m = Mlx.__new__(Mlx)
+buf = bytearray(W * H * 4)
+m._img_height = {"img": H}
+m._img_data = {"img": (memoryview(buf), 32, W * 4)}
+
+
+def old_fill():
+  # What MazeVisualizer.put_pixel did for a 25x25 tile
+  for i in range(25):
+    for j in range(25):
+      pos = (j * W * 4) + (i * 4)
+      buf[pos] = 0x33
+      buf[pos + 1] = 0x33
+      buf[pos + 2] = 0x33
+      buf[pos + 3] = 255
+
+
+def new_fill():
+  m.mlx_fill_rect("img", 0, 0, 25, 25, 0x333333)
+
+
+R = 2000
+report("25x25 tile fill", timeit.timeit(old_fill, number=R),
+       timeit.timeit(new_fill, number=R), R)
+
+src = bytes(W * H * 4)
+
+
+def old_blit():
+  for y in range(H):
+    for x in range(0, W * 4, 4):
+      pos = y * W * 4 + x
+      buf[pos:pos + 4] = src[pos:pos + 4]
+
+
+def new_blit():
+  m.mlx_blit("img", src, W, H)
+
+
+report("800x600 blit", timeit.timeit(old_blit, number=3),
+       timeit.timeit(new_blit, number=3), 3)
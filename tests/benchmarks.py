@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the hot paths (generate, solve, save, parse, draw).
+
+    python3 -m tests.benchmarks run [--sizes 31,101] [--out bench.json]
+    python3 -m tests.benchmarks compare baseline.json bench.json
+
+'run' records wall time, peak memory and cells per second as JSON.
+'compare' exits with status 1 when a benchmark got slower than the
+baseline by more than --threshold (default 15%).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from mazegen.generator import MazeGenerator
+from mazegen.graph import CorridorGraph
+from mazegen.pathcodec import pack_path, unpack_path
+from mazegen.solver import SolverWorkspace, solve
+from mazegen.utils import parse_config
+
+SEED = 42
+SIZES = [31, 101, 301, 1001, 2001, 4000]
+
+# Scratch files (output mazes, configs), removed at interpreter exit
+_TMP = tempfile.TemporaryDirectory(prefix="maze_bench_")
+
+# A benchmark prepares its inputs (untimed) and returns the callable to
+# time: setup(size) -> (function, cells processed per call)
+Setup = Callable[[int], Tuple[Callable[[], Any], int]]
+
+
+def _new_maze(
+    size: int, perfect: bool = True, **options: Any
+) -> MazeGenerator:
+    """
+    Fresh, not yet generated maze with fixed seed and corners
+    ('options' go to MazeGenerator, e.g. rng_mode).
+    """
+    return MazeGenerator(
+        width=size,
+        height=size,
+        seed=SEED,
+        entry=(0, 0),
+        exit=(size - 1, size - 1),
+        output_file=os.devnull,
+        perfect=perfect,
+        **options,
+    )
+
+
+def _generated(size: int, perfect: bool = True) -> MazeGenerator:
+    maze = _new_maze(size, perfect)
+    maze.generate()
+    return maze
+
+
+def bench_generate_perfect(size: int) -> Tuple[Callable[[], Any], int]:
+    return (lambda: _new_maze(size, True).generate()), size * size
+
+
+def bench_generate_braid(size: int) -> Tuple[Callable[[], Any], int]:
+    return (lambda: _new_maze(size, False).generate()), size * size
+
+
+def bench_generate_counter(size: int) -> Tuple[Callable[[], Any], int]:
+    def run() -> None:
+        _new_maze(size, False, rng_mode="counter").generate()
+
+    return run, size * size
+
+
+def bench_generate_dead_ends(size: int) -> Tuple[Callable[[], Any], int]:
+    def run() -> None:
+        _new_maze(size, False, dead_end_ratio=0.05).generate()
+
+    return run, size * size
+
+
+def bench_regenerate(size: int) -> Tuple[Callable[[], Any], int]:
+    def run() -> None:
+        maze = _new_maze(size)
+        maze.generate()
+        solve(maze.grid, maze.entry, maze.exit)
+    return run, size * size
+
+
+def bench_regenerate_reset(size: int) -> Tuple[Callable[[], Any], int]:
+    """regenerate, in one generator and solver workspace reset in place."""
+    maze = _new_maze(size)
+    workspace = SolverWorkspace(size, size)
+
+    def run() -> None:
+        maze.reset(SEED)
+        maze.generate()
+        solve(maze.grid, maze.entry, maze.exit, workspace=workspace)
+    return run, size * size
+
+
+def bench_solve(size: int) -> Tuple[Callable[[], Any], int]:
+    maze = _generated(size)
+    return (lambda: solve(maze.grid, maze.entry, maze.exit)), size * size
+
+
+def bench_solve_graph(size: int) -> Tuple[Callable[[], Any], int]:
+    maze = _generated(size)
+    cells = b"".join(bytes(row) for row in maze.grid)
+    graph = CorridorGraph(cells, size, size)
+    return (lambda: graph.shortest_path(maze.entry, maze.exit)), size * size
+
+
+def bench_build_graph(size: int) -> Tuple[Callable[[], Any], int]:
+    maze = _generated(size)
+    cells = b"".join(bytes(row) for row in maze.grid)
+    return (lambda: CorridorGraph(cells, size, size)), size * size
+
+
+def bench_save_to_file(size: int) -> Tuple[Callable[[], Any], int]:
+    maze = _generated(size)
+    solution = solve(maze.grid, maze.entry, maze.exit)
+    maze.output_file = os.path.join(_TMP.name, f"maze_{size}.txt")
+    return (lambda: maze.save_to_file(solution)), size * size
+
+
+def bench_pack_path(size: int) -> Tuple[Callable[[], Any], int]:
+    maze = _generated(size)
+    solution = solve(maze.grid, maze.entry, maze.exit)
+    return (lambda: unpack_path(pack_path(solution))), size * size
+
+
+def bench_parse_config(size: int) -> Tuple[Callable[[], Any], int]:
+    path = os.path.join(_TMP.name, f"config_{size}.txt")
+    with open(path, "w") as f:
+        f.write(f"WIDTH={size}\nHEIGHT={size}\nENTRY=0,0\n"
+                f"EXIT={size - 1},{size - 1}\nOUTPUT_FILE=out.txt\n"
+                f"PERFECT=True\nSEED={SEED}\n")
+    # The file does not grow with the size: report calls, not cells
+    return (lambda: parse_config(path)), 1
+
+
+def bench_render_offscreen(size: int) -> Tuple[Callable[[], Any], int]:
+    from display.graphical import MazeVisualizer
+
+    maze = _generated(size)
+    solution = solve(maze.grid, maze.entry, maze.exit)
+    vis = MazeVisualizer(maze, solution, offscreen=True)
+    vis.draw_frame()  # Warm-up: builds flags / LOD pyramid caches
+    return vis.draw_frame, size * size
+
+
+BENCHMARKS: Dict[str, Setup] = {
+    "generate_perfect": bench_generate_perfect,
+    "generate_braid": bench_generate_braid,
+    "generate_counter": bench_generate_counter,
+    "generate_dead_ends": bench_generate_dead_ends,
+    "regenerate": bench_regenerate,
+    "regenerate_reset": bench_regenerate_reset,
+    "solve": bench_solve,
+    "solve_graph": bench_solve_graph,
+    "build_graph": bench_build_graph,
+    "save_to_file": bench_save_to_file,
+    "pack_path": bench_pack_path,
+    "parse_config": bench_parse_config,
+    "render_offscreen": bench_render_offscreen,
+}
+
+
+def measure(
+    name: str, size: int, repeat: int, memory: bool
+) -> Dict[str, Any]:
+    """Runs one benchmark: best wall time of 'repeat' runs + peak memory."""
+    func, cells = BENCHMARKS[name](size)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak_kb: Optional[float] = None
+    if memory:
+        # Separate run: tracemalloc slows allocations down a lot
+        tracemalloc.start()
+        func()
+        peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+
+    return {
+        "name": name,
+        "size": size,
+        "cells": cells,
+        "wall_s": best,
+        "peak_kb": peak_kb,
+        "cells_per_s": cells / best if best > 0 else None,
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else SIZES
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    results = []
+    for name in names:
+        for size in sizes:
+            res = measure(name, size, args.repeat, not args.no_memory)
+            results.append(res)
+            mem = (f"{res['peak_kb']:10.0f} KB"
+                   if res["peak_kb"] is not None else "")
+            print(f"{name:<18} {size:>5}x{size:<5} "
+                  f"{res['wall_s'] * 1000:10.2f} ms "
+                  f"{res['cells_per_s'] or 0:12.0f} cells/s {mem}")
+            sys.stdout.flush()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": SEED,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+    if args.baseline:
+        return compare_files(args.baseline, args.out, args.threshold)
+    return 0
+
+
+def compare_files(baseline: str, current: str, threshold: float) -> int:
+    """Prints the slowdown per benchmark; 1 if any exceeds threshold."""
+    with open(baseline) as f:
+        base = {(r["name"], r["size"]): r for r in json.load(f)["results"]}
+    with open(current) as f:
+        cur = json.load(f)["results"]
+
+    failed = 0
+    for res in cur:
+        old = base.get((res["name"], res["size"]))
+        if old is None or not old["wall_s"]:
+            continue
+        ratio = res["wall_s"] / old["wall_s"] - 1.0
+        status = "OK"
+        if ratio > threshold:
+            status = "REGRESSION"
+            failed += 1
+        print(f"{res['name']:<18} {res['size']:>5}  {ratio * 100:+7.1f}%  "
+              f"{status}")
+    if failed:
+        print(f"{failed} benchmark(s) slower than +{threshold * 100:.0f}%")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="A-Maze-ing benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="run the benchmarks")
+    p_run.add_argument("--sizes", default="",
+                       help="comma separated sides (default: 31..4000)")
+    p_run.add_argument("--only", default="",
+                       help="comma separated benchmark names")
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--no-memory", action="store_true",
+                       help="skip the tracemalloc peak memory run")
+    p_run.add_argument("--out", default="bench.json")
+    p_run.add_argument("--baseline", default=None,
+                       help="compare against this JSON after running")
+    p_run.add_argument("--threshold", type=float, default=0.15)
+
+    p_cmp = sub.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        sys.exit(run(args))
+    sys.exit(compare_files(args.baseline, args.current, args.threshold))
+
+
+if __name__ == "__main__":
+    main()
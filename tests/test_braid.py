@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from mazegen.generator import MazeGenerator
+
+
+def count_loops(maze: MazeGenerator) -> int:
+    """Open inner walls minus those of a spanning tree of the open
+    cells (the maze stays connected)."""
+    w, h, grid = maze.width, maze.height, maze.grid
+    edges = sum(1 for r in range(h) for c in range(w - 1)
+                if not grid[r][c] & 2)
+    edges += sum(1 for r in range(h - 1) for c in range(w)
+                 if not grid[r][c] & 4)
+    return edges - (w * h - len(maze.mold_positions) - 1)
+
+
+@pytest.mark.parametrize("mode", ["mt", "counter"])
+@pytest.mark.parametrize("loops", [0, 1, 17, 120])
+def test_braid_loops_is_exact(mode: str, loops: int) -> None:
+    for seed in ("1", "2", "3"):
+        maze = MazeGenerator(
+            width=31, height=21, seed=seed, entry=(0, 0), exit=(20, 30),
+            output_file=os.devnull, perfect=False, rng_mode=mode,
+            braid_loops=loops)
+        maze.generate()
+        assert count_loops(maze) == loops
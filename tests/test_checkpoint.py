@@ -0,0 +1,104 @@
+import itertools
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import pytest
+
+from mazegen.checkpoint import (Checkpoint, Checkpointer, decode,
+                                read_checkpoint)
+from mazegen.generator import MazeGenerator
+from mazegen.mask import Stencil
+from mazegen.solver import iter_solve, solve
+
+W, H = 37, 23
+
+
+def make(
+    mode: str, storage: Optional[str] = None,
+    checkpoint: Optional[Checkpointer] = None
+) -> MazeGenerator:
+    return MazeGenerator(
+        width=W, height=H, seed="5", entry=(0, 0), exit=(H - 1, W - 1),
+        output_file=os.devnull, perfect=True, rng_mode=mode,
+        checkpoint=checkpoint, storage=storage)
+
+
+@pytest.mark.parametrize("mode", ["mt", "counter"])
+@pytest.mark.parametrize("mapped", [False, True])
+def test_resume_matches_uninterrupted_run(
+    tmp_path: Path, mode: str, mapped: bool
+) -> None:
+    storage = str(tmp_path) if mapped else None
+    ref = make(mode)
+    ref.generate()
+    ref_solution = solve(ref.grid, ref.entry, ref.exit)
+
+    # Killed half-way through the DFS (a save every 40 carved cells)
+    path = str(tmp_path / "maze.ckpt")
+    saver = Checkpointer(path, interval=0, every=40)
+    for _ in itertools.islice(make(mode, storage, saver).iter_generate(),
+                              300):
+        pass
+    assert saver.saved > 0
+    maze = make(mode, storage)
+    maze.restore(read_checkpoint(path).generator)
+    maze.generate()
+    assert [list(row) for row in maze.grid] == [
+        list(row) for row in ref.grid]
+
+    # Killed half-way through the BFS
+    saver = Checkpointer(path, interval=0, every=30)
+    saver.maze = maze
+    for _ in itertools.islice(
+            iter_solve(maze.grid, maze.entry, maze.exit, checkpoint=saver),
+            200):
+        pass
+    state = read_checkpoint(path).solve
+    assert state is not None
+    assert solve(maze.grid, maze.entry, maze.exit,
+                 resume=state) == ref_solution
+
+
+def saved(tmp_path: Path, **options: Any) -> Checkpoint:
+    path = str(tmp_path / "shape.ckpt")
+    saver = Checkpointer(path, interval=0, every=20)
+    maze = MazeGenerator(
+        width=W, height=H, seed="5", entry=(0, 0), exit=(H - 1, W - 1),
+        output_file=os.devnull, perfect=False, checkpoint=saver, **options)
+    for _ in itertools.islice(maze.iter_generate(), 100):
+        pass
+    return read_checkpoint(path)
+
+
+@pytest.mark.parametrize("changed", [
+    {"mold_scale": 2},
+    {"mold_scale": 0},
+    {"braid_loops": 6},
+    {"braid_loops": None},
+    {"braid_loops": None, "dead_end_ratio": 0.1},
+    {"stencil": None},
+    {"stencil": Stencil("dot", ("#",))},
+])
+def test_other_mold_or_braid_settings_are_rejected(
+    tmp_path: Path, changed: Dict[str, Any]
+) -> None:
+    options: Dict[str, Any] = {"mold_scale": 1, "braid_loops": 5}
+    ckpt = saved(tmp_path, **options)
+    same = MazeGenerator(
+        width=W, height=H, seed="6", entry=(0, 0), exit=(H - 1, W - 1),
+        output_file=os.devnull, perfect=False, **options)
+    assert ckpt.matches(same)
+    other = MazeGenerator(
+        width=W, height=H, seed="5", entry=(0, 0), exit=(H - 1, W - 1),
+        output_file=os.devnull, perfect=False, **{**options, **changed})
+    assert not ckpt.matches(other)
+
+
+def test_old_checkpoints_are_refused(tmp_path: Path) -> None:
+    ckpt = saved(tmp_path, dead_end_ratio=0.2)
+    assert ckpt.dead_end_ratio == 0.2 and ckpt.braid_loops is None
+    data = bytearray((tmp_path / "shape.ckpt").read_bytes())
+    data[:8] = b"AMZCKPT1"
+    with pytest.raises(ValueError, match="older version"):
+        decode(bytes(data))
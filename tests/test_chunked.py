@@ -0,0 +1,61 @@
+from collections import deque
+from typing import List
+
+from mazegen.chunked import ChunkedMaze
+
+SIZE = 13
+
+
+def test_neighbouring_chunks_agree_on_seams() -> None:
+    world = ChunkedMaze(seed=9, chunk_size=SIZE)
+    for cx in range(-2, 3):
+        for cy in range(-2, 3):
+            here = world.chunk(cx, cy)
+            east = world.chunk(cx + 1, cy)
+            south = world.chunk(cx, cy + 1)
+            for i in range(SIZE):
+                assert bool(here[i][SIZE - 1] & 2) == bool(east[i][0] & 8)
+                assert bool(here[SIZE - 1][i] & 4) == bool(south[0][i] & 1)
+            # One opening per seam
+            assert sum(not row[SIZE - 1] & 2 for row in here) == 1
+            assert sum(not cell & 4 for cell in here[SIZE - 1]) == 1
+
+
+def test_chunks_only_depend_on_seed_and_coordinates() -> None:
+    # No cache: every chunk is regenerated, visited in another order
+    first = ChunkedMaze(seed=4, chunk_size=SIZE, cache_size=1)
+    second = ChunkedMaze(seed=4, chunk_size=SIZE, cache_size=1)
+    coords = [(cx, cy) for cx in range(-2, 2) for cy in range(-2, 2)]
+    chunks = {key: first.chunk(*key) for key in coords}
+    for key in reversed(coords):
+        assert second.chunk(*key) == chunks[key]
+        assert first.chunk(*key) == chunks[key]
+    assert ChunkedMaze(seed=5, chunk_size=SIZE).chunk(0, 0) != chunks[0, 0]
+
+
+def open_cells_reached(grid: List[List[int]]) -> int:
+    height, width = len(grid), len(grid[0])
+    start = next((r, c) for r in range(height) for c in range(width)
+                 if grid[r][c] != 15)
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        r, c = queue.popleft()
+        for dr, dc, bit in ((-1, 0, 1), (0, 1, 2), (1, 0, 4), (0, -1, 8)):
+            nr, nc = r + dr, c + dc
+            if (0 <= nr < height and 0 <= nc < width
+                    and not grid[r][c] & bit and (nr, nc) not in seen):
+                seen.add((nr, nc))
+                queue.append((nr, nc))
+    return len(seen)
+
+
+def test_window_of_whole_chunks_is_connected() -> None:
+    world = ChunkedMaze(seed=21, chunk_size=SIZE, stencil_every=2)
+    grid = world.window(-2 * SIZE, -SIZE, 4 * SIZE, 3 * SIZE)
+    assert len(grid) == 3 * SIZE and len(grid[0]) == 4 * SIZE
+    open_cells = sum(cell != 15 for row in grid for cell in row)
+    assert open_cells < 12 * SIZE * SIZE    # some '42' cells
+    assert open_cells_reached(grid) == open_cells
+    # The window reads the same cells as cell()
+    assert grid[5][7] == world.cell(-2 * SIZE + 7, -SIZE + 5)
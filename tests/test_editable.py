@@ -0,0 +1,32 @@
+import os
+import random
+
+import pytest
+
+from mazegen.editable import EditableMaze
+from mazegen.generator import MazeGenerator
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_incremental_repair_matches_full_bfs(perfect: bool) -> None:
+    maze = MazeGenerator(
+        width=25, height=17, seed="3", entry=(0, 0), exit=(16, 24),
+        output_file=os.devnull, perfect=perfect)
+    maze.generate()
+    editor = EditableMaze(maze, full_bfs_ratio=1.0)
+    rng = random.Random(11)
+    for _ in range(150):
+        r, c = rng.randrange(1, 16), rng.randrange(1, 24)
+        if (r, c) in maze.mold_positions:
+            continue
+        side = rng.choice("NESW")
+        dr, dc = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}[
+            side]
+        if (r + dr, c + dc) in maze.mold_positions:
+            continue
+        editor.toggle_wall(r, c, side)
+        # A fresh copy of the edited maze runs one full BFS
+        fresh = EditableMaze(editor)
+        assert list(editor.dist) == list(fresh.dist)
+        assert len(editor.solution) == len(fresh.solution)
+    assert editor.stats["incremental"] > 0
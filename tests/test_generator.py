@@ -0,0 +1,38 @@
+import os
+from typing import Any, Dict
+
+import pytest
+
+from mazegen.generator import MazeGenerator
+from mazegen.solver import SolverWorkspace, solve
+
+SETTINGS: Dict[str, Any] = {
+    "width": 29, "height": 19, "entry": (0, 0), "exit": (18, 28),
+    "output_file": os.devnull,
+}
+
+
+@pytest.mark.parametrize("mode", ["mt", "counter"])
+@pytest.mark.parametrize("options", [
+    {"perfect": True},
+    {"perfect": False},
+    {"perfect": False, "braid_loops": 12},
+    {"perfect": False, "dead_end_ratio": 0.03},
+    {"perfect": True, "mold_scale": 0},
+])
+def test_reset_matches_a_fresh_generator(
+    mode: str, options: Dict[str, Any]
+) -> None:
+    reused = MazeGenerator(seed="1", rng_mode=mode, **SETTINGS, **options)
+    reused.generate()
+    workspace = SolverWorkspace(reused.width, reused.height)
+    for seed in ("2", "3", 4):
+        reused.reset(seed)
+        reused.generate()
+        fresh = MazeGenerator(seed=reused.seed, rng_mode=mode, **SETTINGS,
+                              **options)
+        fresh.generate()
+        assert reused.grid == fresh.grid
+        assert solve(reused.grid, reused.entry, reused.exit,
+                     workspace=workspace) == solve(
+            fresh.grid, fresh.entry, fresh.exit)
@@ -0,0 +1,74 @@
+import os
+import random
+from typing import Any, Dict, Tuple
+
+import pytest
+
+from mazegen.generator import MazeGenerator
+from mazegen.graph import CorridorGraph
+from mazegen.solver import DIRECTIONS, solve, solve_packed
+
+MOVES = {char: (dr, dc, bit) for dr, dc, bit, char in DIRECTIONS}
+
+
+def build(seed: str, width: int, height: int,
+          **options: Any) -> MazeGenerator:
+    maze = MazeGenerator(
+        width=width, height=height, seed=seed, entry=(0, 0),
+        exit=(height - 1, width - 1), output_file=os.devnull, **options)
+    maze.generate()
+    return maze
+
+
+def walk(maze: MazeGenerator, start: Tuple[int, int], path: str,
+         end: Tuple[int, int]) -> None:
+    """'path' only crosses open walls and ends on 'end'."""
+    r, c = start
+    for move in path:
+        dr, dc, bit = MOVES[move]
+        assert not maze.grid[r][c] & bit
+        r, c = r + dr, c + dc
+    assert (r, c) == end
+
+
+@pytest.mark.parametrize("options", [
+    {"perfect": True},
+    {"perfect": False},
+    {"perfect": False, "braid_loops": 40},
+    {"perfect": False, "dead_end_ratio": 0.0},
+    {"perfect": False, "dead_end_ratio": 0.05},
+])
+@pytest.mark.parametrize("astar", [True, False])
+def test_shortest_path_length_matches_bfs(
+    options: Dict[str, Any], astar: bool
+) -> None:
+    rng = random.Random(3)
+    for seed in ("1", "2", "3"):
+        maze = build(seed, 41, 29, **options)
+        cells = b"".join(bytes(row) for row in maze.grid)
+        graph = CorridorGraph(cells, 41, 29)
+        pairs = [(maze.entry, maze.exit)] + [
+            ((rng.randrange(29), rng.randrange(41)),
+             (rng.randrange(29), rng.randrange(41))) for _ in range(60)]
+        for start, end in pairs:
+            path = graph.shortest_path(start, end, astar=astar)
+            expected = solve_packed(cells, 41, 29, start, end)
+            if expected is None:
+                assert path is None
+            else:
+                assert path is not None
+                assert len(path) == len(expected)
+                walk(maze, start, path, end)
+
+
+@pytest.mark.parametrize("astar", [True, False])
+def test_exit_linked_twice_to_one_junction(astar: bool) -> None:
+    # (15, 22) sits on a corridor loop leaving one junction and coming
+    # back to it: the shorter side of the loop must be taken
+    maze = build("3", 23, 17, perfect=False, dead_end_ratio=0.0)
+    cells = b"".join(bytes(row) for row in maze.grid)
+    start, end = (11, 20), (15, 22)
+    path = CorridorGraph(cells, 23, 17).shortest_path(start, end, astar)
+    assert path is not None
+    assert len(path) == len(solve(maze.grid, start, end)) == 8
+    walk(maze, start, path, end)
@@ -0,0 +1,42 @@
+import os
+from typing import Dict
+
+import pytest
+
+from mazegen.generator import MazeGenerator
+from mazegen.solver import iter_solve, solve
+
+
+def make(perfect: bool) -> MazeGenerator:
+    return MazeGenerator(
+        width=27, height=19, seed="8", entry=(0, 0), exit=(18, 26),
+        output_file=os.devnull, perfect=perfect)
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_iterators_match_generate_and_solve(perfect: bool) -> None:
+    ref = make(perfect)
+    ref.generate()
+    ref_stats: Dict[str, int] = {}
+    ref_solution = solve(ref.grid, ref.entry, ref.exit, stats=ref_stats)
+
+    maze = make(perfect)
+    kinds = [step[0] for step in maze.iter_generate()]
+    assert kinds[0] == "start"
+    assert kinds.count("carve") == (
+        maze.width * maze.height - len(maze.mold_positions) - 1)
+    assert maze.grid == ref.grid
+
+    steps = iter_solve(maze.grid, maze.entry, maze.exit)
+    expanded = []
+    while True:
+        try:
+            kind, r, c = next(steps)
+        except StopIteration as done:
+            solution = done.value
+            break
+        if kind == "expand":
+            expanded.append((r, c))
+    assert solution == ref_solution
+    assert len(expanded) == ref_stats["nodes_expanded"]
+    assert expanded[0] == maze.entry and expanded[-1] == maze.exit
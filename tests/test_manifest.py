@@ -0,0 +1,82 @@
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List
+
+from mazegen.batch import run_manifest
+from mazegen.utils import Job, parse_manifest
+
+MANIFEST = """# shared
+WIDTH=20
+HEIGHT=15
+PERFECT=True
+[good]
+ENTRY=0,0
+EXIT=19,14
+[bad_value]
+ENTRY=0,0
+EXIT=19,14
+WIDTH=abc
+[out_of_bounds]
+ENTRY=0,0
+EXIT=40,14
+[missing]
+ENTRY=0,0
+[good]
+ENTRY=1,1
+EXIT=18,13
+OUTPUT_FILE=other.txt
+[clash]
+ENTRY=0,0
+EXIT=19,14
+OUTPUT_FILE=good.txt
+this line has no equals sign
+"""
+
+
+def test_errors_are_recorded_per_job(tmp_path: Path) -> None:
+    manifest = tmp_path / "jobs.txt"
+    manifest.write_text(MANIFEST)
+    jobs: Dict[str, List[Job]] = {}
+    for job in parse_manifest(str(manifest)):
+        jobs.setdefault(job.name, []).append(job)
+
+    good = jobs["good"][0]
+    assert good.valid
+    assert good.config["width"] == 20
+    assert good.config["exit"] == (14, 19)
+    assert good.config["output_file"] == "good.txt"
+
+    assert any("WIDTH" in e for e in jobs["bad_value"][0].errors)
+    assert any("out of bounds" in e
+               for e in jobs["out_of_bounds"][0].errors)
+    assert any("missing EXIT" in e for e in jobs["missing"][0].errors)
+    assert any("duplicate job name" in e for e in jobs["good"][1].errors)
+    clash = jobs["clash"][0].errors
+    assert any("also used by job good" in e for e in clash)
+    assert any("expected KEY=VALUE" in e for e in clash)
+    assert len(jobs["bad_value"][0].errors) == 1
+
+
+def test_status_seeds_are_strings_that_replay(tmp_path: Path) -> None:
+    manifest = tmp_path / "jobs.txt"
+    manifest.write_text(
+        "WIDTH=20\nHEIGHT=15\nPERFECT=True\nENTRY=0,0\nEXIT=19,14\n"
+        f"[fixed]\nSEED=5\nOUTPUT_FILE={tmp_path / 'fixed.txt'}\n"
+        f"[drawn]\nOUTPUT_FILE={tmp_path / 'drawn.txt'}\n")
+    results = run_manifest(parse_manifest(str(manifest)))
+    assert [r.status for r in results] == ["ok", "ok"]
+    fixed, drawn = results
+    assert fixed.seed == "5"
+    assert isinstance(drawn.seed, str)
+    assert json.loads(json.dumps(asdict(drawn)))["seed"] == drawn.seed
+
+    # The reported seed, written back as SEED, gives the same file
+    manifest.write_text(
+        "WIDTH=20\nHEIGHT=15\nPERFECT=True\nENTRY=0,0\nEXIT=19,14\n"
+        f"[again]\nSEED={drawn.seed}\n"
+        f"OUTPUT_FILE={tmp_path / 'again.txt'}\n")
+    (again,) = run_manifest(parse_manifest(str(manifest)))
+    assert again.seed == drawn.seed
+    assert ((tmp_path / "again.txt").read_text()
+            == (tmp_path / "drawn.txt").read_text())
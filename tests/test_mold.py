@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from mazegen.generator import MazeGenerator
+from mazegen.mask import STENCIL_42, auto_scale, mold_mask, scaled_mask
+from mazegen.utils import (ConfigError, convert_value, format_config,
+                           get_raw_config, validate_logic)
+
+
+def config(tmp_path: Path, text: str) -> Dict[str, Any]:
+    path = tmp_path / "config.txt"
+    path.write_text("PERFECT=True\nOUTPUT_FILE=maze.txt\n" + text)
+    return format_config(get_raw_config(str(path)))
+
+
+def test_entry_or_exit_inside_the_mold_is_rejected(tmp_path: Path) -> None:
+    # On 7x5 the '42' fills the whole maze: (0, 0) is its first cell
+    blocked = config(tmp_path, "WIDTH=7\nHEIGHT=5\nENTRY=0,0\nEXIT=6,4\n")
+    with pytest.raises(ConfigError, match="Entry .* inside the mold"):
+        validate_logic(blocked)
+    blocked = config(tmp_path, "WIDTH=7\nHEIGHT=5\nENTRY=1,0\nEXIT=6,4\n")
+    with pytest.raises(ConfigError, match="Exit .* inside the mold"):
+        validate_logic(blocked)
+    with pytest.raises(ValueError, match="inside the mold"):
+        MazeGenerator(width=7, height=5, seed="1", entry=(0, 0),
+                      exit=(0, 1),
+                      output_file=os.devnull, perfect=True)
+
+    # Column 1 of the top row is open; a maze too small for the whole
+    # '42' only gets a warning
+    assert validate_logic(
+        config(tmp_path, "WIDTH=7\nHEIGHT=5\nENTRY=1,0\nEXIT=1,4\n"))
+    assert validate_logic(
+        config(tmp_path, "WIDTH=4\nHEIGHT=4\nENTRY=0,0\nEXIT=3,3\n"))
+
+
+def test_auto_mold_scale(tmp_path: Path) -> None:
+    assert convert_value("MOLD_SCALE", "auto") == 0
+    with pytest.raises(ValueError):
+        convert_value("MOLD_SCALE", "0")
+    assert auto_scale(STENCIL_42, 63, 45) == 3
+    assert auto_scale(STENCIL_42, 20, 15) == 1
+
+    auto = scaled_mask(STENCIL_42, 63, 45, 0)
+    assert auto is mold_mask(STENCIL_42, 63, 45, 3)
+    assert len(auto) == 9 * len(mold_mask(STENCIL_42, 63, 45))
+    maze = MazeGenerator(width=63, height=45, seed="1", entry=(0, 0),
+                         exit=(44, 62), output_file=os.devnull,
+                         perfect=True, mold_scale=0)
+    maze.generate()
+    assert set(maze.mold_positions) == set(auto)
+    assert all(maze.grid[r][c] == 15 for r, c in auto)
+
+    # Clear of the 1x '42' but inside the 3x one
+    text = "WIDTH=63\nHEIGHT=45\nENTRY=21,15\nEXIT=62,44\n"
+    assert (15, 21) not in mold_mask(STENCIL_42, 63, 45)
+    assert validate_logic(config(tmp_path, text))
+    with pytest.raises(ConfigError, match="scale 3"):
+        validate_logic(config(tmp_path, text + "MOLD_SCALE=auto\n"))
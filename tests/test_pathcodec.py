@@ -0,0 +1,71 @@
+import random
+from typing import List, Optional
+
+import pytest
+
+from mazegen.pathcodec import (CODEC_TURNS, PackedPath, pack_path,
+                               read_line, to_line, unpack_path)
+
+
+def paths() -> List[str]:
+    rng = random.Random(7)
+    out = ["", "N", "EW", "S" * 64, "S" * 65, "W" * 300 + "N"]
+    for size in (3, 4, 5, 257, 1000):
+        out.append("".join(rng.choice("NESW") for _ in range(size)))
+        # Long straight runs, where RLE wins
+        out.append("".join(rng.choice("NESW") * rng.randint(1, 90)
+                           for _ in range(size // 10 + 1)))
+    return out
+
+
+@pytest.mark.parametrize("rle", [None, False, True])
+def test_pack_unpack_round_trip(rle: Optional[bool]) -> None:
+    for path in paths():
+        data = pack_path(path, rle)
+        assert unpack_path(data) == path
+        packed = PackedPath(data)
+        assert len(packed) == len(path)
+        assert "".join(packed) == path
+        assert str(read_line(to_line(path, rle))) == path
+
+
+def test_packed_is_at_most_a_quarter() -> None:
+    for path in paths():
+        assert len(pack_path(path)) <= 9 + (len(path) + 3) // 4
+
+
+def test_rejects_other_letters() -> None:
+    with pytest.raises(ValueError):
+        pack_path("NEX")
+    with pytest.raises(ValueError):
+        PackedPath(pack_path("NESW" * 8)[:-1])
+    assert read_line("NESW") is None
+
+
+def walk(size: int, rng: random.Random) -> str:
+    """Random moves that never turn back, like a shortest path."""
+    moves = [rng.choice("NESW")]
+    while len(moves) < size:
+        moves.append(rng.choice(
+            [m for m in "NESW" if m != "SWNE"["NESW".index(moves[-1])]]))
+    return "".join(moves[:size])
+
+
+def test_paths_without_u_turns_use_turn_codes() -> None:
+    rng = random.Random(5)
+    for size in (1, 2, 3, 4, 5, 6, 7, 11, 64, 1001, 100000):
+        path = walk(size, rng)
+        data = pack_path(path)
+        # Shorter paths fit in fewer 2-bit bytes
+        if size >= 20:
+            assert data[0] == CODEC_TURNS
+            assert len(data) == 9 + 1 + (size + 3) // 5
+        assert unpack_path(data) == path
+        assert "".join(PackedPath(data)) == path
+    # About 4 moves per character of the saved line
+    line = to_line(path)
+    assert str(read_line(line)) == path
+    assert len(path) / len(line) > 3.98
+    # A U-turn cannot be a turn code
+    assert pack_path("NEWS")[0] != CODEC_TURNS
+    assert unpack_path(pack_path("NEWS")) == "NEWS"
@@ -0,0 +1,43 @@
+from pathlib import Path
+
+from mazegen.flags import OPEN_SIDES
+from mazegen.generator import MazeGenerator
+from mazegen.seed_search import SearchCriteria, _check_batch
+from mazegen.solver import solve
+from mazegen.utils import parse_config
+
+CONFIG = """WIDTH=21
+HEIGHT=15
+ENTRY=0,0
+EXIT=20,14
+OUTPUT_FILE={out}
+PERFECT=True
+"""
+
+
+def test_found_seed_reproduces_through_config(tmp_path: Path) -> None:
+    base = tmp_path / "config.txt"
+    base.write_text(CONFIG.format(out=tmp_path / "maze.txt"))
+    settings = parse_config(str(base))
+    matches = _check_batch(
+        settings, SearchCriteria(min_length=1), first=0, size=5)
+    assert [seed for seed, _ in matches] == [0, 1, 2, 3, 4]
+
+    for seed, metrics in matches:
+        config_file = tmp_path / f"seed{seed}.txt"
+        config_file.write_text(base.read_text() + f"SEED={seed}\n")
+        config = parse_config(str(config_file))
+        maze = MazeGenerator(
+            width=config["width"],
+            height=config["height"],
+            seed=config["seed"],
+            entry=config["entry"],
+            exit=config["exit"],
+            output_file=config["output_file"],
+            perfect=config["perfect"],
+        )
+        maze.generate()
+        cells = b"".join(bytes(row) for row in maze.grid)
+        assert cells.translate(OPEN_SIDES).count(1) == metrics["dead_ends"]
+        solution = solve(maze.grid, maze.entry, maze.exit)
+        assert len(solution) == metrics["solution_length"]
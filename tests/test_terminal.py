@@ -0,0 +1,83 @@
+import io
+import os
+import re
+from typing import Iterator, List, Tuple
+
+from display.terminal import TerminalRenderer, TerminalVisualizer
+from mazegen.flags import CellFlags
+from mazegen.generator import MazeGenerator
+from mazegen.solver import solve
+
+TOKENS = re.compile(r"\x1b\[(\d+);(\d+)H|\x1b\[[0-9;]*[mJ]|(.)", re.S)
+STEPS = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}
+
+
+def make() -> Tuple[MazeGenerator, CellFlags]:
+    maze = MazeGenerator(
+        width=15, height=11, seed="2", entry=(0, 0), exit=(10, 14),
+        output_file=os.devnull, perfect=True)
+    maze.generate()
+    flags = CellFlags(maze.width, maze.height, maze.mold_positions,
+                      maze.entry, maze.exit, solve(maze.grid, maze.entry,
+                                                   maze.exit))
+    return maze, flags
+
+
+def written(data: str) -> Iterator[Tuple[int, int, str]]:
+    """(line, column, char) of every character drawn, 1-based."""
+    y = x = 1
+    for match in TOKENS.finditer(data):
+        if match.group(1):
+            y, x = int(match.group(1)), int(match.group(2))
+        elif match.group(3):
+            yield y, x, match.group(3)
+            x += 1
+
+
+def test_only_changed_rows_are_written() -> None:
+    maze, flags = make()
+    out = io.StringIO()
+    renderer = TerminalRenderer(out, size=(200, 100))
+    player = list(maze.entry)
+    renderer.render(renderer.frame(maze, flags, player))
+    first = list(written(out.getvalue()))
+    assert {y for y, _, _ in first} == set(range(1, 2 * 11 + 2))
+
+    path = solve(maze.grid, maze.entry, maze.exit)
+    for move in path[:6]:
+        old = player
+        dr, dc = STEPS[move]
+        player = [old[0] + dr, old[1] + dc]
+        out.seek(0)
+        out.truncate()
+        renderer.render(renderer.frame(maze, flags, player))
+        cells = {(y, x) for y, x, _ in written(out.getvalue())}
+        # The old and the new player glyph, nothing else
+        assert cells == {(2 * old[0] + 2, 2 * old[1] + 2),
+                         (2 * player[0] + 2, 2 * player[1] + 2)}
+    assert renderer.render(renderer.frame(maze, flags, player)) == 0
+
+
+def test_frames_are_clipped_to_the_screen() -> None:
+    maze, flags = make()
+    out = io.StringIO()
+    renderer = TerminalRenderer(out, size=(20, 9))
+    renderer.render(renderer.frame(maze, flags, maze.entry))
+    drawn = list(written(out.getvalue()))
+    assert max(x for _, x, _ in drawn) == 20
+    assert max(y for y, _, _ in drawn) == 9
+
+
+def test_visualizer_keeps_the_player_on_screen() -> None:
+    maze, _ = make()
+    view = TerminalVisualizer(maze, solve(maze.grid, maze.entry, maze.exit))
+    out = io.StringIO()
+    view.renderer = TerminalRenderer(out, size=(20, 9))
+    view.player_pos = list(maze.exit)
+    view.status = "status"
+    view.draw()
+    drawn: List[Tuple[int, int, str]] = list(written(out.getvalue()))
+    assert all(x <= 20 and y <= 9 for y, x, _ in drawn)
+    assert any(char == "@" for _, _, char in drawn)
+    # The status keeps the last line
+    assert "".join(c for y, _, c in drawn if y == 9).startswith("status")